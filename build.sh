@@ -2,39 +2,63 @@
 set -e
 cd "$(dirname "$0")"
 
+# External IDs are evaluated from the compacted overlay (one external_ids
+# struct per entity) instead of the seven per-source *_ids.cue files.
+CUE_TAGS="-t compact_ids"
+
+# Every stage runs through scripts/build_profile.py, which records wall
+# time, exit status and output size/hash. The report is written to
+# site/data/build_profile.json on exit, even if a stage fails.
+PROFILE="python3 scripts/build_profile.py"
+$PROFILE start
+trap '$PROFILE report' EXIT
+
+stage() {
+  $PROFILE run "$@"
+}
+
+echo "Compacting external ID overlays..."
+stage compact_ids --output external_ids_compact.cue -- python3 scripts/compact_ids.py
+
 echo "Validating CUE model..."
-cue vet ./...
+stage vet -- cue vet $CUE_TAGS ./...
 
 echo "Exporting graph data..."
-cue export -e graph ./... > site/data/graph.json
+stage graph --stdout site/data/graph.json -- cue export $CUE_TAGS -e graph ./...
 
 echo "Exporting analysis..."
-cue export -e analysis ./... > site/data/analysis.json
+stage analysis --stdout site/data/analysis.json -- cue export $CUE_TAGS -e analysis ./...
 
 echo "Exporting insights..."
-cue export -e insights ./... > site/data/insights.json
+stage insights --stdout site/data/insights.json -- cue export $CUE_TAGS -e insights ./...
 
 echo "Exporting report..."
-cue export -e report ./... > site/data/report.json
+stage report --stdout site/data/report.json -- cue export $CUE_TAGS -e report ./...
 
 echo "Exporting entities..."
-cue export -e entities ./... > site/data/entities.json
+stage entities --stdout site/data/entities.json -- cue export $CUE_TAGS -e entities ./...
 
 echo "Exporting flows..."
-cue export -e flows ./... > site/data/flows.json
+stage flows --stdout site/data/flows.json -- cue export $CUE_TAGS -e flows ./...
 
 echo "Exporting documents..."
-cue export -e documents ./... > site/data/documents.json
+stage documents --stdout site/data/documents.json -- cue export $CUE_TAGS -e documents ./...
+
+echo "Building external ID crosswalk..."
+stage crosswalk --output site/data/crosswalk.sqlite -- python3 scripts/crosswalk.py
 
 echo "Running NetworkX analysis..."
 if [ -d ".venv" ]; then
-  .venv/bin/python3 scripts/analyze.py
+  stage networkx --output site/data/networkx.json -- .venv/bin/python3 scripts/analyze.py
+  echo "Building name index..."
+  stage name_index --output site/data/name_index.json -- .venv/bin/python3 scripts/name_index.py
   echo "Generating TOON export..."
-  .venv/bin/python3 scripts/toon_export.py
+  stage toon --output site/data/graph.toon -- .venv/bin/python3 scripts/toon_export.py
   echo "Generating FtM export..."
-  .venv/bin/python3 scripts/ftm_export.py
+  # Full export only reads entities.ftm.index.json; --delta runs (the Aleph import) own it
+  stage ftm --output site/data/entities.ftm.jsonl -- .venv/bin/python3 scripts/ftm_export.py
 else
-  echo "Warning: .venv not found, skipping NetworkX analysis, TOON, and FtM export"
+  echo "Warning: .venv not found, skipping NetworkX analysis, name index, TOON, and FtM export"
   echo "Run: python3 -m venv .venv && .venv/bin/pip install -r requirements.txt"
 fi
 
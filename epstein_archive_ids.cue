@@ -1,6 +1,8 @@
 // Epstein Document Archive entity IDs.
 // Source: https://www.epsteininvestigation.org/api/download/entities
 // Auto-generated by scripts/epstein_archive_sweep.py
+@if(!compact_ids)
+
 package creeps
 
 entities: {
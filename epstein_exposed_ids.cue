@@ -1,3 +1,5 @@
+@if(!compact_ids)
+
 package creeps
 
 entities: {
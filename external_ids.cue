@@ -8,6 +8,8 @@
 //   gratitude_america, honeycomb, jack_scarola, janusz_banasiak,
 //   juan_alessi, kyara, laura_menninger, marie_villafana,
 //   mc2_agency, southern_trust
+@if(!compact_ids)
+
 package creeps
 
 entities: {
@@ -0,0 +1,770 @@
+// External identifiers — compacted from the per-source overlays.
+// Auto-generated by scripts/compact_ids.py. Do not edit; edit the
+// source overlays and rerun the script (build.sh does this).
+//
+// 128 entities, 482 identifiers from:
+//   external_ids.cue
+//   littlesis_ids.cue
+//   opensanctions_ids.cue
+//   courtlistener_ids.cue
+//   rhowardstone_ids.cue
+//   epstein_archive_ids.cue
+//   epstein_exposed_ids.cue
+@if(compact_ids)
+
+package creeps
+
+entities: {
+	acosta: external_ids: {
+		wikidata:        "Q7273452"         // external_ids.cue
+		opensanctions:   "Q7273452"         // opensanctions_ids.cue
+		courtlistener:   "2299116"          // courtlistener_ids.cue
+		rhowardstone:    "alexander-acosta" // rhowardstone_ids.cue
+		epstein_archive: "Alexander Acosta" // epstein_archive_ids.cue
+		epstein_exposed: "alexander-acosta" // epstein_exposed_ids.cue
+	}
+	adam_back: external_ids: {
+		wikidata:        "Q348671"   // external_ids.cue
+		rhowardstone:    "adam-back" // rhowardstone_ids.cue
+		epstein_exposed: "adam-back" // epstein_exposed_ids.cue
+		// REMOVED — pl-wanted (Polish wanted list) ≠ British cryptographer (opensanctions_ids.cue)
+	}
+	adriana_ross: external_ids: {
+		littlesis:       "379706"       // littlesis_ids.cue
+		rhowardstone:    "adriana-ross" // rhowardstone_ids.cue
+		epstein_archive: "Adriana Ross" // epstein_archive_ids.cue
+		epstein_exposed: "adriana-ross" // epstein_exposed_ids.cue
+		// REMOVED — za-pmg (South African parliament) ≠ Epstein associate (opensanctions_ids.cue)
+	}
+	alberto_gonzales: external_ids: {
+		wikidata:      "Q202350" // external_ids.cue
+		littlesis:     "33376"   // littlesis_ids.cue
+		opensanctions: "Q202350" // opensanctions_ids.cue
+	}
+	alfredo_rodriguez: external_ids: {
+		littlesis:       "360804"            // littlesis_ids.cue
+		rhowardstone:    "alfredo-rodriguez" // rhowardstone_ids.cue
+		epstein_exposed: "alfredo-rodriguez" // epstein_exposed_ids.cue
+		// REMOVED — us-finra "alfred-rodriguez" (different name) (opensanctions_ids.cue)
+	}
+	andrew_farkas: external_ids: {
+		wikidata:        "Q137441763"    // external_ids.cue
+		littlesis:       "70348"         // littlesis_ids.cue
+		rhowardstone:    "andrew-farkas" // rhowardstone_ids.cue
+		epstein_exposed: "andrew-farkas" // epstein_exposed_ids.cue
+	}
+	apollo: external_ids: {
+		wikidata:        "Q619121"                   // external_ids.cue
+		opensanctions:   "NK-Htg98qgx5Qu6kgScU6q7eE" // opensanctions_ids.cue
+		epstein_archive: "Apollo Global Management"  // epstein_archive_ids.cue
+	}
+	bank_of_america: external_ids: {
+		wikidata:      "Q487907"                   // external_ids.cue
+		opensanctions: "NK-i53Uv3vspFpmuj98g27KDF" // opensanctions_ids.cue
+	}
+	barclays: external_ids: {
+		wikidata:        "Q245343"                   // external_ids.cue
+		opensanctions:   "NK-GdUbJjFjtSU2oouiUYGVsk" // opensanctions_ids.cue
+		epstein_archive: "Barclays"                  // epstein_archive_ids.cue
+	}
+	bart_stephens: external_ids: {
+		littlesis: "319481" // littlesis_ids.cue
+	}
+	bear_stearns: external_ids: {
+		wikidata:      "Q813018"                      // external_ids.cue
+		opensanctions: "us-finra-bear-stearns-co-inc" // opensanctions_ids.cue
+	}
+	bill_barr: external_ids: {
+		wikidata:        "Q723917"      // external_ids.cue
+		littlesis:       "1291"         // littlesis_ids.cue
+		opensanctions:   "Q723917"      // opensanctions_ids.cue
+		rhowardstone:    "william-barr" // rhowardstone_ids.cue
+		epstein_exposed: "william-barr" // epstein_exposed_ids.cue
+	}
+	bill_clinton: external_ids: {
+		wikidata:        "Q1124"        // external_ids.cue
+		littlesis:       "28668"        // littlesis_ids.cue
+		opensanctions:   "Q1124"        // opensanctions_ids.cue
+		rhowardstone:    "bill-clinton" // rhowardstone_ids.cue
+		epstein_archive: "Bill Clinton" // epstein_archive_ids.cue
+		epstein_exposed: "bill-clinton" // epstein_exposed_ids.cue
+	}
+	bill_gates: external_ids: {
+		wikidata:        "Q5284"      // external_ids.cue
+		littlesis:       "1526"       // littlesis_ids.cue
+		rhowardstone:    "bill-gates" // rhowardstone_ids.cue
+		epstein_archive: "Bill Gates" // epstein_archive_ids.cue
+		epstein_exposed: "bill-gates" // epstein_exposed_ids.cue
+	}
+	bill_richardson: external_ids: {
+		wikidata:        "Q311782"         // external_ids.cue
+		littlesis:       "13967"           // littlesis_ids.cue
+		opensanctions:   "Q311782"         // opensanctions_ids.cue
+		rhowardstone:    "bill-richardson" // rhowardstone_ids.cue
+		epstein_archive: "Bill Richardson" // epstein_archive_ids.cue
+		epstein_exposed: "bill-richardson" // epstein_exposed_ids.cue
+	}
+	blockchain_capital: external_ids: {
+		wikidata: "Q30588516" // external_ids.cue
+	}
+	blockstream: external_ids: {
+		wikidata: "Q24909896" // external_ids.cue
+	}
+	boris_nikolic: external_ids: {
+		wikidata:        "Q115276076"    // external_ids.cue
+		littlesis:       "251569"        // littlesis_ids.cue
+		opensanctions:   "Q115276076"    // opensanctions_ids.cue
+		rhowardstone:    "boris-nikolic" // rhowardstone_ids.cue
+		epstein_exposed: "boris-nikolic" // epstein_exposed_ids.cue
+	}
+	brad_edwards: external_ids: {
+		littlesis:       "176931"          // littlesis_ids.cue
+		courtlistener:   "2299116"         // courtlistener_ids.cue
+		rhowardstone:    "bradley-edwards" // rhowardstone_ids.cue: alias: "Bradley Edwards"
+		epstein_archive: "Brad Edwards"    // epstein_archive_ids.cue
+		epstein_exposed: "bradley-edwards" // epstein_exposed_ids.cue: fuzzy 0.89: "Bradley Edwards"
+		// REMOVED — us-fed-excl "Brad Edward Joseph, Pittsburgh" ≠ FL attorney Brad Edwards (opensanctions_ids.cue)
+	}
+	brett_ratner: external_ids: {
+		wikidata:        "Q319204"      // external_ids.cue
+		littlesis:       "107016"       // littlesis_ids.cue
+		rhowardstone:    "brett-ratner" // rhowardstone_ids.cue
+		epstein_exposed: "brett-ratner" // epstein_exposed_ids.cue
+	}
+	brock_pierce: external_ids: {
+		wikidata:        "Q2925904"     // external_ids.cue
+		littlesis:       "280125"       // littlesis_ids.cue
+		rhowardstone:    "brock-pierce" // rhowardstone_ids.cue
+		epstein_exposed: "brock-pierce" // epstein_exposed_ids.cue
+	}
+	brunel: external_ids: {
+		wikidata:        "Q74631975"       // external_ids.cue
+		littlesis:       "274823"          // littlesis_ids.cue
+		rhowardstone:    "jean-luc-brunel" // rhowardstone_ids.cue
+		epstein_archive: "Jean-Luc Brunel" // epstein_archive_ids.cue
+		epstein_exposed: "jean-luc-brunel" // epstein_exposed_ids.cue
+		// REMOVED — cz-person "Jean-Luc Tuzes" ≠ Jean-Luc Brunel (score 0.71) (opensanctions_ids.cue)
+	}
+	cantor_fitzgerald: external_ids: {
+		wikidata:      "Q2936874"                                         // external_ids.cue
+		opensanctions: "us-cftc-85e2bfed08ab771045c15991d1e026950867b224" // opensanctions_ids.cue
+	}
+	casey_wasserman: external_ids: {
+		wikidata:        "Q5048600"        // external_ids.cue
+		littlesis:       "44190"           // littlesis_ids.cue
+		opensanctions:   "Q5048600"        // opensanctions_ids.cue
+		rhowardstone:    "casey-wasserman" // rhowardstone_ids.cue
+		epstein_exposed: "casey-wasserman" // epstein_exposed_ids.cue
+	}
+	chelsea_clinton: external_ids: {
+		wikidata:        "Q229671"         // external_ids.cue
+		littlesis:       "33299"           // littlesis_ids.cue
+		opensanctions:   "Q229671"         // opensanctions_ids.cue
+		rhowardstone:    "chelsea-clinton" // rhowardstone_ids.cue
+		epstein_exposed: "chelsea-clinton" // epstein_exposed_ids.cue
+	}
+	citibank: external_ids: {
+		wikidata:      "Q857063"               // external_ids.cue
+		opensanctions: "gem-own-e100002017151" // opensanctions_ids.cue
+	}
+	clinton_foundation: external_ids: {
+		wikidata: "Q1974620" // external_ids.cue
+	}
+	coatue_management: external_ids: {
+		wikidata: "Q25245629" // external_ids.cue
+	}
+	credit_suisse: external_ids: {
+		wikidata:      "Q372657"                   // external_ids.cue
+		opensanctions: "NK-k7rWnhNEBPPvx3fjnfqu4F" // opensanctions_ids.cue
+	}
+	dalton_school: external_ids: {
+		wikidata: "Q3508986" // external_ids.cue
+	}
+	darren_indyke: external_ids: {
+		littlesis:       "349261"        // littlesis_ids.cue
+		rhowardstone:    "darren-indyke" // rhowardstone_ids.cue
+		epstein_exposed: "darren-indyke" // epstein_exposed_ids.cue
+	}
+	david_copperfield: external_ids: {
+		wikidata:        "Q139637"           // external_ids.cue
+		littlesis:       "264124"            // littlesis_ids.cue
+		rhowardstone:    "david-copperfield" // rhowardstone_ids.cue
+		epstein_archive: "David Copperfield" // epstein_archive_ids.cue
+		epstein_exposed: "david-copperfield" // epstein_exposed_ids.cue
+	}
+	dechert_llp: external_ids: {
+		wikidata: "Q5249122" // external_ids.cue
+	}
+	dershowitz: external_ids: {
+		wikidata:        "Q183058"         // external_ids.cue
+		littlesis:       "71641"           // littlesis_ids.cue
+		opensanctions:   "Q183058"         // opensanctions_ids.cue
+		courtlistener:   "4636340"         // courtlistener_ids.cue
+		rhowardstone:    "alan-dershowitz" // rhowardstone_ids.cue
+		epstein_archive: "Alan Dershowitz" // epstein_archive_ids.cue
+		epstein_exposed: "alan-dershowitz" // epstein_exposed_ids.cue
+	}
+	deutsche_bank: external_ids: {
+		wikidata:        "Q66048"                    // external_ids.cue
+		opensanctions:   "NK-7tn3PhCYDQ6HiZP4Suw7rK" // opensanctions_ids.cue
+		epstein_archive: "Deutsche Bank"             // epstein_archive_ids.cue
+	}
+	donald_barr: external_ids: {
+		wikidata:        "Q5294012"    // external_ids.cue
+		littlesis:       "350844"      // littlesis_ids.cue
+		opensanctions:   "Q5294012"    // opensanctions_ids.cue
+		rhowardstone:    "donald-barr" // rhowardstone_ids.cue
+		epstein_exposed: "donald-barr" // epstein_exposed_ids.cue
+	}
+	east_71st: external_ids: {
+		wikidata: "Q65122665" // external_ids.cue
+	}
+	ehud_barak: external_ids: {
+		wikidata:        "Q125731"    // external_ids.cue
+		littlesis:       "116061"     // littlesis_ids.cue
+		opensanctions:   "Q125731"    // opensanctions_ids.cue
+		rhowardstone:    "ehud-barak" // rhowardstone_ids.cue
+		epstein_archive: "Ehud Barak" // epstein_archive_ids.cue
+		epstein_exposed: "ehud-barak" // epstein_exposed_ids.cue
+	}
+	elon_musk: external_ids: {
+		wikidata:        "Q317521"   // external_ids.cue
+		littlesis:       "38805"     // littlesis_ids.cue
+		opensanctions:   "Q317521"   // opensanctions_ids.cue
+		rhowardstone:    "elon-musk" // rhowardstone_ids.cue
+		epstein_exposed: "elon-musk" // epstein_exposed_ids.cue
+	}
+	emmy_taylor: external_ids: {
+		rhowardstone:    "emmy-tayler" // rhowardstone_ids.cue: alias: "Emmy Tayler"
+		epstein_exposed: "emmy-tayler" // epstein_exposed_ids.cue: fuzzy 0.91: "Emmy Tayler"
+	}
+	epstein: external_ids: {
+		wikidata:        "Q2904131"        // external_ids.cue
+		littlesis:       "36043"           // littlesis_ids.cue
+		opensanctions:   "Q2904131"        // opensanctions_ids.cue
+		courtlistener:   "4636340"         // courtlistener_ids.cue
+		rhowardstone:    "jeffrey-epstein" // rhowardstone_ids.cue
+		epstein_archive: "Jeffrey Epstein" // epstein_archive_ids.cue
+		epstein_exposed: "jeffrey-epstein" // epstein_exposed_ids.cue
+	}
+	eva_dubin: external_ids: {
+		wikidata:        "Q67024532" // external_ids.cue
+		rhowardstone:    "eva-dubin" // rhowardstone_ids.cue
+		epstein_archive: "Eva Dubin" // epstein_archive_ids.cue
+	}
+	financial_trust: external_ids: {
+		wikidata:      "Q65356059"                 // external_ids.cue
+		opensanctions: "NK-8FKqCmJHS2gW8FgLPbrwKi" // opensanctions_ids.cue
+	}
+	geoffrey_berman: external_ids: {
+		wikidata:        "Q47037424"       // external_ids.cue
+		littlesis:       "278532"          // littlesis_ids.cue
+		opensanctions:   "Q47037424"       // opensanctions_ids.cue
+		rhowardstone:    "geoffrey-berman" // rhowardstone_ids.cue
+		epstein_archive: "Geoffrey Berman" // epstein_archive_ids.cue
+		epstein_exposed: "geoffrey-berman" // epstein_exposed_ids.cue
+	}
+	george_mitchell: external_ids: {
+		wikidata:        "Q368920"         // external_ids.cue
+		littlesis:       "14137"           // littlesis_ids.cue
+		opensanctions:   "Q368920"         // opensanctions_ids.cue
+		rhowardstone:    "george-mitchell" // rhowardstone_ids.cue
+		epstein_archive: "George Mitchell" // epstein_archive_ids.cue
+		epstein_exposed: "george-mitchell" // epstein_exposed_ids.cue
+	}
+	george_stephanopoulos: external_ids: {
+		wikidata:        "Q1655924"              // external_ids.cue
+		littlesis:       "85097"                 // littlesis_ids.cue
+		opensanctions:   "Q1655924"              // opensanctions_ids.cue
+		rhowardstone:    "george-stephanopoulos" // rhowardstone_ids.cue
+		epstein_exposed: "george-stephanopoulos" // epstein_exposed_ids.cue
+	}
+	glenn_dubin: external_ids: {
+		wikidata:        "Q16189009"   // external_ids.cue
+		littlesis:       "15391"       // littlesis_ids.cue
+		rhowardstone:    "glenn-dubin" // rhowardstone_ids.cue
+		epstein_archive: "Glenn Dubin" // epstein_archive_ids.cue
+		epstein_exposed: "glen-dubin"  // epstein_exposed_ids.cue: fuzzy 0.95: "Glen Dubin"
+	}
+	goldman_sachs: external_ids: {
+		wikidata:      "Q193326"                   // external_ids.cue
+		opensanctions: "NK-jvkaxY8JhY89uSjfafaL8Q" // opensanctions_ids.cue
+	}
+	gordon_brown: external_ids: {
+		wikidata:        "Q10648"       // external_ids.cue
+		littlesis:       "37814"        // littlesis_ids.cue
+		opensanctions:   "Q10648"       // opensanctions_ids.cue
+		epstein_exposed: "gordon-brown" // epstein_exposed_ids.cue
+	}
+	harvard_university: external_ids: {
+		wikidata:        "Q13371"             // external_ids.cue
+		epstein_archive: "Harvard University" // epstein_archive_ids.cue
+	}
+	harvey_weinstein: external_ids: {
+		wikidata:        "Q531599"          // external_ids.cue
+		littlesis:       "46257"            // littlesis_ids.cue
+		rhowardstone:    "harvey-weinstein" // rhowardstone_ids.cue
+		epstein_archive: "Harvey Weinstein" // epstein_archive_ids.cue
+		epstein_exposed: "harvey-weinstein" // epstein_exposed_ids.cue
+	}
+	highbridge_capital: external_ids: {
+		wikidata:      "Q5757840"     // external_ids.cue
+		opensanctions: "bic-HIGCUS31" // opensanctions_ids.cue
+	}
+	// honeycomb: REMOVED — us-finra "Honeycomb Portal LLC" ≠ Steve Cohen's Honeycomb fund (opensanctions_ids.cue)
+	howard_lutnick: external_ids: {
+		wikidata:        "Q16194176"      // external_ids.cue
+		littlesis:       "51558"          // littlesis_ids.cue
+		opensanctions:   "Q16194176"      // opensanctions_ids.cue
+		rhowardstone:    "howard-lutnick" // rhowardstone_ids.cue
+		epstein_exposed: "howard-lutnick" // epstein_exposed_ids.cue
+	}
+	hsbc: external_ids: {
+		wikidata:      "Q190464"                                           // external_ids.cue
+		opensanctions: "ir-br-co-bdaa3b850fe8c125df7b305cc20dc75553cc3abc" // opensanctions_ids.cue
+	}
+	jack_scarola: external_ids: {
+		littlesis:       "113502"       // littlesis_ids.cue
+		rhowardstone:    "jack-scarola" // rhowardstone_ids.cue
+		epstein_exposed: "jack-scarola" // epstein_exposed_ids.cue
+	}
+	james_comey: external_ids: {
+		wikidata:        "Q167607"     // external_ids.cue
+		littlesis:       "59939"       // littlesis_ids.cue
+		opensanctions:   "Q167607"     // opensanctions_ids.cue
+		epstein_exposed: "james-comey" // epstein_exposed_ids.cue
+	}
+	janusz_banasiak: external_ids: {
+		littlesis:       "463121"          // littlesis_ids.cue
+		rhowardstone:    "janusz-banasiak" // rhowardstone_ids.cue
+		epstein_exposed: "janusz-banasiak" // epstein_exposed_ids.cue
+	}
+	jeff_bezos: external_ids: {
+		wikidata:        "Q312556"    // external_ids.cue
+		littlesis:       "3342"       // littlesis_ids.cue
+		opensanctions:   "Q312556"    // opensanctions_ids.cue
+		rhowardstone:    "jeff-bezos" // rhowardstone_ids.cue
+		epstein_exposed: "jeff-bezos" // epstein_exposed_ids.cue
+	}
+	jes_staley: external_ids: {
+		wikidata:        "Q6185687"   // external_ids.cue
+		littlesis:       "1214"       // littlesis_ids.cue
+		rhowardstone:    "jes-staley" // rhowardstone_ids.cue
+		epstein_archive: "Jes Staley" // epstein_archive_ids.cue
+		epstein_exposed: "jes-staley" // epstein_exposed_ids.cue
+	}
+	joichi_ito: external_ids: {
+		wikidata:        "Q934616" // external_ids.cue
+		littlesis:       "121452"  // littlesis_ids.cue
+		rhowardstone:    "joi-ito" // rhowardstone_ids.cue
+		epstein_exposed: "joi-ito" // epstein_exposed_ids.cue
+	}
+	josh_harris: external_ids: {
+		wikidata:        "Q6289885"    // external_ids.cue
+		littlesis:       "6143"        // littlesis_ids.cue
+		rhowardstone:    "josh-harris" // rhowardstone_ids.cue
+		epstein_exposed: "josh-harris" // epstein_exposed_ids.cue
+	}
+	jp_morgan: external_ids: {
+		wikidata:        "Q192314"                                         // external_ids.cue
+		opensanctions:   "us-fed-1962bd5f014ea107ee41cdc9e56e8c98ada6c0aa" // opensanctions_ids.cue
+		epstein_archive: "JPMorgan Chase"                                  // epstein_archive_ids.cue: fuzzy 97% -> JPMorgan Chase
+	}
+	juan_alessi: external_ids: {
+		littlesis:       "364313"      // littlesis_ids.cue
+		rhowardstone:    "juan-alessi" // rhowardstone_ids.cue
+		epstein_archive: "Juan Alessi" // epstein_archive_ids.cue
+		epstein_exposed: "juan-alessi" // epstein_exposed_ids.cue
+		// REMOVED — br-pep (Brazilian PEP) ≠ Epstein's house manager (opensanctions_ids.cue)
+	}
+	kathryn_ruemmler: external_ids: {
+		wikidata:        "Q6377116"         // external_ids.cue
+		littlesis:       "117867"           // littlesis_ids.cue
+		opensanctions:   "Q6377116"         // opensanctions_ids.cue
+		rhowardstone:    "kathryn-ruemmler" // rhowardstone_ids.cue
+		epstein_exposed: "kathryn-ruemmler" // epstein_exposed_ids.cue
+	}
+	katie_couric: external_ids: {
+		wikidata:        "Q230739"      // external_ids.cue
+		littlesis:       "104688"       // littlesis_ids.cue
+		rhowardstone:    "katie-couric" // rhowardstone_ids.cue
+		epstein_exposed: "katie-couric" // epstein_exposed_ids.cue
+	}
+	ken_starr: external_ids: {
+		wikidata:     "Q708241"   // external_ids.cue
+		littlesis:    "33464"     // littlesis_ids.cue
+		rhowardstone: "ken-starr" // rhowardstone_ids.cue
+	}
+	kevin_spacey: external_ids: {
+		wikidata:        "Q25144"       // external_ids.cue
+		littlesis:       "159438"       // littlesis_ids.cue
+		rhowardstone:    "kevin-spacey" // rhowardstone_ids.cue
+		epstein_archive: "Kevin Spacey" // epstein_archive_ids.cue
+		epstein_exposed: "kevin-spacey" // epstein_exposed_ids.cue
+	}
+	kushner: external_ids: {
+		wikidata:        "Q13628723"     // external_ids.cue
+		littlesis:       "71297"         // littlesis_ids.cue
+		opensanctions:   "Q13628723"     // opensanctions_ids.cue
+		rhowardstone:    "jared-kushner" // rhowardstone_ids.cue
+		epstein_exposed: "jared-kushner" // epstein_exposed_ids.cue
+	}
+	l_brands: external_ids: {
+		wikidata:        "Q931354"         // external_ids.cue
+		opensanctions:   "usgsa-s4mr3mf51" // opensanctions_ids.cue
+		epstein_archive: "L Brands"        // epstein_archive_ids.cue
+	}
+	larry_summers: external_ids: {
+		wikidata:        "Q317953"       // external_ids.cue
+		littlesis:       "14597"         // littlesis_ids.cue
+		opensanctions:   "Q317953"       // opensanctions_ids.cue
+		rhowardstone:    "larry-summers" // rhowardstone_ids.cue
+		epstein_exposed: "larry-summers" // epstein_exposed_ids.cue
+	}
+	laura_menninger: external_ids: {
+		littlesis:       "263428"          // littlesis_ids.cue
+		rhowardstone:    "laura-menninger" // rhowardstone_ids.cue
+		epstein_archive: "Laura Menninger" // epstein_archive_ids.cue
+		epstein_exposed: "laura-menninger" // epstein_exposed_ids.cue
+	}
+	lawrence_krauss: external_ids: {
+		wikidata:        "Q470468"         // external_ids.cue
+		littlesis:       "68253"           // littlesis_ids.cue
+		rhowardstone:    "lawrence-krauss" // rhowardstone_ids.cue
+		epstein_archive: "Lawrence Krauss" // epstein_archive_ids.cue
+		epstein_exposed: "lawrence-krauss" // epstein_exposed_ids.cue
+	}
+	leon_black: external_ids: {
+		wikidata:        "Q5578461"   // external_ids.cue
+		littlesis:       "8302"       // littlesis_ids.cue
+		rhowardstone:    "leon-black" // rhowardstone_ids.cue
+		epstein_archive: "Leon Black" // epstein_archive_ids.cue
+		epstein_exposed: "leon-black" // epstein_exposed_ids.cue
+	}
+	leon_botstein: external_ids: {
+		wikidata:        "Q2905309"      // external_ids.cue
+		littlesis:       "51960"         // littlesis_ids.cue
+		rhowardstone:    "leon-botstein" // rhowardstone_ids.cue
+		epstein_exposed: "leon-botstein" // epstein_exposed_ids.cue
+		// REMOVED — Q16105285 is David Bornstein (Australian politician), not Leon Botstein (conductor) (opensanctions_ids.cue)
+	}
+	lesley_groff: external_ids: {
+		wikidata:        "Q138024689"   // external_ids.cue
+		littlesis:       "356897"       // littlesis_ids.cue
+		rhowardstone:    "lesley-groff" // rhowardstone_ids.cue
+		epstein_archive: "Lesley Groff" // epstein_archive_ids.cue
+		epstein_exposed: "lesley-groff" // epstein_exposed_ids.cue
+	}
+	liquid_funding: external_ids: {
+		wikidata:      "Q137163817"      // external_ids.cue
+		opensanctions: "icijol-82004676" // opensanctions_ids.cue
+	}
+	little_st_james: external_ids: {
+		wikidata:        "Q6651815"                // external_ids.cue
+		epstein_archive: "Little St. James Island" // epstein_archive_ids.cue
+	}
+	lolita_express: external_ids: {
+		wikidata: "Q135643381" // external_ids.cue
+	}
+	mar_a_lago: external_ids: {
+		wikidata:        "Q1262898"   // external_ids.cue
+		epstein_archive: "Mar-a-Lago" // epstein_archive_ids.cue
+	}
+	marie_villafana: external_ids: {
+		opensanctions:   "Q69898508"       // opensanctions_ids.cue
+		rhowardstone:    "marie-villafana" // rhowardstone_ids.cue
+		epstein_exposed: "marie-villafana" // epstein_exposed_ids.cue
+	}
+	mark_epstein: external_ids: {
+		wikidata:        "Q108187195"   // external_ids.cue
+		littlesis:       "72862"        // littlesis_ids.cue
+		rhowardstone:    "mark-epstein" // rhowardstone_ids.cue
+		epstein_exposed: "mark-epstein" // epstein_exposed_ids.cue
+	}
+	martin_nowak: external_ids: {
+		wikidata:        "Q87451"       // external_ids.cue
+		littlesis:       "406307"       // littlesis_ids.cue
+		rhowardstone:    "martin-nowak" // rhowardstone_ids.cue
+		epstein_exposed: "martin-nowak" // epstein_exposed_ids.cue
+		// REMOVED — pl-wanted (Polish wanted list) ≠ Harvard professor (opensanctions_ids.cue)
+	}
+	marvin_minsky: external_ids: {
+		wikidata:        "Q204815"       // external_ids.cue
+		littlesis:       "95130"         // littlesis_ids.cue
+		rhowardstone:    "marvin-minsky" // rhowardstone_ids.cue
+		epstein_archive: "Marvin Minsky" // epstein_archive_ids.cue
+		epstein_exposed: "marvin-minsky" // epstein_exposed_ids.cue
+	}
+	maxwell: external_ids: {
+		wikidata:        "Q5556756"          // external_ids.cue
+		littlesis:       "176895"            // littlesis_ids.cue
+		courtlistener:   "4636340"           // courtlistener_ids.cue
+		rhowardstone:    "ghislaine-maxwell" // rhowardstone_ids.cue
+		epstein_archive: "Ghislaine Maxwell" // epstein_archive_ids.cue
+		epstein_exposed: "ghislaine-maxwell" // epstein_exposed_ids.cue
+	}
+	mc2_agency: external_ids: {
+		epstein_archive: "MC2 Model Management" // epstein_archive_ids.cue
+	}
+	mcc_manhattan: external_ids: {
+		wikidata:        "Q1925847"                         // external_ids.cue
+		epstein_archive: "Metropolitan Correctional Center" // epstein_archive_ids.cue
+	}
+	melania_trump: external_ids: {
+		wikidata:        "Q432473"       // external_ids.cue
+		littlesis:       "116289"        // littlesis_ids.cue
+		opensanctions:   "Q432473"       // opensanctions_ids.cue
+		rhowardstone:    "melania-trump" // rhowardstone_ids.cue
+		epstein_exposed: "melania-trump" // epstein_exposed_ids.cue
+	}
+	michael_milken: external_ids: {
+		wikidata:        "Q918376"        // external_ids.cue
+		littlesis:       "15156"          // littlesis_ids.cue
+		opensanctions:   "Q918376"        // opensanctions_ids.cue
+		epstein_exposed: "michael-milken" // epstein_exposed_ids.cue
+	}
+	morgan_stanley: external_ids: {
+		wikidata:      "Q334204"      // external_ids.cue
+		opensanctions: "bic-MSSPBRS1" // opensanctions_ids.cue
+	}
+	mort_zuckerman: external_ids: {
+		wikidata:        "Q11693671"      // external_ids.cue
+		littlesis:       "15120"          // littlesis_ids.cue
+		rhowardstone:    "mort-zuckerman" // rhowardstone_ids.cue
+		epstein_exposed: "mort-zuckerman" // epstein_exposed_ids.cue
+	}
+	nadia_marcinkova: external_ids: {
+		wikidata:        "Q16731972"        // external_ids.cue
+		littlesis:       "357419"           // littlesis_ids.cue
+		rhowardstone:    "nadia-marcinkova" // rhowardstone_ids.cue
+		epstein_archive: "Nadia Marcinkova" // epstein_archive_ids.cue
+		epstein_exposed: "nadia-marcinkova" // epstein_exposed_ids.cue
+	}
+	naomi_campbell: external_ids: {
+		wikidata:        "Q199369"        // external_ids.cue
+		littlesis:       "159534"         // littlesis_ids.cue
+		opensanctions:   "Q199369"        // opensanctions_ids.cue
+		rhowardstone:    "naomi-campbell" // rhowardstone_ids.cue
+		epstein_archive: "Naomi Campbell" // epstein_archive_ids.cue
+		epstein_exposed: "naomi-campbell" // epstein_exposed_ids.cue
+	}
+	obama: external_ids: {
+		wikidata:        "Q76"          // external_ids.cue
+		littlesis:       "13503"        // littlesis_ids.cue
+		opensanctions:   "Q76"          // opensanctions_ids.cue
+		rhowardstone:    "barack-obama" // rhowardstone_ids.cue
+		epstein_exposed: "barack-obama" // epstein_exposed_ids.cue
+	}
+	palantir: external_ids: {
+		wikidata: "Q2047336" // external_ids.cue
+	}
+	paul_cassell: external_ids: {
+		wikidata:        "Q7150777"     // external_ids.cue
+		littlesis:       "144987"       // littlesis_ids.cue
+		opensanctions:   "Q7150777"     // opensanctions_ids.cue
+		rhowardstone:    "paul-cassell" // rhowardstone_ids.cue
+		epstein_archive: "Paul Cassell" // epstein_archive_ids.cue
+		epstein_exposed: "paul-cassell" // epstein_exposed_ids.cue
+	}
+	peggy_siegal: external_ids: {
+		wikidata:        "Q84323682"    // external_ids.cue
+		littlesis:       "337870"       // littlesis_ids.cue
+		rhowardstone:    "peggy-siegal" // rhowardstone_ids.cue
+		epstein_exposed: "peggy-siegal" // epstein_exposed_ids.cue
+	}
+	peter_mandelson: external_ids: {
+		wikidata:        "Q310046"         // external_ids.cue
+		littlesis:       "82151"           // littlesis_ids.cue
+		opensanctions:   "Q310046"         // opensanctions_ids.cue
+		rhowardstone:    "peter-mandelson" // rhowardstone_ids.cue
+		epstein_archive: "Peter Mandelson" // epstein_archive_ids.cue
+		epstein_exposed: "peter-mandelson" // epstein_exposed_ids.cue
+	}
+	peter_thiel: external_ids: {
+		wikidata:        "Q705525"     // external_ids.cue
+		littlesis:       "15408"       // littlesis_ids.cue
+		opensanctions:   "Q705525"     // opensanctions_ids.cue
+		rhowardstone:    "peter-thiel" // rhowardstone_ids.cue
+		epstein_exposed: "peter-thiel" // epstein_exposed_ids.cue
+	}
+	philippe_laffont: external_ids: {
+		wikidata:  "Q116972965" // external_ids.cue
+		littlesis: "49837"      // littlesis_ids.cue
+		// REMOVED — Q65587193 is Frédéric Laffont (French politician), not Philippe Laffont (Coatue) (opensanctions_ids.cue)
+	}
+	prince_andrew: external_ids: {
+		wikidata:      "Q153330" // external_ids.cue
+		littlesis:     "100950"  // littlesis_ids.cue
+		opensanctions: "Q153330" // opensanctions_ids.cue
+	}
+	reid_hoffman: external_ids: {
+		wikidata:        "Q211098"      // external_ids.cue
+		littlesis:       "44800"        // littlesis_ids.cue
+		opensanctions:   "Q211098"      // opensanctions_ids.cue
+		rhowardstone:    "reid-hoffman" // rhowardstone_ids.cue
+		epstein_archive: "Reid Hoffman" // epstein_archive_ids.cue
+		epstein_exposed: "reid-hoffman" // epstein_exposed_ids.cue
+	}
+	richard_branson: external_ids: {
+		wikidata:        "Q194419"                                         // external_ids.cue
+		littlesis:       "70114"                                           // littlesis_ids.cue
+		opensanctions:   "plural-c80052d90d153e3b624cd745bb05ee969419a0b5" // opensanctions_ids.cue
+		rhowardstone:    "richard-branson"                                 // rhowardstone_ids.cue
+		epstein_exposed: "richard-branson"                                 // epstein_exposed_ids.cue
+	}
+	richard_kahn: external_ids: {
+		littlesis:       "349265"       // littlesis_ids.cue
+		rhowardstone:    "richard-kahn" // rhowardstone_ids.cue
+		epstein_exposed: "richard-kahn" // epstein_exposed_ids.cue
+	}
+	robert_maxwell: external_ids: {
+		wikidata:        "Q333468"        // external_ids.cue
+		littlesis:       "228307"         // littlesis_ids.cue
+		rhowardstone:    "robert-maxwell" // rhowardstone_ids.cue
+		epstein_archive: "Robert Maxwell" // epstein_archive_ids.cue
+		epstein_exposed: "robert-maxwell" // epstein_exposed_ids.cue
+		// REMOVED — Q333246 is Robert Sheckley (sci-fi author); correct Maxwell is Q333468 but not in OpenSanctions civic dataset (opensanctions_ids.cue)
+	}
+	robert_mueller: external_ids: {
+		wikidata:        "Q715156"        // external_ids.cue
+		littlesis:       "33484"          // littlesis_ids.cue
+		opensanctions:   "Q715156"        // opensanctions_ids.cue
+		rhowardstone:    "robert-mueller" // rhowardstone_ids.cue
+		epstein_exposed: "robert-mueller" // epstein_exposed_ids.cue
+	}
+	rothschild_geneva: external_ids: {
+		wikidata: "Q662805" // external_ids.cue
+	}
+	sarah_ferguson: external_ids: {
+		wikidata:        "Q55720"         // external_ids.cue
+		littlesis:       "184949"         // littlesis_ids.cue
+		rhowardstone:    "sarah-ferguson" // rhowardstone_ids.cue
+		epstein_exposed: "sarah-ferguson" // epstein_exposed_ids.cue
+		// REMOVED — Q16728956 is Jersey politician Sarah Ferguson, not the Duchess of York (Q55720) (opensanctions_ids.cue)
+	}
+	sarah_kellen: external_ids: {
+		wikidata:        "Q137570384"   // external_ids.cue
+		littlesis:       "337874"       // littlesis_ids.cue
+		rhowardstone:    "sarah-kellen" // rhowardstone_ids.cue
+		epstein_archive: "Sarah Kellen" // epstein_archive_ids.cue
+		epstein_exposed: "sarah-kellen" // epstein_exposed_ids.cue
+		// REMOVED — us-fed-excl "Sarah Da Salvia Keller" ≠ Sarah Kellen (opensanctions_ids.cue)
+	}
+	sergey_brin: external_ids: {
+		wikidata:        "Q92764"      // external_ids.cue
+		littlesis:       "3084"        // littlesis_ids.cue
+		opensanctions:   "Q92764"      // opensanctions_ids.cue
+		rhowardstone:    "sergey-brin" // rhowardstone_ids.cue
+		epstein_archive: "Sergey Brin" // epstein_archive_ids.cue
+		epstein_exposed: "sergey-brin" // epstein_exposed_ids.cue
+	}
+	seth_lloyd: external_ids: {
+		wikidata:        "Q92941"     // external_ids.cue
+		littlesis:       "438990"     // littlesis_ids.cue
+		rhowardstone:    "seth-lloyd" // rhowardstone_ids.cue
+		epstein_exposed: "seth-lloyd" // epstein_exposed_ids.cue
+	}
+	sigrid_mccawley: external_ids: {
+		wikidata:        "Q112758177"      // external_ids.cue
+		littlesis:       "349263"          // littlesis_ids.cue
+		courtlistener:   "7322971"         // courtlistener_ids.cue
+		rhowardstone:    "sigrid-mccawley" // rhowardstone_ids.cue
+		epstein_archive: "Sigrid McCawley" // epstein_archive_ids.cue
+		epstein_exposed: "sigrid-mccawley" // epstein_exposed_ids.cue
+	}
+	southern_trust: external_ids: {
+		opensanctions: "us-finra-southern-trust-securities-inc" // opensanctions_ids.cue
+	}
+	stephen_hawking: external_ids: {
+		wikidata:        "Q17714"          // external_ids.cue
+		littlesis:       "169634"          // littlesis_ids.cue
+		rhowardstone:    "stephen-hawking" // rhowardstone_ids.cue
+		epstein_archive: "Stephen Hawking" // epstein_archive_ids.cue
+		epstein_exposed: "stephen-hawking" // epstein_exposed_ids.cue
+	}
+	steve_bannon: external_ids: {
+		wikidata:        "Q16146870"    // external_ids.cue
+		littlesis:       "213424"       // littlesis_ids.cue
+		opensanctions:   "Q16146870"    // opensanctions_ids.cue
+		rhowardstone:    "steve-bannon" // rhowardstone_ids.cue
+		epstein_archive: "Steve Bannon" // epstein_archive_ids.cue
+		epstein_exposed: "steve-bannon" // epstein_exposed_ids.cue
+	}
+	steve_cohen: external_ids: {
+		wikidata:  "Q590212" // external_ids.cue
+		littlesis: "332489"  // littlesis_ids.cue
+		// REMOVED — Q512330 is Steve Cohen (US congressman), not Steven A. Cohen (hedge fund, Q590212) (opensanctions_ids.cue)
+	}
+	steven_pinker: external_ids: {
+		wikidata:        "Q212730"       // external_ids.cue
+		littlesis:       "94769"         // littlesis_ids.cue
+		rhowardstone:    "steven-pinker" // rhowardstone_ids.cue
+		epstein_exposed: "steven-pinker" // epstein_exposed_ids.cue
+	}
+	terramar: external_ids: {
+		wikidata: "Q17089943" // external_ids.cue
+	}
+	tom_pritzker: external_ids: {
+		wikidata:        "Q7793302"     // external_ids.cue
+		littlesis:       "15174"        // littlesis_ids.cue
+		rhowardstone:    "tom-pritzker" // rhowardstone_ids.cue
+		epstein_exposed: "tom-pritzker" // epstein_exposed_ids.cue
+	}
+	tony_blair: external_ids: {
+		wikidata:        "Q9545"      // external_ids.cue
+		littlesis:       "116349"     // littlesis_ids.cue
+		opensanctions:   "Q9545"      // opensanctions_ids.cue
+		rhowardstone:    "tony-blair" // rhowardstone_ids.cue
+		epstein_archive: "Tony Blair" // epstein_archive_ids.cue
+		epstein_exposed: "tony-blair" // epstein_exposed_ids.cue
+	}
+	trump: external_ids: {
+		wikidata:        "Q22686"       // external_ids.cue
+		littlesis:       "15108"        // littlesis_ids.cue
+		opensanctions:   "Q22686"       // opensanctions_ids.cue
+		rhowardstone:    "donald-trump" // rhowardstone_ids.cue
+		epstein_archive: "Donald Trump" // epstein_archive_ids.cue
+		epstein_exposed: "donald-trump" // epstein_exposed_ids.cue
+	}
+	ubs: external_ids: {
+		wikidata:      "Q193199"                                          // external_ids.cue
+		opensanctions: "us-cftc-9f2896285c87d1a0c686094298b7ceea68e7956b" // opensanctions_ids.cue
+	}
+	valar_ventures: external_ids: {
+		wikidata: "Q17747112" // external_ids.cue
+	}
+	victoria_secret: external_ids: {
+		wikidata:        "Q332477"           // external_ids.cue
+		epstein_archive: "Victoria's Secret" // epstein_archive_ids.cue
+	}
+	virginia_giuffre: external_ids: {
+		wikidata:        "Q78473599"        // external_ids.cue
+		littlesis:       "360803"           // littlesis_ids.cue
+		courtlistener:   "4636340"          // courtlistener_ids.cue
+		rhowardstone:    "virginia-giuffre" // rhowardstone_ids.cue
+		epstein_archive: "Virginia Giuffre" // epstein_archive_ids.cue
+	}
+	wells_fargo: external_ids: {
+		wikidata:      "Q744149"                                           // external_ids.cue
+		opensanctions: "ir-br-co-606cb5e44db03837e8f84f83e195d31585a6adbb" // opensanctions_ids.cue
+	}
+	wexner: external_ids: {
+		wikidata:        "Q1675849"      // external_ids.cue
+		littlesis:       "4432"          // littlesis_ids.cue
+		rhowardstone:    "les-wexner"    // rhowardstone_ids.cue
+		epstein_archive: "Leslie Wexner" // epstein_archive_ids.cue: fuzzy 87% -> Leslie Wexner
+		epstein_exposed: "leslie-wexner" // epstein_exposed_ids.cue
+	}
+	woody_allen: external_ids: {
+		wikidata:        "Q25089"      // external_ids.cue
+		littlesis:       "149226"      // littlesis_ids.cue
+		opensanctions:   "Q25089"      // opensanctions_ids.cue
+		rhowardstone:    "woody-allen" // rhowardstone_ids.cue
+		epstein_archive: "Woody Allen" // epstein_archive_ids.cue
+		epstein_exposed: "woody-allen" // epstein_exposed_ids.cue
+	}
+	zorro_ranch: external_ids: {
+		wikidata:        "Q133504290"  // external_ids.cue
+		epstein_archive: "Zorro Ranch" // epstein_archive_ids.cue
+	}
+}
@@ -3,6 +3,8 @@
 //
 // Generated: 2026-04-25T22:21:48.359422+00:00Z
 // Matched: 85 entities
+@if(!compact_ids)
+
 package creeps
 
 entities: {
@@ -3,6 +3,8 @@
 // Manually reviewed: 9 false positives removed (wrong person/entity from unrelated databases).
 //
 // 59 entities matched (73 raw - 14 false positives removed after cross-validation)
+@if(!compact_ids)
+
 package creeps
 
 entities: {
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""Benchmark the scripts' fetch layers against the local mock APIs.
+
+Starts scripts/mock_api.py in-process, points every HttpClient at it
+(UNIFY_MOCK_URL, response cache bypassed) and drives each script's own
+fetch functions with a synthetic workload. Every request through the
+script's client is timed, so the report shows throughput and tail
+latency as the script experiences them, retries and backoff included.
+
+Workloads (N = --n):
+  duggan_sweep            sweep_concurrent over N names
+  discover                run_queries for N queries (up to 200 hits each)
+  wikidata_reconcile      search_wikidata for N names
+  wikidata_enrich         batch_enrich for N QIDs
+  littlesis_enrich        search_littlesis + get_relationships for N names
+  propublica_enrich       search_nonprofit + get_org_detail for N names
+  opensanctions_reconcile batch_match for N names (default batch size/concurrency)
+  epstein_exposed_sweep   fetch_all_persons over N * 10 persons
+  epstein_archive_sweep   archive_lines + load_archive of N * 100 rows (streamed)
+
+By default the scripts keep their configured per-host rate limits, so
+the numbers reflect a real run's pacing; --unthrottled removes them to
+find the fetch layer's own ceiling.
+
+Usage:
+  python3 scripts/bench_fetch.py [SCRIPT ...] [--n 50] [--latency 80]
+      [--jitter 0.5] [--error-rate 0] [--throttle-rate 0] [--max-rps N]
+      [--match-ms 0] [--unthrottled] [--json PATH]
+"""
+import argparse
+import asyncio
+import contextlib
+import importlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from mock_api import Faults, Fixtures, MockServer, person_name
+
+WORKLOADS = {}
+
+
+def workload(name):
+    def register(fn):
+        WORKLOADS[name] = fn
+        return fn
+    return register
+
+
+def _names(n):
+    return [person_name(i * 7) for i in range(n)]
+
+
+@workload("duggan_sweep")
+def _duggan(mod, n, tmp, server):
+    from checkpoint import Checkpoint
+    targets = {f"e{i}": {"name": name, "mention_count": 0} for i, name in enumerate(_names(n))}
+    ckpt = Checkpoint("bench_duggan", directory=tmp)
+    asyncio.run(mod.sweep_concurrent(targets, sorted(targets), ckpt, 8))
+    ckpt.remove()
+
+
+@workload("discover")
+def _discover(mod, n, tmp, server):
+    from discovery_queries import normalize_query
+    from discovery_store import DiscoveryStore
+    store = DiscoveryStore(Path(tmp) / "discovery.sqlite")
+    planned = [{"query": q, "key": normalize_query(q), "sets": [], "duplicates": 0}
+               for q in _names(n)]
+    mod.run_queries(store, planned, max_hits=200, concurrency=mod.DEFAULT_CONCURRENCY,
+                    refresh=True)
+    store.close()
+
+
+@workload("wikidata_reconcile")
+def _wikidata_reconcile(mod, n, tmp, server):
+    for name in _names(n):
+        mod.search_wikidata(name)
+
+
+@workload("wikidata_enrich")
+def _wikidata_enrich(mod, n, tmp, server):
+    mod.batch_enrich({f"e{i}": f"Q{1000 + i}" for i in range(n)})
+
+
+@workload("littlesis_enrich")
+def _littlesis(mod, n, tmp, server):
+    for name in _names(n):
+        results = mod.search_littlesis(name)
+        if results:
+            mod.get_relationships(results[0]["id"])
+
+
+@workload("propublica_enrich")
+def _propublica(mod, n, tmp, server):
+    for name in _names(n):
+        results = mod.search_nonprofit(name)
+        if results:
+            mod.get_org_detail(results[0]["ein"])
+
+
+@workload("opensanctions_reconcile")
+def _opensanctions(mod, n, tmp, server):
+    targets = [(f"e{i}", name, None, "Person") for i, name in enumerate(_names(n))]
+    mod.batch_match(targets)
+
+
+@workload("epstein_exposed_sweep")
+def _exposed(mod, n, tmp, server):
+    server.fixtures.persons = n * 10
+    mod.fetch_all_persons()
+
+
+@workload("epstein_archive_sweep")
+def _archive(mod, n, tmp, server):
+    server.fixtures.archive_rows = n * 100
+    mod.load_archive(mod.archive_lines())
+
+
+def percentile(ordered, p):
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+
+def run(name, server, n, unthrottled):
+    """Run one script's workload. Returns its report row."""
+    mod = importlib.import_module(name)
+    client = mod.HTTP
+    if unthrottled:
+        client.clear_rates()
+
+    timings = []
+    errors = 0
+    send = client.request
+
+    def timed(*args, **kwargs):
+        nonlocal errors
+        start = time.perf_counter()
+        try:
+            return send(*args, **kwargs)
+        except Exception:
+            errors += 1
+            raise
+        finally:
+            timings.append(time.perf_counter() - start)
+
+    client.request = timed
+    server.reset_stats()
+    fn = WORKLOADS[name]
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory() as tmp, \
+            contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        fn(mod, n, tmp, server)
+    elapsed = time.perf_counter() - start
+    client.request = send
+
+    served = {}
+    for counts in server.stats.values():
+        for status, k in counts.items():
+            served[status] = served.get(status, 0) + k
+    ordered = sorted(timings)
+    row = {"script": name, "requests": len(timings), "errors": errors,
+           "elapsed_s": round(elapsed, 3),
+           "throughput_rps": round(len(timings) / elapsed, 2) if elapsed else None,
+           "server": {str(k): v for k, v in sorted(served.items())}}
+    if ordered:
+        row.update({f"latency_{p}_ms": round(percentile(ordered, q) * 1000, 1)
+                    for p, q in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99))})
+        row["latency_max_ms"] = round(ordered[-1] * 1000, 1)
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fetch-layer benchmarks against mock APIs")
+    parser.add_argument("scripts", nargs="*",
+                        help=f"Scripts to benchmark (default: all of {', '.join(WORKLOADS)})")
+    parser.add_argument("--n", type=int, default=50, help="Workload size")
+    parser.add_argument("--latency", type=float, default=80.0, help="Median delay in ms")
+    parser.add_argument("--jitter", type=float, default=0.5, help="Log-normal delay sigma")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--max-rps", type=float, default=None)
+    parser.add_argument("--match-ms", type=float, default=0.0,
+                        help="Mock yente scoring time per query")
+    parser.add_argument("--unthrottled", action="store_true",
+                        help="Remove the scripts' own rate limits")
+    parser.add_argument("--json", help="Also write the report to this file")
+    args = parser.parse_args()
+    unknown = set(args.scripts) - set(WORKLOADS)
+    if unknown:
+        parser.error(f"no workload for {', '.join(sorted(unknown))}")
+
+    faults = Faults(args.latency, args.jitter, args.error_rate, args.throttle_rate,
+                    args.max_rps)
+    with MockServer(faults=faults, fixtures=Fixtures(match_ms=args.match_ms)) as server:
+        # Clients read these when the script modules are imported below.
+        os.environ["UNIFY_MOCK_URL"] = server.url
+        os.environ["UNIFY_NO_CACHE"] = "1"
+        rows = []
+        print(f"{'script':<25} {'req':>5} {'err':>4} {'secs':>7} {'req/s':>7} "
+              f"{'p50ms':>7} {'p95ms':>7} {'p99ms':>7} {'maxms':>7}  server")
+        for name in args.scripts or WORKLOADS:
+            row = run(name, server, args.n, args.unthrottled)
+            rows.append(row)
+            print(f"{name:<25} {row['requests']:>5} {row['errors']:>4} "
+                  f"{row['elapsed_s']:>7.2f} {row['throughput_rps'] or 0:>7.2f} "
+                  f"{row.get('latency_p50_ms', 0):>7.1f} {row.get('latency_p95_ms', 0):>7.1f} "
+                  f"{row.get('latency_p99_ms', 0):>7.1f} {row.get('latency_max_ms', 0):>7.1f}  "
+                  f"{' '.join(f'{k}:{v}' for k, v in row['server'].items())}")
+            sys.stdout.flush()
+
+    if args.json:
+        report = {"settings": vars(args), "results": rows}
+        Path(args.json).write_text(json.dumps(report, indent=2) + "\n")
+        print(f"\nReport: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
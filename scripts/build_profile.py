@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""Per-stage timing and artifact report for build.sh.
+
+Each build stage runs through `build_profile.py run`, which records its
+wall time, exit status and output files. `build_profile.py report` then
+writes site/data/build_profile.json (sizes and SHA-256 of every output)
+and compares it with the previous build's profile, warning when a stage
+got more than --threshold percent slower.
+
+Usage (see build.sh):
+  python3 scripts/build_profile.py start
+  python3 scripts/build_profile.py run graph --stdout site/data/graph.json -- \\
+      cue export -e graph ./...
+  python3 scripts/build_profile.py run networkx --output site/data/networkx.json -- \\
+      .venv/bin/python3 scripts/analyze.py
+  python3 scripts/build_profile.py report [--baseline PATH] [--threshold 20]
+
+Environment:
+  BUILD_PROFILE_BASELINE   previous profile to compare against
+                           (default: the existing site/data/build_profile.json)
+  BUILD_PROFILE_THRESHOLD  slowdown warning threshold in percent (default: 20)
+"""
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SITE_DATA = REPO_ROOT / "site" / "data"
+PROFILE_FILE = SITE_DATA / "build_profile.json"
+STAGE_LOG = SITE_DATA / ".build_stages.jsonl"
+
+DEFAULT_THRESHOLD = 20.0  # percent
+MIN_DELTA_SECONDS = 0.5   # ignore jitter on sub-second stages
+
+
+def file_info(path):
+    """Size and SHA-256 of an output file, or None if it was not written."""
+    p = REPO_ROOT / path
+    if not p.exists():
+        return {"path": str(path), "bytes": None, "sha256": None}
+    h = hashlib.sha256()
+    with open(p, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return {"path": str(path), "bytes": p.stat().st_size, "sha256": h.hexdigest()}
+
+
+def cmd_start(args):
+    """Begin a new build: discard stage records from an interrupted run."""
+    SITE_DATA.mkdir(parents=True, exist_ok=True)
+    STAGE_LOG.write_text("")
+
+
+def cmd_run(args):
+    """Run one stage, append its record to the stage log, return its status."""
+    command = args.command
+    if not command:
+        print("build_profile run: no command given", file=sys.stderr)
+        return 2
+
+    start = time.perf_counter()
+    try:
+        if args.stdout:
+            out = REPO_ROOT / args.stdout
+            out.parent.mkdir(parents=True, exist_ok=True)
+            with open(out, "wb") as f:
+                status = subprocess.run(command, cwd=REPO_ROOT, stdout=f).returncode
+        else:
+            status = subprocess.run(command, cwd=REPO_ROOT).returncode
+    except FileNotFoundError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        status = 127
+    elapsed = time.perf_counter() - start
+
+    outputs = ([args.stdout] if args.stdout else []) + (args.output or [])
+    record = {
+        "name": args.name,
+        "command": " ".join(command),
+        "seconds": round(elapsed, 3),
+        "exit_status": status,
+        "outputs": [file_info(p) for p in outputs],
+    }
+    with open(STAGE_LOG, "a") as f:
+        f.write(json.dumps(record) + "\n")
+    return status
+
+
+def load_stages():
+    if not STAGE_LOG.exists():
+        return []
+    with open(STAGE_LOG) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def compare(stages, baseline, threshold):
+    """Return warning lines for stages slower than baseline by > threshold%."""
+    previous = {s["name"]: s for s in baseline.get("stages", [])}
+    warnings = []
+    for stage in stages:
+        prev = previous.get(stage["name"])
+        if not prev or prev.get("exit_status") != 0 or not prev.get("seconds"):
+            continue
+        delta = stage["seconds"] - prev["seconds"]
+        pct = delta / prev["seconds"] * 100
+        stage["previous_seconds"] = prev["seconds"]
+        stage["change_pct"] = round(pct, 1)
+        if pct > threshold and delta >= MIN_DELTA_SECONDS:
+            warnings.append(
+                f"{stage['name']} took {stage['seconds']:.2f}s vs "
+                f"{prev['seconds']:.2f}s last build (+{pct:.0f}%)"
+            )
+    return warnings
+
+
+def cmd_report(args):
+    """Write build_profile.json and print the stage table."""
+    stages = load_stages()
+    if not stages:
+        print("build_profile: no stages recorded", file=sys.stderr)
+        return 0
+
+    baseline_path = Path(args.baseline) if args.baseline else PROFILE_FILE
+    baseline = {}
+    if baseline_path.exists():
+        try:
+            baseline = json.loads(baseline_path.read_text())
+        except json.JSONDecodeError:
+            print(f"Warning: could not parse {baseline_path}, not comparing",
+                  file=sys.stderr)
+
+    warnings = compare(stages, baseline, args.threshold)
+    failed = [s["name"] for s in stages if s["exit_status"] != 0]
+
+    profile = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": os.environ.get("CI_COMMIT_SHA") or git_head(),
+        "success": not failed,
+        "total_seconds": round(sum(s["seconds"] for s in stages), 3),
+        "threshold_pct": args.threshold,
+        "stages": stages,
+        "warnings": warnings,
+    }
+    PROFILE_FILE.write_text(json.dumps(profile, indent=2) + "\n")
+    STAGE_LOG.unlink()
+
+    total = profile["total_seconds"] or 1.0
+    print(f"\nBuild profile ({len(stages)} stages, {profile['total_seconds']:.2f}s):")
+    print(f"  {'Stage':<18} {'Time':>8} {'Share':>6} {'Change':>8} {'Bytes':>12}  Status")
+    for s in stages:
+        size = sum(o["bytes"] or 0 for o in s["outputs"])
+        change = f"{s['change_pct']:+.0f}%" if "change_pct" in s else "—"
+        status = "ok" if s["exit_status"] == 0 else f"exit {s['exit_status']}"
+        print(f"  {s['name']:<18} {s['seconds']:>7.2f}s {s['seconds'] / total:>6.0%} "
+              f"{change:>8} {size:>12,}  {status}")
+    for w in warnings:
+        print(f"Warning: {w}", file=sys.stderr)
+    print(f"Profile: {PROFILE_FILE.relative_to(REPO_ROOT)}")
+    return 0
+
+
+def git_head():
+    try:
+        proc = subprocess.run(["git", "rev-parse", "HEAD"], cwd=REPO_ROOT,
+                              capture_output=True, text=True)
+    except FileNotFoundError:
+        return None
+    return proc.stdout.strip() or None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build stage profiler")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    sub.add_parser("start", help="Reset the stage log")
+
+    run = sub.add_parser("run", help="Run and record one stage")
+    run.add_argument("name", help="Stage name")
+    run.add_argument("--stdout", help="Redirect the command's stdout to this file")
+    run.add_argument("--output", action="append",
+                     help="File written by the command (repeatable)")
+
+    report = sub.add_parser("report", help="Write build_profile.json")
+    report.add_argument("--baseline", default=os.environ.get("BUILD_PROFILE_BASELINE"),
+                        help="Previous profile to compare against")
+    report.add_argument("--threshold", type=float,
+                        default=float(os.environ.get("BUILD_PROFILE_THRESHOLD",
+                                                     DEFAULT_THRESHOLD)),
+                        help="Warn when a stage is this many percent slower")
+
+    # Everything after `--` is the stage command, passed through untouched.
+    argv = sys.argv[1:]
+    command = []
+    if "--" in argv:
+        split = argv.index("--")
+        argv, command = argv[:split], argv[split + 1:]
+    args = parser.parse_args(argv)
+    args.command = command
+    handler = {"start": cmd_start, "run": cmd_run, "report": cmd_report}[args.cmd]
+    sys.exit(handler(args) or 0)
+
+
+if __name__ == "__main__":
+    main()
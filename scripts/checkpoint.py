@@ -0,0 +1,121 @@
+"""Append-only JSONL checkpoints for long-running sweeps.
+
+The sweep and enrichment scripts used to hold every result in memory and
+write their output file once, at the very end, so an interrupted run lost
+everything. With a checkpoint each entity's outcome is appended (and
+flushed to disk) as soon as it is known; `--resume` skips entities that
+already have a result, and the final output file is compacted from the
+log when the run completes.
+
+  .cache/checkpoints/<name>.jsonl
+    {"meta": {...}}                                   run parameters
+    {"key": "...", "status": "ok", "data": {...}}     one line per entity
+
+Later lines win, so an entity retried on resume simply appends a newer
+record. Entities whose last status is "error" are retried on resume.
+
+Usage:
+  from checkpoint import Checkpoint
+
+  ckpt = Checkpoint("duggan_sweep", meta={"threshold": 20}, resume=resume)
+  for key in keys:
+      if ckpt.is_done(key):
+          continue
+      ckpt.record(key, "ok", result)
+  outcomes = ckpt.load()        # {key: (status, data)}
+  ...write the output file...
+  ckpt.remove()
+"""
+import json
+import os
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+CHECKPOINT_DIR = REPO_ROOT / ".cache" / "checkpoints"
+
+ERROR = "error"
+
+
+class Checkpoint:
+    """Per-entity outcome log for one script."""
+
+    def __init__(self, name, meta=None, resume=False, directory=CHECKPOINT_DIR):
+        self.path = Path(directory) / f"{name}.jsonl"
+        self.meta = meta or {}
+        self._done = set()
+        self.resumed = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if resume and self.path.exists():
+            self._resume()
+            self._file = open(self.path, "a")
+            if self._torn_tail():
+                self._file.write("\n")
+        else:
+            if self.path.exists():
+                print(f"Discarding previous checkpoint {self.path.name} "
+                      f"(use --resume to continue it)", file=sys.stderr)
+            self._file = open(self.path, "w")
+            self._write({"meta": self.meta})
+
+    def _resume(self):
+        outcomes, meta = self._read()
+        if meta != self.meta:
+            print(f"ERROR: {self.path.name} was written with {meta}, "
+                  f"not {self.meta}. Rerun without --resume.", file=sys.stderr)
+            sys.exit(1)
+        self._done = {key for key, (status, _) in outcomes.items() if status != ERROR}
+        self.resumed = len(self._done)
+
+    def _torn_tail(self):
+        with open(self.path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() == 0:
+                return False
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) != b"\n"
+
+    def _read(self):
+        outcomes = {}
+        meta = None
+        with open(self.path) as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except json.JSONDecodeError:
+                    # Torn final line from a killed run; the entity is redone.
+                    continue
+                if "meta" in rec:
+                    meta = rec["meta"]
+                else:
+                    outcomes[rec["key"]] = (rec["status"], rec.get("data"))
+        return outcomes, meta
+
+    def _write(self, rec):
+        self._file.write(json.dumps(rec) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def is_done(self, key):
+        return key in self._done
+
+    def record(self, key, status, data=None):
+        """Append one entity's outcome."""
+        self._write({"key": key, "status": status, "data": data})
+        if status != ERROR:
+            self._done.add(key)
+
+    def load(self):
+        """Return {key: (status, data)}, using the latest record per entity."""
+        self._file.flush()
+        return self._read()[0]
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+    def remove(self):
+        """Delete the log once its contents are in the final output."""
+        self.close()
+        self.path.unlink(missing_ok=True)
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""Compact the *_ids.cue overlays into a single external_ids block per entity.
+
+Each reconciliation script writes its own overlay (external_ids.cue,
+littlesis_ids.cue, opensanctions_ids.cue, ...) and every one of them
+re-opens the same entity structs, so CUE unifies seven partial
+`external_ids` structs per entity on every evaluation. This tool merges
+them into external_ids_compact.cue, one struct per entity, with a
+provenance comment on every field naming the overlay it came from.
+
+The source overlays stay the editable truth. They carry `@if(!compact_ids)`
+and the compacted file carries `@if(compact_ids)`, so exactly one of the two
+is loaded:
+
+  cue export -e graph ./...                 # source overlays
+  cue export -t compact_ids -e graph ./...  # compacted overlay
+
+Usage:
+  python3 scripts/compact_ids.py            # regenerate external_ids_compact.cue
+  python3 scripts/compact_ids.py --check    # exit 1 if the compacted file is stale
+  python3 scripts/compact_ids.py --bench 3  # also time cue export before/after
+"""
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+OUTPUT_FILE = REPO_ROOT / "external_ids_compact.cue"
+TAG = "compact_ids"
+
+# Source overlays in merge order. Field order inside each compacted
+# block follows this list so diffs stay stable across regenerations.
+OVERLAYS = [
+    "external_ids.cue",
+    "littlesis_ids.cue",
+    "opensanctions_ids.cue",
+    "courtlistener_ids.cue",
+    "rhowardstone_ids.cue",
+    "epstein_archive_ids.cue",
+    "epstein_exposed_ids.cue",
+]
+
+# `\tkey: external_ids: source: "value"  // optional note`
+ID_LINE = re.compile(
+    r'^\s*([A-Za-z_][A-Za-z0-9_]*):\s*external_ids:\s*([A-Za-z_][A-Za-z0-9_]*):'
+    r'\s*"((?:[^"\\]|\\.)*)"\s*(?://\s*(.*))?$'
+)
+# `\t// key: REMOVED — reason` (reviewed-out matches, kept for provenance)
+REMOVED_LINE = re.compile(r"^\s*//\s*([A-Za-z_][A-Za-z0-9_]*):\s*(REMOVED\b.*)$")
+GUARD_LINE = re.compile(r"^@if\(\s*!\s*" + TAG + r"\s*\)\s*$")
+
+
+def parse_overlay(path):
+    """Parse one overlay file.
+
+    Returns (ids, removed, guarded) where ids is a list of
+    (entity, source, value, note) tuples, removed is a list of
+    (entity, note) tuples and guarded says whether the file carries
+    the `@if(!compact_ids)` attribute.
+    """
+    ids = []
+    removed = []
+    guarded = False
+    in_entities = False
+
+    for raw in path.read_text().splitlines():
+        line = raw.rstrip()
+        if GUARD_LINE.match(line):
+            guarded = True
+            continue
+        if line.startswith("entities:"):
+            in_entities = True
+            continue
+        if not in_entities:
+            continue
+        if line == "}":
+            in_entities = False
+            continue
+
+        m = ID_LINE.match(line)
+        if m:
+            entity, source, value, note = m.groups()
+            ids.append((entity, source, value, (note or "").strip()))
+            continue
+        m = REMOVED_LINE.match(line)
+        if m:
+            removed.append((m.group(1), m.group(2).strip()))
+            continue
+        if line.strip() and not line.strip().startswith("//"):
+            raise ValueError(f"{path.name}: unsupported overlay line: {line.strip()}")
+
+    return ids, removed, guarded
+
+
+def collect(overlays):
+    """Merge all overlays into {entity: {"ids": [...], "removed": [...]}}.
+
+    Conflicting values for the same entity/source pair are an error —
+    CUE would reject them too, but failing here names both files.
+    """
+    merged = {}
+    origin = {}
+    unguarded = []
+
+    for name in overlays:
+        path = REPO_ROOT / name
+        if not path.exists():
+            print(f"Warning: {name} not found, skipping", file=sys.stderr)
+            continue
+        ids, removed, guarded = parse_overlay(path)
+        if not guarded:
+            unguarded.append(name)
+
+        for entity, source, value, note in ids:
+            slot = merged.setdefault(entity, {"ids": [], "removed": []})
+            seen = origin.get((entity, source))
+            if seen:
+                prev_file, prev_value = seen
+                if prev_value != value:
+                    raise ValueError(
+                        f"conflicting {source} for {entity}: "
+                        f'"{prev_value}" ({prev_file}) vs "{value}" ({name})'
+                    )
+                continue
+            origin[(entity, source)] = (name, value)
+            slot["ids"].append((source, value, name, note))
+
+        for entity, note in removed:
+            slot = merged.setdefault(entity, {"ids": [], "removed": []})
+            slot["removed"].append((name, note))
+
+    return merged, unguarded
+
+
+def render(merged, overlays):
+    """Render the compacted overlay as CUE source."""
+    n_ids = sum(len(v["ids"]) for v in merged.values())
+    lines = [
+        "// External identifiers — compacted from the per-source overlays.",
+        "// Auto-generated by scripts/compact_ids.py. Do not edit; edit the",
+        "// source overlays and rerun the script (build.sh does this).",
+        "//",
+        f"// {sum(1 for v in merged.values() if v['ids'])} entities, {n_ids} identifiers from:",
+    ]
+    lines += [f"//   {name}" for name in overlays]
+    lines += [
+        f"@if({TAG})",
+        "",
+        "package creeps",
+        "",
+        "entities: {",
+    ]
+
+    for entity in sorted(merged):
+        slot = merged[entity]
+        if not slot["ids"]:
+            for name, note in slot["removed"]:
+                lines.append(f"\t// {entity}: {note} ({name})")
+            continue
+
+        width = max(len(source) for source, _, _, _ in slot["ids"]) + 1
+        vwidth = max(len(value) for _, value, _, _ in slot["ids"]) + 2
+        lines.append(f"\t{entity}: external_ids: {{")
+        for source, value, name, note in slot["ids"]:
+            comment = f"{name}: {note}" if note else name
+            quoted = f'"{value}"'
+            lines.append(f"\t\t{source + ':':<{width}} {quoted:<{vwidth}} // {comment}")
+        for name, note in slot["removed"]:
+            lines.append(f"\t\t// {note} ({name})")
+        lines.append("\t}")
+
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def time_export(expr, tags, runs):
+    """Run `cue export -e expr` `runs` times, return wall times in seconds."""
+    cmd = ["cue", "export"]
+    for tag in tags:
+        cmd += ["-t", tag]
+    cmd += ["-e", expr, "./..."]
+
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        proc = subprocess.run(cmd, cwd=REPO_ROOT, capture_output=True, text=True)
+        elapsed = time.perf_counter() - start
+        if proc.returncode != 0:
+            raise RuntimeError(f"{' '.join(cmd)} failed:\n{proc.stderr.strip()}")
+        times.append(elapsed)
+    return times
+
+
+def bench(expr, runs):
+    """Report `cue export` time with the source overlays vs the compacted one."""
+    print(f"\nTiming cue export -e {expr} ({runs} run(s) each)...", file=sys.stderr)
+    try:
+        before = time_export(expr, [], runs)
+        after = time_export(expr, [TAG], runs)
+    except FileNotFoundError:
+        print("ERROR: 'cue' not found. Is CUE installed?", file=sys.stderr)
+        sys.exit(1)
+    except RuntimeError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    b, a = statistics.median(before), statistics.median(after)
+    print(f"  source overlays:  {b:6.2f}s median (min {min(before):.2f}s)", file=sys.stderr)
+    print(f"  compacted:        {a:6.2f}s median (min {min(after):.2f}s)", file=sys.stderr)
+    if b > 0:
+        print(f"  change:           {(a - b) / b:+.1%}", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compact *_ids.cue overlays")
+    parser.add_argument("--check", action="store_true",
+                        help="Exit 1 if external_ids_compact.cue is out of date")
+    parser.add_argument("--bench", type=int, metavar="RUNS", default=0,
+                        help="Time cue export before/after compaction")
+    parser.add_argument("--expr", default="graph",
+                        help="Expression to export when benchmarking (default: graph)")
+    args = parser.parse_args()
+
+    try:
+        merged, unguarded = collect(OVERLAYS)
+    except ValueError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    for name in unguarded:
+        print(f"Warning: {name} lacks @if(!{TAG}); it will be unified twice "
+              f"when building with -t {TAG}", file=sys.stderr)
+
+    text = render(merged, OVERLAYS)
+    current = OUTPUT_FILE.read_text() if OUTPUT_FILE.exists() else ""
+
+    if args.check:
+        if current != text:
+            print(f"{OUTPUT_FILE.name} is stale. Run scripts/compact_ids.py.",
+                  file=sys.stderr)
+            sys.exit(1)
+        print(f"{OUTPUT_FILE.name} is up to date.", file=sys.stderr)
+    elif current != text:
+        OUTPUT_FILE.write_text(text)
+        print(f"Wrote {OUTPUT_FILE.name}", file=sys.stderr)
+    else:
+        print(f"{OUTPUT_FILE.name} unchanged", file=sys.stderr)
+
+    n_ids = sum(len(v["ids"]) for v in merged.values())
+    n_blocks = sum(1 for v in merged.values() if v["ids"])
+    print(f"  {len(OVERLAYS)} overlays → {n_blocks} entity blocks, "
+          f"{n_ids} identifiers", file=sys.stderr)
+
+    if args.bench:
+        bench(args.expr, args.bench)
+
+
+if __name__ == "__main__":
+    main()
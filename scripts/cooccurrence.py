@@ -0,0 +1,120 @@
+"""Sparse co-occurrence counting for the discovery scripts.
+
+The discovery passes used to count co-appearances in a
+defaultdict(defaultdict(int)) keyed by name strings, updating every pair
+twice per document and then re-sorting each row to dedupe pairs. This
+engine interns names to integers, buffers each document's pairs as COO
+index arrays, and reduces a full batch into an upper-triangular
+scipy.sparse matrix. Memory is bounded by the batch size plus the number
+of distinct pairs, and top pairs come from a partial sort (argpartition)
+over the matrix's nonzeros.
+
+A document's names are deduplicated before pairing, so a name never
+pairs with itself and a name listed twice counts once.
+
+Usage:
+  from cooccurrence import CooccurrenceCounter
+
+  counts = CooccurrenceCounter()
+  for hit in hits:
+      counts.add(hit.get("people", []))
+  for a, b, n in counts.top_pairs(100, min_count=2):
+      ...
+
+Requires numpy and scipy (requirements.txt).
+"""
+import numpy as np
+from scipy import sparse
+
+DEFAULT_BATCH_PAIRS = 1_000_000
+
+_TRIU = {}
+
+
+def _pair_indices(k):
+    """Index arrays of all i < j pairs among k items (memoized per k)."""
+    pair = _TRIU.get(k)
+    if pair is None:
+        pair = _TRIU[k] = np.triu_indices(k, k=1)
+    return pair
+
+
+class CooccurrenceCounter:
+    """Counts unordered pairs of names that appear in the same document."""
+
+    def __init__(self, batch_pairs=DEFAULT_BATCH_PAIRS):
+        self.batch_pairs = batch_pairs
+        self.index = {}   # name -> id
+        self.names = []   # id -> name
+        self.documents = 0
+        self._rows = []
+        self._cols = []
+        self._buffered = 0
+        self._matrix = sparse.csr_matrix((0, 0), dtype=np.int64)
+
+    def intern(self, name):
+        idx = self.index.get(name)
+        if idx is None:
+            idx = self.index[name] = len(self.names)
+            self.names.append(name)
+        return idx
+
+    def add(self, names):
+        """Count every pair among one document's names (blank names skipped)."""
+        ids = {self.intern(n) for n in (name.strip() for name in names) if n}
+        self.documents += 1
+        if len(ids) < 2:
+            return
+        ids = np.fromiter(ids, dtype=np.int32, count=len(ids))
+        ids.sort()
+        i, j = _pair_indices(len(ids))
+        self._rows.append(ids[i])
+        self._cols.append(ids[j])
+        self._buffered += len(i)
+        if self._buffered >= self.batch_pairs:
+            self.flush()
+
+    def flush(self):
+        """Reduce buffered pairs into the sparse count matrix."""
+        n = len(self.names)
+        if self._matrix.shape != (n, n):
+            self._matrix.resize((n, n))
+        if not self._buffered:
+            return
+        rows = np.concatenate(self._rows)
+        cols = np.concatenate(self._cols)
+        batch = sparse.coo_matrix((np.ones(len(rows), dtype=np.int64), (rows, cols)),
+                                  shape=(n, n)).tocsr()  # sums duplicate pairs
+        self._matrix = self._matrix + batch
+        self._rows, self._cols, self._buffered = [], [], 0
+
+    def matrix(self):
+        """Upper-triangular CSR matrix of pair counts, indexed by interned id."""
+        self.flush()
+        return self._matrix
+
+    def pair_count(self, min_count=1):
+        """Number of distinct pairs seen at least `min_count` times."""
+        return int(np.count_nonzero(self.matrix().data >= min_count))
+
+    def top_pairs(self, n, min_count=1):
+        """The `n` most frequent pairs as (name_a, name_b, count), a < b.
+
+        Ties are broken by name so output is stable across runs.
+        """
+        m = self.matrix().tocoo()
+        keep = m.data >= min_count
+        rows, cols, data = m.row[keep], m.col[keep], m.data[keep]
+        if n < len(data):
+            # Partial sort: everything tied with the n-th count survives so
+            # the name tie-break below sees all candidates.
+            cutoff = -np.partition(-data, n - 1)[n - 1]
+            keep = data >= cutoff
+            rows, cols, data = rows[keep], cols[keep], data[keep]
+
+        pairs = []
+        for r, c, count in zip(rows.tolist(), cols.tolist(), data.tolist()):
+            a, b = sorted((self.names[r], self.names[c]))
+            pairs.append((a, b, count))
+        pairs.sort(key=lambda p: (-p[2], p[0], p[1]))
+        return pairs[:n]
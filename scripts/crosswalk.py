@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""SQLite crosswalk of every external identifier we hold per entity.
+
+External IDs are spread over the seven *_ids.cue overlays and three JSON
+files, so a question like "which entities have an OpenSanctions ID but
+no LittleSis ID" meant evaluating CUE or scanning all of them. This
+module loads them into site/data/crosswalk.sqlite:
+
+  entity       id, name, types (JSON list) of every graph node
+  source       name, files it comes from, number of identifiers
+  external_id  (entity_id, source, value) with the file it came from and
+               the overlay's review note, indexed in both directions:
+               entity -> ids by primary key, (source, value) -> entity
+               by external_id_reverse
+
+Identifiers come from:
+
+  - the overlays in compact_ids.OVERLAYS (compact_ids.parse_overlay)
+  - scripts/wikidata_qids.json        wikidata
+  - scripts/wikidata_enriched.json    wikidata, plus the authority IDs
+                                      in AUTHORITY_PROPERTIES (viaf, isni, ...)
+  - scripts/propublica_enriched.json  ein
+
+The database records the SHA-256 of each input file and the node data
+(graph_nodes.source_digest()); Crosswalk.load() rebuilds it only when
+one of them changed. Lookups are single index probes and take a few
+microseconds.
+
+Usage:
+  from crosswalk import Crosswalk
+
+  xw = Crosswalk.load()
+  xw.ids("bill_clinton")                  # {"wikidata": ["Q1124"], "viaf": [...], ...}
+  xw.lookup("wikidata", "Q1124")          # ["bill_clinton"]
+  xw.missing("opensanctions", "littlesis")  # ids with the first and not the second
+
+  python3 scripts/crosswalk.py                      # build if stale, print stats
+  python3 scripts/crosswalk.py --force              # rebuild
+  python3 scripts/crosswalk.py --show ENTITY
+  python3 scripts/crosswalk.py --lookup SOURCE VALUE
+  python3 scripts/crosswalk.py --have opensanctions --lacking littlesis
+"""
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+import graph_nodes
+from compact_ids import OVERLAYS, parse_overlay
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DB_PATH = REPO_ROOT / "site" / "data" / "crosswalk.sqlite"
+QIDS_FILE = REPO_ROOT / "scripts" / "wikidata_qids.json"
+ENRICHED_FILE = REPO_ROOT / "scripts" / "wikidata_enriched.json"
+PROPUBLICA_FILE = REPO_ROOT / "scripts" / "propublica_enriched.json"
+FORMAT = 1
+
+# wikidata_enriched.json properties that are identifiers in another registry
+AUTHORITY_PROPERTIES = ("viaf", "isni", "gnd", "loc_authority", "imdb",
+                        "freebase", "geonames", "find_a_grave")
+
+# Sources where an entity should have one value; more is reported as a conflict
+SINGLE_VALUED = ("wikidata", "littlesis", "opensanctions", "courtlistener",
+                 "rhowardstone", "epstein_archive", "epstein_exposed", "ein")
+
+SCHEMA = """
+CREATE TABLE entity (
+    id     TEXT PRIMARY KEY,
+    name   TEXT,                -- NULL for ids only the ID files mention
+    types  TEXT NOT NULL        -- JSON list
+) WITHOUT ROWID;
+CREATE TABLE source (
+    name   TEXT PRIMARY KEY,
+    files  TEXT NOT NULL,       -- JSON list, in load order
+    count  INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE external_id (
+    entity_id  TEXT NOT NULL REFERENCES entity (id),
+    source     TEXT NOT NULL REFERENCES source (name),
+    value      TEXT NOT NULL,
+    origin     TEXT NOT NULL,   -- file the value was first found in
+    note       TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (entity_id, source, value)
+) WITHOUT ROWID;
+CREATE INDEX external_id_reverse ON external_id (source, value, entity_id);
+CREATE TABLE meta (
+    key    TEXT PRIMARY KEY,
+    value  TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+def _input_files():
+    return [REPO_ROOT / name for name in OVERLAYS] + [QIDS_FILE, ENRICHED_FILE, PROPUBLICA_FILE]
+
+
+def _sources():
+    """SHA-256 of every input file (None if missing) and the node data id."""
+    files = {}
+    for path in _input_files():
+        try:
+            files[path.name] = hashlib.sha256(path.read_bytes()).hexdigest()
+        except FileNotFoundError:
+            files[path.name] = None
+    return {"nodes": graph_nodes.source_digest(), "files": files}
+
+
+def _read_json(path):
+    try:
+        return json.loads(path.read_text())
+    except FileNotFoundError:
+        return {}
+
+
+def collect():
+    """Every (entity_id, source, value, origin, note), overlays first."""
+    rows = []
+    for name in OVERLAYS:
+        path = REPO_ROOT / name
+        if not path.exists():
+            print(f"Warning: {name} not found, skipping", file=sys.stderr)
+            continue
+        ids, _removed, _guarded = parse_overlay(path)
+        rows += [(entity, source, value, name, note) for entity, source, value, note in ids]
+
+    for entity, qid in sorted(_read_json(QIDS_FILE).items()):
+        rows.append((entity, "wikidata", qid, QIDS_FILE.name, ""))
+
+    for entity, entry in sorted(_read_json(ENRICHED_FILE).items()):
+        if entry.get("qid"):
+            rows.append((entity, "wikidata", entry["qid"], ENRICHED_FILE.name, ""))
+        props = entry.get("properties", {})
+        for prop in AUTHORITY_PROPERTIES:
+            rows += [(entity, prop, str(value), ENRICHED_FILE.name, "")
+                     for value in props.get(prop, [])]
+
+    for entity, org in sorted(_read_json(PROPUBLICA_FILE).items()):
+        if org.get("ein"):
+            rows.append((entity, "ein", str(org["ein"]), PROPUBLICA_FILE.name, org.get("name", "")))
+    return rows
+
+
+def build(path, nodes, rows, sources):
+    """Write a fresh crosswalk database to `path` (atomically)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.unlink(missing_ok=True)
+    db = sqlite3.connect(str(tmp))
+    try:
+        db.executescript(SCHEMA)
+        known = {n["id"] for n in nodes}
+        db.executemany("INSERT INTO entity VALUES (?, ?, ?)",
+                       [(n["id"], n.get("name"), json.dumps(n.get("types", [])))
+                        for n in nodes])
+        db.executemany("INSERT OR IGNORE INTO entity VALUES (?, NULL, '[]')",
+                       [(r[0],) for r in rows if r[0] not in known])
+
+        files = {}
+        for _, source, _, origin, _ in rows:
+            names = files.setdefault(source, [])
+            if origin not in names:
+                names.append(origin)
+        db.executemany("INSERT INTO source VALUES (?, ?, 0)",
+                       [(source, json.dumps(names)) for source, names in files.items()])
+        db.executemany("INSERT OR IGNORE INTO external_id VALUES (?, ?, ?, ?, ?)", rows)
+        db.execute("UPDATE source SET count = (SELECT COUNT(*) FROM external_id "
+                   "WHERE external_id.source = source.name)")
+
+        db.executemany("INSERT INTO meta VALUES (?, ?)", [
+            ("format", str(FORMAT)),
+            ("sources", json.dumps(sources, sort_keys=True)),
+            ("built_at", str(time.time())),
+        ])
+        db.commit()
+        db.execute("ANALYZE")
+        db.commit()
+    finally:
+        db.close()
+    os.replace(tmp, path)
+
+
+def rebuild(path=DB_PATH):
+    """Build the crosswalk from its sources. Raises graph_nodes.GraphUnavailable."""
+    sources = _sources()
+    build(path, graph_nodes.load_nodes(), collect(), sources)
+
+
+class Crosswalk:
+    """Read-only queries over a built crosswalk database."""
+
+    def __init__(self, path=DB_PATH):
+        self.path = Path(path)
+        self.db = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True,
+                                  check_same_thread=False)
+
+    @classmethod
+    def load(cls, path=DB_PATH, force=False):
+        """Open the crosswalk, rebuilding it first if its sources changed.
+
+        Raises graph_nodes.GraphUnavailable when the nodes can't be loaded.
+        """
+        path = Path(path)
+        if force or not cls._current(path):
+            rebuild(path)
+        return cls(path)
+
+    @staticmethod
+    def _current(path):
+        if not path.exists():
+            return False
+        db = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            meta = dict(db.execute("SELECT key, value FROM meta"))
+        except sqlite3.DatabaseError:
+            return False
+        finally:
+            db.close()
+        return (meta.get("format") == str(FORMAT)
+                and json.loads(meta.get("sources", "{}")) == _sources())
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def execute(self, sql, params=()):
+        return self.db.execute(sql, params)
+
+    def ids(self, entity_id):
+        """{source: [value, ...]} for one entity."""
+        found = {}
+        for source, value in self.db.execute(
+                "SELECT source, value FROM external_id WHERE entity_id = ?", (entity_id,)):
+            found.setdefault(source, []).append(value)
+        return found
+
+    def value(self, entity_id, source):
+        """The entity's first identifier in `source`, or None."""
+        row = self.db.execute(
+            "SELECT value FROM external_id WHERE entity_id = ? AND source = ? LIMIT 1",
+            (entity_id, source)).fetchone()
+        return row[0] if row else None
+
+    def lookup(self, source, value):
+        """Entity ids holding `value` in `source`."""
+        return [r[0] for r in self.db.execute(
+            "SELECT entity_id FROM external_id WHERE source = ? AND value = ?",
+            (source, str(value)))]
+
+    def with_source(self, source):
+        """Entity ids with at least one identifier in `source`."""
+        return [r[0] for r in self.db.execute(
+            "SELECT DISTINCT entity_id FROM external_id WHERE source = ? ORDER BY entity_id",
+            (source,))]
+
+    def missing(self, have, lacking):
+        """Entity ids with an identifier in `have` but none in `lacking`."""
+        return [r[0] for r in self.db.execute(
+            "SELECT DISTINCT a.entity_id FROM external_id a WHERE a.source = ? "
+            "AND NOT EXISTS (SELECT 1 FROM external_id b "
+            "                WHERE b.entity_id = a.entity_id AND b.source = ?) "
+            "ORDER BY a.entity_id", (have, lacking))]
+
+    def sources(self):
+        """{source: identifier count}."""
+        return dict(self.db.execute("SELECT name, count FROM source ORDER BY name"))
+
+    def name(self, entity_id):
+        row = self.db.execute("SELECT name FROM entity WHERE id = ?", (entity_id,)).fetchone()
+        return row[0] if row else None
+
+    def conflicts(self):
+        """[(entity_id, source, [values])] where a SINGLE_VALUED source has several."""
+        marks = ",".join("?" * len(SINGLE_VALUED))
+        rows = self.db.execute(
+            f"SELECT entity_id, source, GROUP_CONCAT(value, '|') FROM external_id "
+            f"WHERE source IN ({marks}) GROUP BY entity_id, source "
+            f"HAVING COUNT(*) > 1 ORDER BY entity_id, source", SINGLE_VALUED)
+        return [(eid, source, values.split("|")) for eid, source, values in rows]
+
+
+def _bench(xw, runs=2000):
+    pairs = list(xw.execute("SELECT entity_id, source, value FROM external_id"))
+    if not pairs:
+        return None
+    pairs = (pairs * (runs // len(pairs) + 1))[:runs]
+    start = time.perf_counter()
+    for eid, source, value in pairs:
+        xw.lookup(source, value)
+        xw.ids(eid)
+    return (time.perf_counter() - start) / (2 * runs) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="External ID crosswalk")
+    parser.add_argument("--force", action="store_true", help="Rebuild even if current")
+    parser.add_argument("--show", metavar="ENTITY", help="Print one entity's identifiers")
+    parser.add_argument("--lookup", nargs=2, metavar=("SOURCE", "VALUE"),
+                        help="Entities holding an identifier")
+    parser.add_argument("--have", metavar="SOURCE")
+    parser.add_argument("--lacking", metavar="SOURCE")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        xw = Crosswalk.load(force=args.force)
+    except graph_nodes.GraphUnavailable as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(1)
+    elapsed = time.perf_counter() - start
+
+    if args.show:
+        for source, values in sorted(xw.ids(args.show).items()):
+            print(f"  {source:<16} {', '.join(values)}")
+        return
+    if args.lookup:
+        for eid in xw.lookup(*args.lookup):
+            print(f"  {eid:<30} {xw.name(eid) or ''}")
+        return
+    if args.have:
+        ids = xw.missing(args.have, args.lacking) if args.lacking else xw.with_source(args.have)
+        for eid in ids:
+            print(f"  {eid:<30} {xw.name(eid) or ''}")
+        print(f"{len(ids)} entities", file=sys.stderr)
+        return
+
+    n_entities = xw.execute("SELECT COUNT(*) FROM entity").fetchone()[0]
+    sources = xw.sources()
+    print(f"{xw.path}: {n_entities} entities, {sum(sources.values())} identifiers "
+          f"from {len(sources)} sources ({xw.path.stat().st_size:,} bytes, "
+          f"ready in {elapsed * 1000:.1f}ms)", file=sys.stderr)
+    for source, count in sources.items():
+        print(f"  {source:<16} {count:>5}", file=sys.stderr)
+    for eid, source, values in xw.conflicts():
+        print(f"  Warning: {eid} has {len(values)} {source} ids: {', '.join(values)}",
+              file=sys.stderr)
+    per_lookup = _bench(xw)
+    if per_lookup is not None:
+        print(f"  {per_lookup:.1f}µs per lookup", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
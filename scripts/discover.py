@@ -6,21 +6,56 @@ Queries the search API for known entities and broad investigative terms,
 collects all people/locations/documents mentioned in results, and builds
 a discovery report for expanding the CUE model.
 
+This is also the discovery engine discover2.py runs on. Query sets live
+in scripts/discovery_queries.py; --sets picks which to run (default:
+entities,discovery; "all" adds the second pass), and the planner merges
+them, dropping duplicate queries after normalization.
+
+Each query is paged through with limit/offset up to --max-hits results
+(default 1000; 0 fetches every hit the API reports). Every page is
+streamed into .cache/discovery.sqlite (scripts/discovery_store.py) as it
+arrives. The store persists across runs: a query fetched within the
+source's cache TTL (scripts/response_cache.py) with at least the same
+hit cap is reused rather than re-issued; --refresh fetches everything.
+The remaining queries run concurrently, their first pages together and
+their later pages as soon as totalHits is known, all within the
+client's rate limit. The run ends with a count of requests saved.
+
+Co-appearances are counted with the sparse engine in scripts/cooccurrence.py.
+
+Usage:
+  .venv/bin/python3 scripts/discover.py [--sets entities,discovery|all]
+      [--max-hits N] [--concurrency N] [--refresh] [--offline]
+
 API: https://analytics.dugganusa.com/api/v1/search
+
+Responses are cached in .cache/http_cache.sqlite; rerun with --offline to
+rebuild the report from the cache without touching the network.
 """
 
 import json
 import sys
 import time
-import urllib.request
 import urllib.parse
-import urllib.error
-from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
 
+from cooccurrence import CooccurrenceCounter
+from discovery_queries import QUERY_SETS, plan
+from discovery_store import DiscoveryStore
+from http_client import HttpClient, RequestError
+from response_cache import ResponseCache
+
 API_BASE = "https://analytics.dugganusa.com/api/v1/search"
 INDEX = "epstein_files"
 DELAY = 0.5  # be polite
+PAGE_SIZE = 50
+DEFAULT_MAX_HITS = 1000  # per query; 0 = no cap
+DEFAULT_CONCURRENCY = 4
+DEFAULT_SETS = ["entities", "discovery"]
+
+HTTP = HttpClient(user_agent="unify-creeps/0.1", rate_limits={API_BASE: 1 / DELAY},
+                  cache=ResponseCache())
 
 # ─── Known entities (from current CUE model) ───────────────────
 
@@ -37,135 +72,19 @@ KNOWN_ENTITIES = {
     "honeycomb", "blockchain_capital",
 }
 
-# ─── Search queries ─────────────────────────────────────────────
-
-# Entity name queries (what the API would find in document text)
-ENTITY_QUERIES = [
-    # Core network
-    '"Jeffrey Epstein"',
-    '"Ghislaine Maxwell"',
-    '"Jean-Luc Brunel"',
-    '"Lesley Groff"',
-    '"Sarah Kellen"',
-    '"Nadia Marcinkova"',
-    # Financial
-    '"Leon Black"',
-    '"Les Wexner"',
-    '"Steve Cohen"',
-    '"Philippe Laffont"',
-    '"Josh Harris"',
-    '"Peter Thiel"',
-    '"Reid Hoffman"',
-    '"Valar Ventures"',
-    '"Southern Trust"',
-    # Crypto
-    '"Brock Pierce"',
-    '"Adam Back"',
-    '"Bart Stephens"',
-    '"Blockchain Capital"',
-    # Political
-    '"Bill Clinton"',
-    '"Donald Trump"',
-    '"Jared Kushner"',
-    '"Steve Bannon"',
-    '"Howard Lutnick"',
-    '"Bill Barr"',
-    '"Bill Richardson"',
-    # Legal
-    '"Alan Dershowitz"',
-    '"Ken Starr"',
-    '"Dechert LLP"',
-    '"Alexander Acosta"',
-    '"Geoffrey Berman"',
-    # Allegations
-    '"Prince Andrew"',
-    '"David Copperfield"',
-    '"Glenn Dubin"',
-    '"George Mitchell"',
-    '"Virginia Giuffre"',
-    '"Virginia Roberts"',
-    # Academia
-    '"Joi Ito"',
-    '"Joichi Ito"',
-    # Shell companies / financial
-    '"Honeycomb"',
-    '"Kyara"',
-    '"Southern Country"',
-]
-
-# Broad discovery queries — find entities we don't know about
-DISCOVERY_QUERIES = [
-    "co-conspirator",
-    "unindicted",
-    '"non-prosecution agreement"',
-    '"NPA immunity"',
-    '"flight log"',
-    '"flight manifest"',
-    "Lolita Express",
-    '"wire transfer"',
-    '"shell company"',
-    '"trust account"',
-    '"Deutsche Bank"',
-    '"JP Morgan"',
-    '"Bear Stearns"',
-    '"Dalton School"',
-    '"Donald Barr"',
-    '"Victoria Secret"',
-    '"L Brands"',
-    '"MC2 Model"',
-    '"Terramar"',
-    '"Eva Dubin"',
-    '"Michael Milken"',
-    '"Cantor Fitzgerald"',
-    '"Highbridge Capital"',
-    '"Coatue"',
-    '"Palantir"',
-    '"Blockstream"',
-    '"Clinton Foundation"',
-    '"Mar-a-Lago"',
-    '"Marie Villafana"',
-    '"MCC Manhattan"',
-    '"Bill Gates"',
-    '"Lex Wexner"',
-    '"Ehud Barak"',
-    '"Woody Allen"',
-    '"Leslie Wexner"',
-    '"Katie Couric"',
-    '"George Stephanopoulos"',
-    '"Sergey Brin"',
-    '"Larry Summers"',
-    '"Stephen Hawking"',
-    '"Noam Chomsky"',
-    '"Robert Maxwell"',
-    '"Jean-Georges"',
-    '"Zorro Ranch"',
-    '"Little St James"',
-    '"71st Street"',
-    '"Palm Beach"',
-    '"Naomi Campbell"',
-    '"Cindy Lopez"',
-    '"Courtney Wild"',
-    '"Jane Doe"',
-    '"John Doe"',
-    "recruiter",
-    "scheduler",
-    '"power of attorney"',
-]
-
-
-def query_api(q, limit=50):
-    """Query the DugganUSA search API."""
-    params = urllib.parse.urlencode({
+
+def query_api(q, limit=PAGE_SIZE, offset=0):
+    """Query the DugganUSA search API for one page of results."""
+    params = {
         "q": q,
         "indexes": INDEX,
         "limit": limit,
-    })
-    url = f"{API_BASE}?{params}"
+    }
+    if offset:
+        params["offset"] = offset
     try:
-        req = urllib.request.Request(url, headers={"User-Agent": "unify-creeps/0.1"})
-        with urllib.request.urlopen(req, timeout=15) as resp:
-            return json.loads(resp.read().decode())
-    except (urllib.error.URLError, urllib.error.HTTPError, TimeoutError) as e:
+        return HTTP.get_json(API_BASE, params)
+    except (RequestError, ValueError) as e:
         print(f"  ERROR: {e}", file=sys.stderr)
         return None
 
@@ -177,128 +96,162 @@ def extract_hits(response):
     return response.get("data", {}).get("hits", [])
 
 
-def main():
-    # Accumulators
-    all_people = defaultdict(int)          # person name → mention count
-    all_documents = {}                      # doc_id → metadata
-    all_locations = defaultdict(int)        # location → mention count
-    coappearances = defaultdict(lambda: defaultdict(int))  # person → person → count
-    entity_documents = defaultdict(set)     # entity → set of doc_ids
-    query_hit_counts = {}                   # query → total hits
-
-    all_queries = ENTITY_QUERIES + DISCOVERY_QUERIES
-    total = len(all_queries)
-
-    print(f"Running {total} queries against {INDEX}...\n")
-
-    for i, q in enumerate(all_queries):
-        print(f"[{i+1}/{total}] {q}")
-        resp = query_api(q)
-        if not resp:
+def run_queries(store, planned, max_hits, concurrency, refresh=False):
+    """Bring every planned query up to date in the store.
+
+    Fresh stored results are reused. The rest are fetched concurrently:
+    all first pages are queued at once, and each query's remaining pages
+    are queued as soon as its first page reports totalHits. Pages are
+    stored on this thread as they complete. Returns run statistics.
+    """
+    ttl = HTTP.cache.ttl(urllib.parse.urlsplit(API_BASE).hostname)
+    stats = {"planned": len(planned), "reused": 0, "fetched": 0, "failed": 0,
+             "requests": 0, "saved": 0}
+
+    todo = []
+    for entry in planned:
+        row = None if refresh else store.fresh(entry["key"], max_hits, ttl)
+        if row is None:
+            todo.append(entry)
             continue
+        stats["reused"] += 1
+        stats["saved"] += row["pages"]
+        age = (time.time() - row["fetched_at"]) / 3600
+        print(f"  fresh   {entry['query']}: {row['total_hits']} total hits, "
+              f"{row['fetched']} stored ({age:.0f}h old)")
+
+    if todo:
+        print(f"\nFetching {len(todo)} queries ({concurrency} requests in flight)...")
+    remaining = {}   # key -> pages not yet stored
+    stored = {}      # key -> hits stored
+    totals = {}      # key -> totalHits
+    incomplete = set()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = {pool.submit(query_api, e["query"]): (e, 0) for e in todo}
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                entry, offset = futures.pop(future)
+                key = entry["key"]
+                resp = future.result()
+                stats["requests"] += 1
+
+                if offset == 0:
+                    if not resp:
+                        stats["failed"] += 1
+                        print(f"  failed  {entry['query']}")
+                        continue
+                    total_hits = resp.get("data", {}).get("totalHits", 0)
+                    store.begin_query(key, entry["query"], total_hits, max_hits)
+                    wanted = min(total_hits, max_hits) if max_hits else total_hits
+                    for off in range(PAGE_SIZE, wanted, PAGE_SIZE):
+                        page = pool.submit(query_api, entry["query"],
+                                           min(PAGE_SIZE, wanted - off), off)
+                        futures[page] = (entry, off)
+                    remaining[key] = 1 + len(range(PAGE_SIZE, wanted, PAGE_SIZE))
+                    stored[key] = 0
+                    totals[key] = total_hits
+                elif not resp:
+                    incomplete.add(key)
+
+                stored[key] += store.add_hits(key, extract_hits(resp))
+                remaining[key] -= 1
+                if remaining[key]:
+                    continue
+                store.finish_query(key, complete=key not in incomplete)
+                stats["fetched"] += 1
+                pages = store.pages(key)
+                note = ", some pages failed" if key in incomplete else ""
+                print(f"  [{stats['fetched']}/{len(todo)}] {entry['query']}: "
+                      f"{totals[key]} total hits, {stored[key]} stored "
+                      f"from {pages} page(s){note}")
+
+    # Each duplicate would have repeated its canonical query's requests.
+    for entry in planned:
+        if entry["duplicates"]:
+            stats["saved"] += entry["duplicates"] * max(1, store.pages(entry["key"]))
+    return stats
+
+
+def _arg(flag, default, cast):
+    if flag in sys.argv:
+        idx = sys.argv.index(flag)
+        if idx + 1 < len(sys.argv):
+            return cast(sys.argv[idx + 1])
+    return default
+
+
+def parse_sets(default):
+    """Query set names from --sets (comma-separated, or "all")."""
+    value = _arg("--sets", ",".join(default), str)
+    names = list(QUERY_SETS) if value == "all" else [n for n in value.split(",") if n]
+    unknown = [n for n in names if n not in QUERY_SETS]
+    if unknown:
+        print(f"ERROR: unknown query set(s): {', '.join(unknown)} "
+              f"(known: {', '.join(QUERY_SETS)})", file=sys.stderr)
+        sys.exit(1)
+    return names
+
+
+def run_plan(store, set_names):
+    """Plan, fetch and select the given query sets. Returns (planned, stats)."""
+    if "--offline" in sys.argv:
+        HTTP.cache.offline = True
+    max_hits = _arg("--max-hits", DEFAULT_MAX_HITS, int)
+    concurrency = max(1, _arg("--concurrency", DEFAULT_CONCURRENCY, int))
+    HTTP.max_idle = max(HTTP.max_idle, concurrency)
+
+    planned, duplicates = plan(set_names)
+    cap = f"up to {max_hits} hits each" if max_hits else "all hits"
+    print(f"Planned {len(planned)} queries from {', '.join(set_names)} against {INDEX} "
+          f"({cap}; {duplicates} duplicate(s) dropped)\n")
+
+    stats = run_queries(store, planned, max_hits, concurrency,
+                        refresh="--refresh" in sys.argv)
+    stats.update(duplicates=duplicates, max_hits=max_hits)
+    store.select([entry["key"] for entry in planned])
+    return planned, stats
+
+
+def print_savings(stats):
+    print(f"Requests issued:    {stats['requests']} "
+          f"({stats['fetched']} queries fetched, {stats['failed']} failed)")
+    print(f"Requests saved:     {stats['saved']} "
+          f"({stats['duplicates']} duplicate queries, {stats['reused']} fresh results reused)")
+    print(HTTP.cache.summary())
+
 
-        total_hits = resp.get("data", {}).get("totalHits", 0)
-        query_hit_counts[q] = total_hits
-        hits = extract_hits(resp)
-        print(f"  → {total_hits} total hits, {len(hits)} returned")
-
-        for hit in hits:
-            doc_id = hit.get("efta_id") or hit.get("id", "unknown")
-            people = hit.get("people", [])
-            locations = hit.get("locations", [])
-
-            # Track document
-            if doc_id not in all_documents:
-                all_documents[doc_id] = {
-                    "doc_id": doc_id,
-                    "doc_type": hit.get("doc_type", "unknown"),
-                    "source": hit.get("source", "unknown"),
-                    "dataset": hit.get("dataset", "unknown"),
-                    "file_path": hit.get("file_path", ""),
-                    "pages": hit.get("pages", 0),
-                    "char_count": hit.get("char_count", 0),
-                    "content_preview": (hit.get("content_preview") or "")[:200],
-                    "people": set(),
-                    "locations": set(),
-                    "queries_matched": set(),
-                }
-            doc = all_documents[doc_id]
-            doc["queries_matched"].add(q)
-
-            # Track people
-            for person in people:
-                person = person.strip()
-                if person:
-                    all_people[person] += 1
-                    doc["people"].add(person)
-
-            # Track locations
-            for loc in locations:
-                loc = loc.strip()
-                if loc:
-                    all_locations[loc] += 1
-                    doc["locations"].add(loc)
-
-            # Track co-appearances (entities in same document)
-            clean_people = [p.strip() for p in people if p.strip()]
-            for j, p1 in enumerate(clean_people):
-                for p2 in clean_people[j+1:]:
-                    coappearances[p1][p2] += 1
-                    coappearances[p2][p1] += 1
-
-        time.sleep(DELAY)
+def main():
+    store = DiscoveryStore()
+    planned, stats = run_plan(store, parse_sets(DEFAULT_SETS))
+    total = len(planned)
+    max_hits = stats["max_hits"]
 
     # ─── Output ─────────────────────────────────────────────
 
+    totals = store.totals()
+    cooccurrence = CooccurrenceCounter()
+    for people in store.hit_people():
+        cooccurrence.add(people)
+
     output = {
         "meta": {
             "queries_run": total,
-            "unique_documents": len(all_documents),
-            "unique_people": len(all_people),
-            "unique_locations": len(all_locations),
+            "max_hits_per_query": max_hits or None,
+            **totals,
         },
-        "query_hit_counts": dict(sorted(
-            query_hit_counts.items(), key=lambda x: x[1], reverse=True
-        )),
-        "people_by_mentions": dict(sorted(
-            all_people.items(), key=lambda x: x[1], reverse=True
-        )),
-        "locations_by_mentions": dict(sorted(
-            all_locations.items(), key=lambda x: x[1], reverse=True
-        )),
-        "coappearances_top": [],
-        "documents_sample": [],
+        "query_hit_counts": store.query_hit_counts(),
+        "people_by_mentions": store.people_by_mentions(),
+        "locations_by_mentions": store.locations_by_mentions(),
+        # Top co-appearances (entities frequently in same docs)
+        "coappearances_top": [
+            {"entity_a": a, "entity_b": b, "shared_documents": n}
+            for a, b, n in cooccurrence.top_pairs(100, min_count=2)
+        ],
+        "documents_sample": store.documents(limit=200, preview_chars=200),
     }
-
-    # Top co-appearances (entities frequently in same docs)
-    seen_pairs = set()
-    for p1, connections in coappearances.items():
-        for p2, count in sorted(connections.items(), key=lambda x: x[1], reverse=True):
-            pair = tuple(sorted([p1, p2]))
-            if pair not in seen_pairs and count >= 2:
-                seen_pairs.add(pair)
-                output["coappearances_top"].append({
-                    "entity_a": pair[0],
-                    "entity_b": pair[1],
-                    "shared_documents": count,
-                })
-    output["coappearances_top"].sort(key=lambda x: x["shared_documents"], reverse=True)
-    output["coappearances_top"] = output["coappearances_top"][:100]
-
-    # Sample documents (convert sets to lists for JSON)
-    for doc_id, doc in list(all_documents.items())[:200]:
-        output["documents_sample"].append({
-            "doc_id": doc_id,
-            "doc_type": doc["doc_type"],
-            "source": doc["source"],
-            "dataset": doc["dataset"],
-            "pages": doc["pages"],
-            "char_count": doc["char_count"],
-            "people": sorted(doc["people"]),
-            "locations": sorted(doc["locations"]),
-            "queries_matched": sorted(doc["queries_matched"]),
-            "preview": doc["content_preview"],
-        })
+    n_pairs = cooccurrence.pair_count(min_count=2)
+    store.close()
 
     out_path = Path(__file__).parent.parent / "discovery.json"
     with open(out_path, "w") as f:
@@ -308,10 +261,10 @@ def main():
     print(f"DISCOVERY COMPLETE")
     print(f"{'='*60}")
     print(f"Queries run:        {total}")
-    print(f"Unique documents:   {len(all_documents)}")
-    print(f"Unique people:      {len(all_people)}")
-    print(f"Unique locations:   {len(all_locations)}")
-    print(f"Co-appearance pairs: {len(seen_pairs)}")
+    print(f"Unique documents:   {totals['unique_documents']}")
+    print(f"Unique people:      {totals['unique_people']}")
+    print(f"Unique locations:   {totals['unique_locations']}")
+    print(f"Co-appearance pairs: {n_pairs}")
     print(f"\nTop 20 people by mention count:")
     for name, count in list(output["people_by_mentions"].items())[:20]:
         print(f"  {count:4d}  {name}")
@@ -322,6 +275,7 @@ def main():
     for pair in output["coappearances_top"][:10]:
         print(f"  {pair['shared_documents']:4d}  {pair['entity_a']} ↔ {pair['entity_b']}")
     print(f"\nResults saved to: {out_path}")
+    print_savings(stats)
 
 
 if __name__ == "__main__":
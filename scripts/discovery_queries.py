@@ -0,0 +1,285 @@
+"""Query sets for the discovery passes, and the planner that merges them.
+
+discover.py and discover2.py used to hard-code overlapping query lists
+and re-issue every query on each run. The lists now live here, and
+plan() merges any number of sets into one run. Queries are normalized
+before deduping (the search API ignores case and whitespace, so those
+variants are the same request), and each surviving query remembers
+which sets asked for it.
+"""
+import re
+
+# ─── First pass (discover.py) ───────────────────────────────────
+
+# Entity name queries (what the API would find in document text)
+ENTITY_QUERIES = [
+    # Core network
+    '"Jeffrey Epstein"',
+    '"Ghislaine Maxwell"',
+    '"Jean-Luc Brunel"',
+    '"Lesley Groff"',
+    '"Sarah Kellen"',
+    '"Nadia Marcinkova"',
+    # Financial
+    '"Leon Black"',
+    '"Les Wexner"',
+    '"Steve Cohen"',
+    '"Philippe Laffont"',
+    '"Josh Harris"',
+    '"Peter Thiel"',
+    '"Reid Hoffman"',
+    '"Valar Ventures"',
+    '"Southern Trust"',
+    # Crypto
+    '"Brock Pierce"',
+    '"Adam Back"',
+    '"Bart Stephens"',
+    '"Blockchain Capital"',
+    # Political
+    '"Bill Clinton"',
+    '"Donald Trump"',
+    '"Jared Kushner"',
+    '"Steve Bannon"',
+    '"Howard Lutnick"',
+    '"Bill Barr"',
+    '"Bill Richardson"',
+    # Legal
+    '"Alan Dershowitz"',
+    '"Ken Starr"',
+    '"Dechert LLP"',
+    '"Alexander Acosta"',
+    '"Geoffrey Berman"',
+    # Allegations
+    '"Prince Andrew"',
+    '"David Copperfield"',
+    '"Glenn Dubin"',
+    '"George Mitchell"',
+    '"Virginia Giuffre"',
+    '"Virginia Roberts"',
+    # Academia
+    '"Joi Ito"',
+    '"Joichi Ito"',
+    # Shell companies / financial
+    '"Honeycomb"',
+    '"Kyara"',
+    '"Southern Country"',
+]
+
+# Broad discovery queries — find entities we don't know about
+DISCOVERY_QUERIES = [
+    "co-conspirator",
+    "unindicted",
+    '"non-prosecution agreement"',
+    '"NPA immunity"',
+    '"flight log"',
+    '"flight manifest"',
+    "Lolita Express",
+    '"wire transfer"',
+    '"shell company"',
+    '"trust account"',
+    '"Deutsche Bank"',
+    '"JP Morgan"',
+    '"Bear Stearns"',
+    '"Dalton School"',
+    '"Donald Barr"',
+    '"Victoria Secret"',
+    '"L Brands"',
+    '"MC2 Model"',
+    '"Terramar"',
+    '"Eva Dubin"',
+    '"Michael Milken"',
+    '"Cantor Fitzgerald"',
+    '"Highbridge Capital"',
+    '"Coatue"',
+    '"Palantir"',
+    '"Blockstream"',
+    '"Clinton Foundation"',
+    '"Mar-a-Lago"',
+    '"Marie Villafana"',
+    '"MCC Manhattan"',
+    '"Bill Gates"',
+    '"Lex Wexner"',
+    '"Ehud Barak"',
+    '"Woody Allen"',
+    '"Leslie Wexner"',
+    '"Katie Couric"',
+    '"George Stephanopoulos"',
+    '"Sergey Brin"',
+    '"Larry Summers"',
+    '"Stephen Hawking"',
+    '"Noam Chomsky"',
+    '"Robert Maxwell"',
+    '"Jean-Georges"',
+    '"Zorro Ranch"',
+    '"Little St James"',
+    '"71st Street"',
+    '"Palm Beach"',
+    '"Naomi Campbell"',
+    '"Cindy Lopez"',
+    '"Courtney Wild"',
+    '"Jane Doe"',
+    '"John Doe"',
+    "recruiter",
+    "scheduler",
+    '"power of attorney"',
+]
+
+
+# ─── Second pass (discover2.py) ─────────────────────────────────
+
+# Names from public reporting NOT yet queried (or queried with 0 results)
+NEW_QUERIES = [
+    # Tech billionaires
+    '"Elon Musk"',
+    '"Bill Gates"',
+    '"Jeff Bezos"',
+    '"Eric Schmidt"',
+    '"Sergey Brin"',  # re-check
+    # Entertainment / Media
+    '"Richard Branson"',
+    '"Steven Tisch"',
+    '"Steve Tisch"',
+    '"Casey Wasserman"',
+    '"Brett Ratner"',
+    '"Woody Allen"',
+    '"Mick Jagger"',
+    '"Naomi Campbell"',
+    '"Oprah Winfrey"',
+    '"Renee Zellweger"',
+    '"Harvey Weinstein"',
+    '"Kevin Spacey"',
+    # Politicians / Government
+    '"Barack Obama"',
+    '"Jerome Powell"',
+    '"Gordon Brown"',
+    '"Peter Mandelson"',
+    '"Tony Blair"',
+    '"Miroslav Lajcak"',
+    '"Ehud Barak"',
+    '"Ariel Sharon"',
+    # Legal / Prosecution
+    '"Kathryn Ruemmler"',
+    '"Marie Villafana"',  # re-check with more context
+    '"Jack Scarola"',
+    '"Brad Edwards"',
+    '"Paul Cassell"',
+    '"Sigrid McCawley"',
+    '"Laura Menninger"',
+    # Staff / Inner Circle
+    '"Juan Alessi"',
+    '"Boris Nikolic"',
+    '"Peggy Siegal"',
+    '"Adriana Ross"',
+    '"Haley Robson"',
+    '"Cimberly Espinosa"',
+    '"Janusz Banasiak"',
+    '"Alfredo Rodriguez"',
+    '"Emmy Taylor"',
+    # Victims / Accusers (by reporting name only)
+    '"Courtney Wild"',
+    '"Michelle Licata"',
+    # Family / Associates
+    '"Sarah Ferguson"',
+    '"Melinda Gates"',
+    '"Talulah Riley"',
+    '"Chelsea Clinton"',
+    '"Melania Trump"',
+    '"Mark Epstein"',
+    '"Robert Maxwell"',  # re-check
+    '"Mila Antonova"',
+    # Financial / Corporate
+    '"Goldman Sachs"',
+    '"Bear Stearns"',
+    '"Citibank"',
+    '"Wells Fargo"',
+    '"UBS"',
+    '"Credit Suisse"',
+    '"Barclays"',
+    '"HSBC"',
+    '"Morgan Stanley"',
+    '"Bank of America"',
+    '"Gratitude America"',
+    '"Financial Trust"',
+    '"COUQ Foundation"',
+    '"Butterfly Trust"',
+    '"Liquid Funding"',
+    # Properties
+    '"Zorro Ranch"',  # re-check
+    '"Little St James"',  # re-check
+    '"71st Street"',  # re-check
+    '"East 71st"',
+    '"New Mexico ranch"',
+    '"El Brillo Way"',
+    # Science / Academia
+    '"Harvard University"',
+    '"MIT Media Lab"',
+    '"Stephen Hawking"',  # re-check
+    '"Larry Summers"',  # re-check
+    '"Martin Nowak"',
+    '"Steven Pinker"',
+    '"Lawrence Krauss"',
+    '"Marvin Minsky"',
+    '"Seth Lloyd"',
+    '"Dershowitz"',
+    # Models / Modeling
+    '"Jean-Luc Brunel"',  # re-check
+    '"MC2"',
+    '"Nadia Marcinkova"',  # re-check
+    '"Sarah Kellen"',  # re-check
+    # Other investigations
+    '"Les Wexner"',
+    '"Jes Staley"',
+    '"Leon Botstein"',
+    '"Tom Pritzker"',
+    '"Mort Zuckerman"',
+    '"Leslie Groff"',
+    '"Andrew Farkas"',
+    '"Glenn Dubin"',  # re-check
+    '"Eva Dubin"',  # re-check
+    # Political donors / fixers
+    '"Lynn Forester"',
+    '"Lynn de Rothschild"',
+    # Intelligence connections
+    '"Robert Mueller"',
+    '"James Comey"',
+    '"Alexander Acosta"',  # re-check
+    '"R. Alexander Acosta"',
+    '"Alberto Gonzales"',
+]
+
+QUERY_SETS = {
+    "entities": ENTITY_QUERIES,
+    "discovery": DISCOVERY_QUERIES,
+    "second_pass": NEW_QUERIES,
+}
+
+_QUOTES = str.maketrans({"\u201c": '"', "\u201d": '"', "\u2018": "'", "\u2019": "'"})
+
+
+def normalize_query(q):
+    """Canonical form of a query: straight quotes, single spaces, casefolded."""
+    return re.sub(r"\s+", " ", q.translate(_QUOTES)).strip().casefold()
+
+
+def plan(set_names):
+    """Merge query sets into one deduped run.
+
+    Returns (queries, duplicates): queries is a list of
+    {"query", "key", "sets", "duplicates"} dicts in first-seen order, and
+    duplicates is the total number of entries dropped because an
+    equivalent query was already planned.
+    """
+    planned = {}
+    duplicates = 0
+    for name in set_names:
+        for q in QUERY_SETS[name]:
+            key = normalize_query(q)
+            entry = planned.get(key)
+            if entry is None:
+                planned[key] = {"query": q, "key": key, "sets": [name], "duplicates": 0}
+                continue
+            duplicates += 1
+            entry["duplicates"] += 1
+            if name not in entry["sets"]:
+                entry["sets"].append(name)
+    return list(planned.values()), duplicates
@@ -0,0 +1,239 @@
+"""On-disk accumulator for discovery search hits.
+
+discover.py used to collect every document, person and co-appearance in
+in-memory dicts and sets, which caps a run at whatever fits in RAM. Hits
+now stream into a SQLite database page by page, and the report is built
+with aggregate queries at the end, so a full-corpus run needs only
+constant memory.
+
+The store persists between runs. Each query records when it was fetched
+and with what hit cap, so discover.py and discover2.py can reuse a query
+that is still fresh instead of fetching it again. Reports cover only the
+queries selected for the current run (select()).
+
+Counts keep the old semantics: a person's mention count is the number of
+(query, document) hits they appear in, and hit_people() feeds the
+co-occurrence counter (scripts/cooccurrence.py) one hit at a time.
+
+  .cache/discovery.sqlite
+"""
+import itertools
+import sqlite3
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_PATH = REPO_ROOT / ".cache" / "discovery.sqlite"
+
+SCHEMA_VERSION = 2
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    doc_id      TEXT PRIMARY KEY,
+    doc_type    TEXT,
+    source      TEXT,
+    dataset     TEXT,
+    file_path   TEXT,
+    pages       INTEGER,
+    char_count  INTEGER,
+    preview     TEXT
+);
+CREATE TABLE IF NOT EXISTS hits (
+    query   TEXT NOT NULL,
+    doc_id  TEXT NOT NULL,
+    PRIMARY KEY (query, doc_id)
+);
+CREATE TABLE IF NOT EXISTS doc_people (
+    doc_id  TEXT NOT NULL,
+    person  TEXT NOT NULL,
+    PRIMARY KEY (doc_id, person)
+);
+CREATE TABLE IF NOT EXISTS doc_locations (
+    doc_id    TEXT NOT NULL,
+    location  TEXT NOT NULL,
+    PRIMARY KEY (doc_id, location)
+);
+CREATE TABLE IF NOT EXISTS queries (
+    key         TEXT PRIMARY KEY,   -- normalized query (discovery_queries.normalize_query)
+    query       TEXT NOT NULL,      -- query text as sent
+    total_hits  INTEGER NOT NULL,
+    max_hits    INTEGER NOT NULL,   -- hit cap used for the fetch, 0 = none
+    fetched     INTEGER NOT NULL DEFAULT 0,
+    pages       INTEGER NOT NULL DEFAULT 0,
+    complete    INTEGER NOT NULL DEFAULT 0,
+    fetched_at  REAL
+);
+"""
+
+
+class DiscoveryStore:
+    """SQLite store for discovery hits. Use from a single thread."""
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = self._open()
+        if self.db.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            # Older layout (or a new file): start over rather than migrate.
+            self.db.close()
+            self.path.unlink(missing_ok=True)
+            self.db = self._open()
+            self.db.executescript(SCHEMA)
+            self.db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.db.execute("CREATE TEMP TABLE selected (key TEXT PRIMARY KEY, pos INTEGER)")
+
+    def _open(self):
+        db = sqlite3.connect(str(self.path))
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        return db
+
+    # ── freshness ──────────────────────────────────────────────
+
+    def fresh(self, key, max_hits, ttl):
+        """Return the stored query row if it can stand in for a new fetch.
+
+        A result is fresh when it completed within `ttl` seconds and was
+        fetched with a cap at least as large as `max_hits` (or covered
+        every hit the API reported).
+        """
+        row = self.db.execute(
+            "SELECT query, total_hits, max_hits, fetched, pages, fetched_at FROM queries "
+            "WHERE key = ? AND complete = 1", (key,)).fetchone()
+        if row is None or time.time() - row[5] > ttl:
+            return None
+        stored_cap, total_hits = row[2], row[1]
+        covered = (stored_cap == 0 or total_hits <= stored_cap
+                   or (max_hits and stored_cap >= max_hits))
+        if not covered:
+            return None
+        return dict(zip(("query", "total_hits", "max_hits", "fetched", "pages",
+                         "fetched_at"), row))
+
+    def pages(self, key):
+        row = self.db.execute("SELECT pages FROM queries WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else 0
+
+    # ── writes ─────────────────────────────────────────────────
+
+    def begin_query(self, key, query, total_hits, max_hits):
+        """Forget any earlier result for `key` before its pages are stored."""
+        self.db.execute("DELETE FROM hits WHERE query = ?", (key,))
+        self.db.execute(
+            "INSERT OR REPLACE INTO queries (key, query, total_hits, max_hits) "
+            "VALUES (?, ?, ?, ?)", (key, query, total_hits, max_hits))
+
+    def add_hits(self, key, hits):
+        """Store one page of hits for query `key` and commit. Returns hits stored."""
+        db = self.db
+        stored = 0
+        for hit in hits:
+            doc_id = hit.get("efta_id") or hit.get("id", "unknown")
+            cur = db.execute("INSERT OR IGNORE INTO hits VALUES (?, ?)", (key, doc_id))
+            if not cur.rowcount:
+                continue  # same document on two pages of one query
+            stored += 1
+            db.execute(
+                "INSERT OR IGNORE INTO documents VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (doc_id, hit.get("doc_type", "unknown"), hit.get("source", "unknown"),
+                 hit.get("dataset", "unknown"), hit.get("file_path", ""),
+                 hit.get("pages", 0), hit.get("char_count", 0),
+                 (hit.get("content_preview") or "")[:300]))
+            db.executemany("INSERT OR IGNORE INTO doc_people VALUES (?, ?)",
+                           [(doc_id, p.strip()) for p in hit.get("people", []) if p.strip()])
+            db.executemany("INSERT OR IGNORE INTO doc_locations VALUES (?, ?)",
+                           [(doc_id, loc.strip()) for loc in hit.get("locations", [])
+                            if loc.strip()])
+        db.execute("UPDATE queries SET fetched = fetched + ?, pages = pages + 1 WHERE key = ?",
+                   (stored, key))
+        db.commit()
+        return stored
+
+    def finish_query(self, key, complete=True):
+        """Mark a query's pages as all stored (or not, if a page failed)."""
+        self.db.execute("UPDATE queries SET complete = ?, fetched_at = ? WHERE key = ?",
+                        (int(complete), time.time(), key))
+        self.db.commit()
+
+    # ── report queries ─────────────────────────────────────────
+
+    def select(self, keys):
+        """Restrict the report queries below to these query keys, in this order."""
+        self.db.execute("DELETE FROM selected")
+        self.db.executemany("INSERT OR IGNORE INTO selected VALUES (?, ?)",
+                            [(key, pos) for pos, key in enumerate(keys)])
+
+    def totals(self):
+        """Unique documents, people and locations for the selected queries."""
+        return {
+            "unique_documents": self._scalar(
+                "SELECT COUNT(DISTINCT doc_id) FROM hits JOIN selected ON key = query"),
+            "unique_people": self._scalar(
+                "SELECT COUNT(DISTINCT person) FROM hits JOIN selected ON key = query "
+                "JOIN doc_people USING (doc_id)"),
+            "unique_locations": self._scalar(
+                "SELECT COUNT(DISTINCT location) FROM hits JOIN selected ON key = query "
+                "JOIN doc_locations USING (doc_id)"),
+        }
+
+    def query_hit_counts(self):
+        return dict(self.db.execute(
+            "SELECT q.query, q.total_hits FROM queries q JOIN selected s USING (key) "
+            "ORDER BY q.total_hits DESC, s.pos"))
+
+    def people_by_mentions(self):
+        return dict(self.db.execute(
+            "SELECT person, COUNT(*) AS n FROM hits JOIN selected ON key = query "
+            "JOIN doc_people USING (doc_id) "
+            "GROUP BY person ORDER BY n DESC, MIN(hits.rowid)"))
+
+    def locations_by_mentions(self):
+        return dict(self.db.execute(
+            "SELECT location, COUNT(*) AS n FROM hits JOIN selected ON key = query "
+            "JOIN doc_locations USING (doc_id) "
+            "GROUP BY location ORDER BY n DESC, MIN(hits.rowid)"))
+
+    def hit_people(self):
+        """Yield the people on each selected hit, one list per (query, document)."""
+        rows = self.db.execute(
+            "SELECT hits.rowid, person FROM hits JOIN selected ON key = query "
+            "JOIN doc_people USING (doc_id) ORDER BY hits.rowid")
+        for _, group in itertools.groupby(rows, key=lambda row: row[0]):
+            yield [person for _, person in group]
+
+    def documents(self, limit=None, preview_chars=300):
+        """Documents hit by the selected queries, in discovery order."""
+        sql = ("SELECT * FROM documents WHERE doc_id IN "
+               "(SELECT doc_id FROM hits JOIN selected ON key = query) ORDER BY rowid")
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        docs = []
+        for row in self.db.execute(sql).fetchall():
+            doc_id = row[0]
+            docs.append({
+                "doc_id": doc_id,
+                "doc_type": row[1],
+                "source": row[2],
+                "dataset": row[3],
+                "pages": row[5],
+                "char_count": row[6],
+                "people": self._column(
+                    "SELECT person FROM doc_people WHERE doc_id = ? ORDER BY person", doc_id),
+                "locations": self._column(
+                    "SELECT location FROM doc_locations WHERE doc_id = ? ORDER BY location",
+                    doc_id),
+                "queries_matched": self._column(
+                    "SELECT q.query FROM hits JOIN selected s ON s.key = hits.query "
+                    "JOIN queries q ON q.key = hits.query "
+                    "WHERE hits.doc_id = ? ORDER BY q.query", doc_id),
+                "preview": row[7][:preview_chars],
+            })
+        return docs
+
+    def _scalar(self, sql, *params):
+        return self.db.execute(sql, params).fetchone()[0]
+
+    def _column(self, sql, *params):
+        return [value for (value,) in self.db.execute(sql, params)]
+
+    def close(self):
+        self.db.close()
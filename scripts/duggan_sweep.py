@@ -5,20 +5,39 @@ Queries the DugganUSA Epstein Files API for entities with few or no mentions,
 recording hit counts and top result snippets for evidence reconciliation.
 
 Usage:
-  python3 scripts/duggan_sweep.py [--threshold N]
+  python3 scripts/duggan_sweep.py [--threshold N] [--offline] [--resume]
+                                  [--concurrency N] [--rps R]
+
+--concurrency N runs the sweep on an asyncio loop with up to N requests in
+flight. All requests still draw from one token bucket, so the sweep never
+exceeds --rps requests per second (default: 1 / RATE_LIMIT). Results are
+written in the same order as a sequential sweep. Both modes report
+throughput, request latency (the network round trip, retries included)
+and, separately, how long requests queued for the rate limiter.
+
+Each entity's result is appended to .cache/checkpoints/duggan_sweep.jsonl
+as it arrives; --resume continues an interrupted sweep from there. The
+results file is written from the checkpoint when the sweep completes.
+
+Responses are cached in .cache/http_cache.sqlite; --offline serves only
+from the cache.
 
 API: https://analytics.dugganusa.com/api/v1/search
 No authentication required.
 """
+import asyncio
 import json
+import statistics
 import sys
 import time
-import urllib.error
-import urllib.request
-import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 
+from checkpoint import Checkpoint
+from http_client import HTTPError, HttpClient, RequestError
+from response_cache import ResponseCache
+
 API_URL = "https://analytics.dugganusa.com/api/v1/search"
 UA = "unify-graph/1.0 (Epstein network research; contact@dugganusa.com)"
 RATE_LIMIT = 1.0  # seconds between requests
@@ -26,23 +45,23 @@ RATE_LIMIT = 1.0  # seconds between requests
 # Entities with mention_count <= this are swept
 DEFAULT_THRESHOLD = 20
 
+HTTP = HttpClient(user_agent=UA, rate_limits={API_URL: 1 / RATE_LIMIT},
+                  cache=ResponseCache())
+
 
 def api_search(query, max_results=10):
     """Search DugganUSA API, return parsed response or None."""
-    params = urllib.parse.urlencode({
+    params = {
         "q": query,
         "indexes": "epstein_files",
         "limit": str(max_results),
-    })
-    url = f"{API_URL}?{params}"
+    }
     try:
-        req = urllib.request.Request(url, headers={"User-Agent": UA})
-        with urllib.request.urlopen(req, timeout=15) as resp:
-            return json.loads(resp.read())
-    except urllib.error.HTTPError as e:
+        return HTTP.get_json(API_URL, params)
+    except HTTPError as e:
         print(f"  HTTP {e.code}: {e.reason}", file=sys.stderr)
         return None
-    except Exception as e:
+    except (RequestError, ValueError) as e:
         print(f"  ERROR: {e}", file=sys.stderr)
         return None
 
@@ -78,12 +97,130 @@ def extract_hits(response):
     return total, hits
 
 
-def main():
-    threshold = DEFAULT_THRESHOLD
-    if "--threshold" in sys.argv:
-        idx = sys.argv.index("--threshold")
+def sweep_entity(ent):
+    """Query one entity. Returns (result dict or None on error,
+    (latency, queue wait) in seconds)."""
+    name = ent["name"]
+    old_mentions = ent.get("mention_count", 0)
+
+    start = time.perf_counter()
+    waited = HTTP.throttle_wait()
+    resp = api_search(name)
+    wait = HTTP.throttle_wait() - waited
+    timing = (time.perf_counter() - start - wait, wait)
+
+    if resp is None:
+        return None, timing
+
+    total, hits = extract_hits(resp)
+    return {
+        "name": name,
+        "old_mentions": old_mentions,
+        "new_total": total,
+        "delta": total - old_mentions if total > old_mentions else 0,
+        "top_results": hits[:5],
+        "raw_response_keys": list(resp.keys()) if isinstance(resp, dict) else type(resp).__name__,
+    }, timing
+
+
+def record(checkpoint, key, result):
+    if result is None:
+        checkpoint.record(key, "error")
+    else:
+        checkpoint.record(key, "ok", result)
+
+
+def sweep_sequential(targets, keys, checkpoint):
+    """Sweep one entity at a time. Returns (latency, queue wait) per request."""
+    timings = []
+    for key in keys:
+        ent = targets[key]
+        sys.stdout.write(f"  {key:<30} {ent['name']:<30} (was {ent.get('mention_count', 0)}) ... ")
+        sys.stdout.flush()
+
+        result, timing = sweep_entity(ent)
+        timings.append(timing)
+        record(checkpoint, key, result)
+
+        if result is None:
+            print("ERROR")
+            continue
+        marker = " NEW!" if result["new_total"] > result["old_mentions"] else ""
+        print(f"{result['new_total']} hits{marker}")
+    return timings
+
+
+async def sweep_concurrent(targets, keys, checkpoint, concurrency):
+    """Sweep with up to `concurrency` requests in flight.
+
+    Requests run on a dedicated thread pool through the shared client, whose
+    token bucket for the API host caps the overall request rate. Results are
+    checkpointed in completion order. Returns (latency, queue wait) per
+    request.
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+    done = 0
+
+    async def run(key):
+        nonlocal done
+        async with semaphore:
+            result, timing = await loop.run_in_executor(pool, sweep_entity, targets[key])
+        done += 1
+        record(checkpoint, key, result)
+        if result is None:
+            status = "ERROR"
+        else:
+            marker = " NEW!" if result["new_total"] > result["old_mentions"] else ""
+            status = f"{result['new_total']} hits{marker}"
+        print(f"  [{done:>4}/{len(keys)}] {key:<30} {status}")
+        return timing
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return await asyncio.gather(*(run(key) for key in keys))
+
+
+def latency_stats(timings, elapsed):
+    """Throughput, plus latency and rate-limiter queue wait percentiles,
+    for a sweep's (latency, queue wait) pairs."""
+    if not timings:
+        return {"requests": 0, "elapsed_s": round(elapsed, 3)}
+    stats = {
+        "requests": len(timings),
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(timings) / elapsed, 3) if elapsed else None,
+    }
+    for label, values in (("latency", [t[0] for t in timings]),
+                          ("queue_wait", [t[1] for t in timings])):
+        ordered = sorted(values)
+
+        def pct(p):
+            return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+        stats.update({
+            f"{label}_mean_s": round(statistics.mean(ordered), 3),
+            f"{label}_p50_s": round(pct(0.50), 3),
+            f"{label}_p95_s": round(pct(0.95), 3),
+            f"{label}_max_s": round(ordered[-1], 3),
+        })
+    return stats
+
+
+def _arg(flag, default, cast):
+    if flag in sys.argv:
+        idx = sys.argv.index(flag)
         if idx + 1 < len(sys.argv):
-            threshold = int(sys.argv[idx + 1])
+            return cast(sys.argv[idx + 1])
+    return default
+
+
+def main():
+    threshold = _arg("--threshold", DEFAULT_THRESHOLD, int)
+    concurrency = max(1, _arg("--concurrency", 1, int))
+    rps = _arg("--rps", 1 / RATE_LIMIT, float)
+    resume = "--resume" in sys.argv
+    if "--offline" in sys.argv:
+        HTTP.cache.offline = True
 
     # Load entities
     try:
@@ -101,43 +238,40 @@ def main():
         if mentions <= threshold:
             targets[key] = ent
 
-    print(f"DugganUSA sweep: {len(targets)} entities with mention_count <= {threshold}\n")
-
-    results = {}
-    errors = []
-    new_hits = 0
+    print(f"DugganUSA sweep: {len(targets)} entities with mention_count <= {threshold}")
+    print(f"  {concurrency} in flight, <= {rps:g} req/s\n")
 
-    for key in sorted(targets.keys()):
-        ent = targets[key]
-        name = ent["name"]
-        old_mentions = ent.get("mention_count", 0)
+    checkpoint = Checkpoint("duggan_sweep", meta={"threshold": threshold}, resume=resume)
+    pending = [key for key in sorted(targets) if not checkpoint.is_done(key)]
+    if checkpoint.resumed:
+        print(f"  resuming: {checkpoint.resumed} already done, {len(pending)} to go\n")
 
-        sys.stdout.write(f"  {key:<30} {name:<30} (was {old_mentions}) ... ")
-        sys.stdout.flush()
+    # One bucket for the API host; burst 1 keeps requests evenly spaced.
+    HTTP.set_rate(API_URL, rps)
+    HTTP.max_idle = max(HTTP.max_idle, concurrency)
 
-        resp = api_search(name)
-        time.sleep(RATE_LIMIT)
+    start = time.perf_counter()
+    if concurrency > 1:
+        timings = asyncio.run(sweep_concurrent(targets, pending, checkpoint, concurrency))
+    else:
+        timings = sweep_sequential(targets, pending, checkpoint)
+    stats = latency_stats(timings, time.perf_counter() - start)
 
-        if resp is None:
+    # Compact the checkpoint into the results file, in key order.
+    outcomes = checkpoint.load()
+    results = {}
+    errors = []
+    new_hits = 0
+    for key in sorted(outcomes):
+        if key not in targets:
+            continue
+        status, result = outcomes[key]
+        if status != "ok":
             errors.append(key)
-            print("ERROR")
             continue
-
-        total, hits = extract_hits(resp)
-
-        results[key] = {
-            "name": name,
-            "old_mentions": old_mentions,
-            "new_total": total,
-            "delta": total - old_mentions if total > old_mentions else 0,
-            "top_results": hits[:5],
-            "raw_response_keys": list(resp.keys()) if isinstance(resp, dict) else type(resp).__name__,
-        }
-
-        marker = " NEW!" if total > old_mentions else ""
-        if total > 0:
+        results[key] = result
+        if result["new_total"] > 0:
             new_hits += 1
-        print(f"{total} hits{marker}")
 
     # Write results
     output = {
@@ -146,15 +280,23 @@ def main():
         "entities_swept": len(targets),
         "entities_with_hits": new_hits,
         "errors": errors,
+        "stats": {"concurrency": concurrency, "rps_limit": rps, **stats},
         "results": results,
     }
 
     out_path = Path("scripts/duggan_sweep_results.json")
     with open(out_path, "w") as f:
         json.dump(output, f, indent=2)
+    checkpoint.remove()
 
     print(f"\nDone: {len(targets)} swept, {new_hits} with hits, {len(errors)} errors")
     print(f"Output: {out_path}")
+    if stats["requests"]:
+        print(f"Throughput: {stats['throughput_rps']} req/s over {stats['elapsed_s']}s; "
+              f"latency p50 {stats['latency_p50_s']}s, p95 {stats['latency_p95_s']}s, "
+              f"max {stats['latency_max_s']}s; rate-limit queue p50 "
+              f"{stats['queue_wait_p50_s']}s, p95 {stats['queue_wait_p95_s']}s")
+    print(HTTP.cache.summary())
 
     # Summary of entities with significant new hits
     upgrades = [(k, v) for k, v in results.items() if v["new_total"] > v["old_mentions"]]
@@ -3,116 +3,169 @@
 
 Downloads the entity CSV from epsteininvestigation.org and matches against
 the 132 entities in unify-graph, emitting a CUE overlay file with archive IDs.
+The CSV is streamed and indexed row by row, never held whole in memory.
 
 Usage:
   python3 scripts/epstein_archive_sweep.py             # emit CUE to stdout
   python3 scripts/epstein_archive_sweep.py --dry-run    # preview matches only
+  python3 scripts/epstein_archive_sweep.py --save .cache/archive.csv.gz
+                                                        # also keep the download
+  python3 scripts/epstein_archive_sweep.py --file .cache/archive.csv.gz
+                                                        # re-match a saved CSV (plain or gzip)
 
 Source: https://www.epsteininvestigation.org/api/download/entities
 """
+import contextlib
 import csv
-import difflib
+import gzip
 import io
-import json
-import pathlib
-import subprocess
+import os
 import sys
-import urllib.error
-import urllib.request
+from pathlib import Path
+
+from graph_nodes import GraphUnavailable
+from http_client import HTTPError, HttpClient, TransportError
+from name_index import NameIndex
+import resolve
 
 ARCHIVE_URL = "https://www.epsteininvestigation.org/api/download/entities"
 UA = "unify-graph/1.0 (Epstein network research)"
-FUZZY_THRESHOLD = 0.85
+FUZZY_CANDIDATES = 5  # archive names considered per entity before giving up
+
+HTTP = HttpClient(user_agent=UA, timeout=30)
 
 
 def load_graph_nodes():
-    """Load entity list from CUE export."""
+    """Load entity names and aliases from the prebuilt name index.
+
+    Returns ({id: name}, {id: [alias, ...]}).
+    """
     try:
-        result = subprocess.run(
-            ["cue", "export", "-e", "graph.nodes", "./..."],
-            capture_output=True, text=True, check=True,
-            cwd=str(pathlib.Path(__file__).resolve().parent.parent),
-        )
-        nodes = json.loads(result.stdout)
-        return {n["id"]: n["name"] for n in nodes}
-    except subprocess.CalledProcessError as e:
-        print(f"ERROR: cue export failed: {e.stderr.strip()}", file=sys.stderr)
-        sys.exit(1)
-    except (json.JSONDecodeError, KeyError) as e:
-        print(f"ERROR: failed to parse CUE output: {e}", file=sys.stderr)
+        index = NameIndex.load()
+    except GraphUnavailable as e:
+        print(f"ERROR: {e}", file=sys.stderr)
         sys.exit(1)
+    return index.entities(), index.alias_map()
+
 
+def archive_lines(path=None, save=None):
+    """Lines of the archive entity CSV, as they arrive.
 
-def download_archive_csv():
-    """Download entity CSV from Epstein Document Archive."""
+    Streams the download through an incremental decoder, or reads `path`
+    (a saved CSV, plain or gzip-compressed) when given. With `save`, the
+    downloaded lines are also written there (gzip-compressed if it ends
+    in .gz) for re-matching later with --file; the file only appears
+    once the download has completed.
+    """
+    if path:
+        yield from _file_lines(path)
+        return
     try:
-        req = urllib.request.Request(ARCHIVE_URL, headers={"User-Agent": UA})
-        with urllib.request.urlopen(req, timeout=30) as resp:
-            raw = resp.read().decode("utf-8", errors="replace")
-            return raw
-    except urllib.error.HTTPError as e:
+        resp = HTTP.get(ARCHIVE_URL, stream=True)
+    except HTTPError as e:
         print(f"ERROR: Archive API returned HTTP {e.code}: {e.reason}",
               file=sys.stderr)
         sys.exit(1)
-    except urllib.error.URLError as e:
-        print(f"ERROR: Cannot reach archive API: {e.reason}", file=sys.stderr)
+    except TransportError as e:
+        print(f"ERROR: Cannot reach archive API: {e}", file=sys.stderr)
         print("  The site may be down. Try again later.", file=sys.stderr)
         sys.exit(1)
     except Exception as e:
         print(f"ERROR: Download failed: {e}", file=sys.stderr)
         sys.exit(1)
 
+    with resp, contextlib.ExitStack() as stack:
+        out = None
+        if save:
+            tmp = Path(f"{save}.part")
+            opener = gzip.open if str(save).endswith(".gz") else open
+            out = stack.enter_context(opener(tmp, "wt", encoding="utf-8", newline=""))
+        try:
+            for line in resp.iter_lines():
+                if out:
+                    out.write(line)
+                yield line
+        except TransportError as e:
+            print(f"ERROR: Archive download interrupted: {e}", file=sys.stderr)
+            sys.exit(1)
+        if out:
+            out.close()
+            os.replace(tmp, save)
+            print(f"  Saved archive CSV to {save}", file=sys.stderr)
+
+
+def _file_lines(path):
+    try:
+        with open(path, "rb") as f:
+            compressed = f.read(2) == b"\x1f\x8b"
+        opener = gzip.open if compressed else open
+        with opener(path, "rt", encoding="utf-8", errors="replace", newline="") as f:
+            yield from f
+    except OSError as e:
+        print(f"ERROR: Cannot read {path}: {e}", file=sys.stderr)
+        sys.exit(1)
 
-def parse_archive_csv(raw_csv):
-    """Parse archive CSV into list of dicts.
+
+def _archive_rows(reader):
+    """Entries from a csv.DictReader over the archive CSV.
 
     Expected columns vary, but we look for an ID column and a name column.
-    Returns list of {id, name, doc_count (if available), ...}.
+    Which columns those are is settled once, from the header row.
+    Yields {id, name, doc_count (if available)}.
     """
-    reader = csv.DictReader(io.StringIO(raw_csv))
-    rows = []
+    if not reader.fieldnames:
+        return
+    # Normalize field names to lowercase (the last of any duplicates wins)
+    columns = {k.strip().lower(): k for k in reader.fieldnames if k}
+
+    def find(*keys):
+        return next((columns[k] for k in keys if k in columns), None)
+
+    # Fall back to the first column for the ID
+    id_col = find("id", "entity_id", "entityid") or reader.fieldnames[0]
+    name_col = find("name", "entity_name", "entityname", "full_name")
+    count_col = find("doc_count", "document_count", "documents", "count", "docs")
+    if name_col is None:
+        # If no name column found, there is nothing to match
+        return
+
     for row in reader:
-        # Normalize field names to lowercase
-        norm = {k.strip().lower(): v.strip() for k, v in row.items() if k}
-        entry = {}
-
-        # Find ID field
-        for key in ("id", "entity_id", "entityid"):
-            if key in norm:
-                entry["id"] = norm[key]
-                break
-        if "id" not in entry:
-            # Fall back to first column
-            first_key = list(row.keys())[0].strip().lower() if row else None
-            if first_key:
-                entry["id"] = row[list(row.keys())[0]].strip()
-
-        # Find name field
-        for key in ("name", "entity_name", "entityname", "full_name"):
-            if key in norm:
-                entry["name"] = norm[key]
-                break
-        if "name" not in entry:
-            # If no name column found, skip
+        name = (row.get(name_col) or "").strip()
+        if not name:
             continue
+        entry = {"id": (row.get(id_col) or "").strip(), "name": name}
+        if count_col is not None:
+            try:
+                entry["doc_count"] = int((row.get(count_col) or "").strip())
+            except ValueError:
+                entry["doc_count"] = 0
+        yield entry
 
-        # Find document count if available
-        for key in ("doc_count", "document_count", "documents", "count", "docs"):
-            if key in norm:
-                try:
-                    entry["doc_count"] = int(norm[key])
-                except (ValueError, TypeError):
-                    entry["doc_count"] = 0
-                break
 
-        if entry.get("name"):
-            rows.append(entry)
+def parse_archive_csv(source):
+    """Parse archive CSV (text or an iterable of lines) into a list of dicts."""
+    if isinstance(source, str):
+        source = io.StringIO(source)
+    return list(_archive_rows(csv.DictReader(source)))
 
-    return rows
 
+def load_archive(lines):
+    """Parse and index archive entries while the CSV streams in.
+
+    Returns (entries, {lowercase name: entry}, CSV columns).
+    """
+    reader = csv.DictReader(lines)
+    entries, by_name = [], {}
+    for entry in _archive_rows(reader):
+        entries.append(entry)
+        by_name[entry["name"].lower()] = entry
+    return entries, by_name, reader.fieldnames or []
 
-def match_entities(graph_nodes, archive_entries):
-    """Match graph entities against archive entries.
+
+def match_entities(graph_nodes, archive_entries, aliases=None, archive_by_name=None):
+    """Match graph entities against archive entries. aliases
+    ({id: [alias, ...]}) are tried after the name in the exact pass;
+    archive_by_name is load_archive()'s index, built here if not given.
 
     Returns:
       matches: dict of {entity_id: {archive_id, archive_name, method, score}}
@@ -120,47 +173,51 @@ def match_entities(graph_nodes, archive_entries):
       unmatched_archive: list of archive entries with no match
     """
     # Build lookup: lowercase name -> archive entry
-    archive_by_name = {}
-    for entry in archive_entries:
-        key = entry["name"].lower().strip()
-        archive_by_name[key] = entry
+    if archive_by_name is None:
+        archive_by_name = {}
+        for entry in archive_entries:
+            key = entry["name"].lower().strip()
+            archive_by_name[key] = entry
 
     archive_names_lower = list(archive_by_name.keys())
 
     matches = {}
     matched_archive_names = set()
 
-    # Pass 1: exact match (case-insensitive)
+    # Pass 1: exact match (case-insensitive), on the name then each alias
+    aliases = aliases or {}
     for eid, name in sorted(graph_nodes.items()):
-        name_lower = name.lower().strip()
-        if name_lower in archive_by_name:
-            ae = archive_by_name[name_lower]
-            matches[eid] = {
-                "archive_id": ae.get("id", ""),
-                "archive_name": ae["name"],
-                "method": "exact",
-                "score": 1.0,
-                "doc_count": ae.get("doc_count"),
-            }
-            matched_archive_names.add(name_lower)
+        for method, candidate in [("exact", name)] + [("alias", a) for a in aliases.get(eid, [])]:
+            name_lower = candidate.lower().strip()
+            if name_lower in archive_by_name:
+                ae = archive_by_name[name_lower]
+                matches[eid] = {
+                    "archive_id": ae.get("id", ""),
+                    "archive_name": ae["name"],
+                    "method": method,
+                    "score": 1.0,
+                    "doc_count": ae.get("doc_count"),
+                }
+                matched_archive_names.add(name_lower)
+                break
 
     # Pass 2: fuzzy match for remaining
     remaining = {eid: name for eid, name in graph_nodes.items()
                  if eid not in matches}
     remaining_archive = [n for n in archive_names_lower
                          if n not in matched_archive_names]
-
-    for eid, name in sorted(remaining.items()):
-        name_lower = name.lower().strip()
-        best = difflib.get_close_matches(
-            name_lower, remaining_archive, n=1, cutoff=FUZZY_THRESHOLD
-        )
-        if best:
-            match_name = best[0]
+    resolver = resolve.Resolver(remaining_archive, source="epstein_archive")
+    order = sorted(remaining)
+    shortlists = resolver.top_k((remaining[eid] for eid in order),
+                                k=FUZZY_CANDIDATES, min_score=resolver.threshold)
+
+    # Each archive name goes to the first entity (in sorted order) that wants it
+    for eid, shortlist in zip(order, shortlists):
+        for idx, score in shortlist:
+            match_name = remaining_archive[idx]
+            if match_name in matched_archive_names:
+                continue
             ae = archive_by_name[match_name]
-            score = difflib.SequenceMatcher(
-                None, name_lower, match_name
-            ).ratio()
             matches[eid] = {
                 "archive_id": ae.get("id", ""),
                 "archive_name": ae["name"],
@@ -169,7 +226,7 @@ def match_entities(graph_nodes, archive_entries):
                 "doc_count": ae.get("doc_count"),
             }
             matched_archive_names.add(match_name)
-            remaining_archive.remove(match_name)
+            break
 
     unmatched_graph = [(eid, graph_nodes[eid]) for eid in sorted(graph_nodes)
                        if eid not in matches]
@@ -184,6 +241,8 @@ def emit_cue(matches):
     print("// Epstein Document Archive entity IDs.")
     print("// Source: https://www.epsteininvestigation.org/api/download/entities")
     print("// Auto-generated by scripts/epstein_archive_sweep.py")
+    print("@if(!compact_ids)")
+    print()
     print("package creeps")
     print()
     print("entities: {")
@@ -195,6 +254,8 @@ def emit_cue(matches):
         method_note = ""
         if m["method"] == "fuzzy":
             method_note = f'  // fuzzy {m["score"]:.0%} -> {m["archive_name"]}'
+        elif m["method"] == "alias":
+            method_note = f'  // alias -> {m["archive_name"]}'
         print(f'\t{eid}: external_ids: epstein_archive: "{aid}"{method_note}')
     print("}")
 
@@ -202,15 +263,17 @@ def emit_cue(matches):
 def print_summary(matches, unmatched_graph, unmatched_archive):
     """Print reconciliation summary to stderr."""
     exact = sum(1 for m in matches.values() if m["method"] == "exact")
+    alias = sum(1 for m in matches.values() if m["method"] == "alias")
     fuzzy = sum(1 for m in matches.values() if m["method"] == "fuzzy")
 
     print(f"\n--- Epstein Archive Reconciliation ---", file=sys.stderr)
-    print(f"Matched:   {len(matches)} ({exact} exact, {fuzzy} fuzzy)",
+    print(f"Matched:   {len(matches)} ({exact} exact, {alias} alias, {fuzzy} fuzzy)",
           file=sys.stderr)
     print(f"Unmatched: {len(unmatched_graph)} graph entities",
           file=sys.stderr)
     print(f"Archive entities not in graph: {len(unmatched_archive)}",
           file=sys.stderr)
+    print(resolve.summary(), file=sys.stderr)
 
     if unmatched_graph:
         # Sort by name; if we have doc_count data from archive near-misses,
@@ -244,31 +307,42 @@ def print_summary(matches, unmatched_graph, unmatched_archive):
                       f"({m['score']:.0%})", file=sys.stderr)
 
 
+def _arg(flag, default, cast):
+    if flag in sys.argv:
+        idx = sys.argv.index(flag)
+        if idx + 1 < len(sys.argv):
+            return cast(sys.argv[idx + 1])
+    return default
+
+
 def main():
     dry_run = "--dry-run" in sys.argv
+    path = _arg("--file", None, str)
+    save = _arg("--save", None, str)
 
     # Step 1: load graph entities
-    print("Loading graph entities from CUE...", file=sys.stderr)
-    graph_nodes = load_graph_nodes()
+    print("Loading graph entities...", file=sys.stderr)
+    graph_nodes, aliases = load_graph_nodes()
     print(f"  {len(graph_nodes)} entities loaded", file=sys.stderr)
 
-    # Step 2: download archive CSV
-    print("Downloading archive entity CSV...", file=sys.stderr)
-    raw_csv = download_archive_csv()
-    archive_entries = parse_archive_csv(raw_csv)
+    # Step 2: stream the archive CSV, indexing rows as they arrive
+    if path:
+        print(f"Reading archive entity CSV from {path}...", file=sys.stderr)
+    else:
+        print("Downloading archive entity CSV...", file=sys.stderr)
+    archive_entries, archive_by_name, columns = load_archive(archive_lines(path, save))
     print(f"  {len(archive_entries)} archive entities parsed", file=sys.stderr)
 
     if not archive_entries:
         print("ERROR: No entities parsed from CSV. Format may have changed.",
               file=sys.stderr)
-        print("First 500 chars of response:", file=sys.stderr)
-        print(raw_csv[:500], file=sys.stderr)
+        print(f"CSV columns: {columns}", file=sys.stderr)
         sys.exit(1)
 
     # Step 3: match
     print("Matching entities...", file=sys.stderr)
     matches, unmatched_graph, unmatched_archive = match_entities(
-        graph_nodes, archive_entries
+        graph_nodes, archive_entries, aliases, archive_by_name
     )
 
     # Step 4: summary (always to stderr)
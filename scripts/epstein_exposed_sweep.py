@@ -5,50 +5,174 @@ Paginates https://epsteinexposed.com/api/v1/persons, matches against
 the 132 entities in unify-graph (exact then fuzzy), and emits a CUE
 overlay file to stdout.
 
+Pages are fetched concurrently at the API's 100 req/min and kept in
+.cache/epstein_exposed/. Every run revalidates the cached pages instead
+of refetching them blind: a page the API answers 304 for (If-None-Match
+on its ETag, else If-Modified-Since on its Last-Modified) is served from
+the cache. A page cached without either validator has to be downloaded
+again; its persons hash then only tells whether it changed. --since
+lists which pages changed since the last run.
+
 Usage:
   python3 scripts/epstein_exposed_sweep.py             # emit CUE overlay
   python3 scripts/epstein_exposed_sweep.py --dry-run   # preview matches only
+  python3 scripts/epstein_exposed_sweep.py --since     # also list changed pages
+  python3 scripts/epstein_exposed_sweep.py --concurrency 8
 
 API: https://epsteinexposed.com/api/v1/persons
 No authentication required. Rate limit: 100 req/min.
 """
-import difflib
+import hashlib
 import json
-import pathlib
-import subprocess
+import os
 import sys
 import time
-import urllib.error
-import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from graph_nodes import GraphUnavailable
+from http_client import HTTPError, HttpClient, RequestError
+from name_index import NameIndex
+import resolve
 
+REPO_ROOT = Path(__file__).resolve().parent.parent
 API_BASE = "https://epsteinexposed.com/api/v1/persons"
 UA = "unify-graph/1.0 (Epstein network research)"
 PER_PAGE = 100
-RATE_DELAY = 0.7  # seconds between paginated requests
-FUZZY_THRESHOLD = 0.85
-
-
-def fetch_page(page):
-    """Fetch a single page of persons from the API."""
-    url = f"{API_BASE}?page={page}&per_page={PER_PAGE}"
+RATE_PER_MINUTE = 100  # documented API budget
+CONCURRENCY = 4        # pages in flight; the token bucket sets the pace
+PAGE_CACHE_DIR = REPO_ROOT / ".cache" / "epstein_exposed"
+
+# burst=1: one request every 0.6s, so no 60s window ever sees more than 100
+HTTP = HttpClient(user_agent=UA, timeout=20, rate_limits={API_BASE: RATE_PER_MINUTE / 60})
+
+NOT_MODIFIED = object()
+
+
+class PageCache:
+    """Fetched pages on disk, one JSON file per page:
+
+      {"page", "per_page", "etag", "last_modified", "sha256", "fetched_at", "body"}
+
+    sha256 covers the page's person records only, so a page whose
+    meta.total moved but whose persons did not counts as unchanged.
+    Bypassed, like the response cache, under UNIFY_NO_CACHE=1 and
+    UNIFY_MOCK_URL.
+    """
+
+    def __init__(self, path=PAGE_CACHE_DIR, enabled=None):
+        self.path = Path(path)
+        if enabled is None:
+            enabled = (os.environ.get("UNIFY_NO_CACHE") != "1"
+                       and not os.environ.get("UNIFY_MOCK_URL"))
+        self.enabled = enabled
+
+    def _file(self, page):
+        return self.path / f"page-{page:05d}.json"
+
+    def get(self, page):
+        if not self.enabled:
+            return None
+        try:
+            entry = json.loads(self._file(page).read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        return entry if entry.get("per_page") == PER_PAGE else None
+
+    def put(self, page, body, etag, last_modified=None):
+        entry = {"page": page, "per_page": PER_PAGE, "etag": etag,
+                 "last_modified": last_modified, "sha256": content_hash(body),
+                 "fetched_at": time.time(), "body": body}
+        if self.enabled:
+            self.path.mkdir(parents=True, exist_ok=True)
+            tmp = self._file(page).with_suffix(".tmp")
+            tmp.write_text(json.dumps(entry))
+            os.replace(tmp, self._file(page))
+        return entry
+
+    def prune(self, total_pages):
+        """Drop pages past the end (the person count shrank)."""
+        if not self.enabled or not self.path.exists():
+            return
+        for f in self.path.glob("page-*.json"):
+            if int(f.stem.split("-")[1]) > total_pages:
+                f.unlink()
+
+
+def content_hash(body):
+    data = json.dumps(body.get("data", []), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+def fetch_page(page, cached=None):
+    """Fetch a single page of persons from the API.
+
+    Returns (body, etag, last_modified). With a `cached` entry the request
+    is conditional on its validators and an unchanged page returns
+    NOT_MODIFIED as the body; failures return (None, None, None).
+    """
+    cached = cached or {}
+    headers = {}
+    if cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+    elif cached.get("last_modified"):
+        headers["If-Modified-Since"] = cached["last_modified"]
     try:
-        req = urllib.request.Request(url, headers={"User-Agent": UA})
-        with urllib.request.urlopen(req, timeout=20) as resp:
-            return json.loads(resp.read())
-    except urllib.error.HTTPError as e:
-        print(f"  HTTP {e.code}: {e.reason}", file=sys.stderr)
-        return None
-    except Exception as e:
+        resp = HTTP.get(API_BASE, {"page": page, "per_page": PER_PAGE},
+                        headers=headers or None)
+        return resp.json(), resp.headers.get("etag"), resp.headers.get("last-modified")
+    except HTTPError as e:
+        if e.code == 304 and headers:
+            return NOT_MODIFIED, cached.get("etag"), cached.get("last_modified")
+        print(f"  HTTP {e.code} on page {page}: {e.reason}", file=sys.stderr)
+        return None, None, None
+    except (RequestError, ValueError) as e:
         print(f"  ERROR fetching page {page}: {e}", file=sys.stderr)
+        return None, None, None
+
+
+def _settle(page, fetched, cached, cache, stats):
+    """Cache one fetched page and classify it. Returns its body or None."""
+    body, etag, last_modified = fetched
+    if body is NOT_MODIFIED:
+        stats["not_modified"] += 1
+        return cached["body"]
+    if body is None:
+        stats["failed"] += 1
+        if cached:
+            print(f"  WARNING: page {page} failed, using the cached copy", file=sys.stderr)
+            return cached["body"]
+        print(f"  WARNING: Failed to fetch page {page}, skipping", file=sys.stderr)
         return None
-
-
-def fetch_all_persons():
-    """Paginate through all persons. Returns list of person dicts."""
-    persons = []
+    entry = cache.put(page, body, etag, last_modified)
+    if cached is None:
+        stats["new"].append(page)
+    elif cached["sha256"] == entry["sha256"]:
+        stats["unchanged"] += 1
+    else:
+        stats["changed"].append(page)
+    return body
+
+
+def fetch_all_persons(since=False, cache=None, concurrency=CONCURRENCY):
+    """Fetch every page of persons. Returns list of person dicts.
+
+    Page 1 comes first for the total; the rest are fetched concurrently
+    under the API's rate limit and reassembled in page order whatever
+    order they complete in. A cached page is requested conditionally
+    (its ETag, else its Last-Modified) and a 304, which costs no body, is
+    served from the cache. The API only lets a page be skipped that way:
+    a page cached without a validator is downloaded in full and its
+    content hash compared afterwards. With since=True the pages that
+    changed are listed.
+    """
+    cache = cache or PageCache()
+    stats = {"not_modified": 0, "unchanged": 0, "changed": [], "new": [], "failed": 0}
+    start = time.perf_counter()
 
     print("Fetching page 1...", file=sys.stderr)
-    first = fetch_page(1)
+    cached = cache.get(1)
+    first = _settle(1, fetch_page(1, cached), cached, cache, stats)
     if first is None:
         print("ERROR: Could not reach Epstein Exposed API. Is it down?",
               file=sys.stderr)
@@ -59,54 +183,64 @@ def fetch_all_persons():
               file=sys.stderr)
         sys.exit(1)
 
-    persons.extend(first.get("data", []))
     meta = first.get("meta", {})
     total = meta.get("total", 0)
     total_pages = (total + PER_PAGE - 1) // PER_PAGE
+    cache.prune(max(1, total_pages))
+
+    print(f"  {total} persons across {total_pages} pages "
+          f"({concurrency} in flight, {RATE_PER_MINUTE} req/min)", file=sys.stderr)
+
+    pages = {1: first}
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = {}
+        for page in range(2, total_pages + 1):
+            cached = cache.get(page)
+            futures[pool.submit(fetch_page, page, cached)] = (page, cached)
+        for done, future in enumerate(as_completed(futures), 2):
+            page, cached = futures[future]
+            body = _settle(page, future.result(), cached, cache, stats)
+            if body is not None:
+                pages[page] = body
+            print(f"  [{done}/{total_pages}] page {page}", file=sys.stderr)
 
-    print(f"  {total} persons across {total_pages} pages", file=sys.stderr)
-
-    for page in range(2, total_pages + 1):
-        time.sleep(RATE_DELAY)
-        print(f"Fetching page {page}/{total_pages}...", file=sys.stderr)
-        result = fetch_page(page)
-        if result is None:
-            print(f"  WARNING: Failed to fetch page {page}, skipping",
-                  file=sys.stderr)
-            continue
-        persons.extend(result.get("data", []))
-
-    print(f"  Fetched {len(persons)} persons total\n", file=sys.stderr)
+    persons = []
+    for page in sorted(pages):
+        persons.extend(pages[page].get("data", []))
+
+    elapsed = time.perf_counter() - start
+    print(f"  Fetched {len(persons)} persons total in {elapsed:.1f}s", file=sys.stderr)
+    print(f"  Pages: {stats['not_modified']} not modified (served from cache), "
+          f"{len(stats['changed'])} changed, {len(stats['new'])} new, "
+          f"{stats['unchanged']} refetched unchanged, {stats['failed']} failed",
+          file=sys.stderr)
+    if since:
+        for label in ("changed", "new"):
+            if stats[label]:
+                pages_list = ", ".join(str(p) for p in sorted(stats[label]))
+                print(f"  {label.capitalize()} pages: {pages_list}", file=sys.stderr)
+    print(file=sys.stderr)
     return persons
 
 
 def load_entities():
-    """Load entity list from CUE export."""
+    """Load entity names and aliases from the prebuilt name index.
+
+    Returns ({id: name}, {id: [alias, ...]}).
+    """
     try:
-        proc = subprocess.run(
-            ["cue", "export", "-e", "graph.nodes", "./..."],
-            capture_output=True, text=True, timeout=30,
-            cwd=str(pathlib.Path(__file__).resolve().parent.parent),
-        )
-        if proc.returncode != 0:
-            print(f"ERROR: cue export failed:\n{proc.stderr}", file=sys.stderr)
-            sys.exit(1)
-        nodes = json.loads(proc.stdout)
-    except FileNotFoundError:
-        print("ERROR: 'cue' not found. Is CUE installed?", file=sys.stderr)
-        sys.exit(1)
-    except subprocess.TimeoutExpired:
-        print("ERROR: cue export timed out", file=sys.stderr)
+        index = NameIndex.load()
+    except GraphUnavailable as e:
+        print(f"ERROR: {e}", file=sys.stderr)
         sys.exit(1)
+    return index.entities(), index.alias_map()
 
-    entities = {}
-    for node in nodes:
-        entities[node["id"]] = node["name"]
-    return entities
 
+def match_entities(entities, persons, aliases=None):
+    """Match entities to API persons. Returns dict of entity_id -> person.
 
-def match_entities(entities, persons):
-    """Match entities to API persons. Returns dict of entity_id -> person."""
+    aliases ({id: [alias, ...]}) are tried after the name in the exact pass.
+    """
     # Build lookup: lowercase name -> list of persons
     name_index = {}
     for p in persons:
@@ -117,35 +251,30 @@ def match_entities(entities, persons):
     matches = {}
     unmatched_ids = set(entities.keys())
 
-    # Pass 1: exact (case-insensitive)
+    # Pass 1: exact (case-insensitive), on the name then each alias
+    aliases = aliases or {}
     for eid, ename in entities.items():
-        normalized = ename.strip().lower()
-        if normalized in name_index:
+        for method, candidate in [("exact", ename)] + [("alias", a) for a in aliases.get(eid, [])]:
+            normalized = candidate.strip().lower()
+            if normalized in name_index:
+                matches[eid] = {
+                    "person": name_index[normalized][0],
+                    "method": method,
+                    "score": 1.0,
+                }
+                unmatched_ids.discard(eid)
+                break
+
+    # Pass 2: fuzzy on remaining, all resolved in one batch
+    names = list(name_index)
+    resolver = resolve.Resolver(names, source="epstein_exposed")
+    pending = sorted(unmatched_ids)
+    for eid, (idx, score) in zip(pending, resolver.best(entities[eid] for eid in pending)):
+        if idx is not None:
             matches[eid] = {
-                "person": name_index[normalized][0],
-                "method": "exact",
-                "score": 1.0,
-            }
-            unmatched_ids.discard(eid)
-
-    # Pass 2: fuzzy on remaining
-    person_names = list(name_index.keys())
-    for eid in list(unmatched_ids):
-        ename = entities[eid].strip().lower()
-        best_match = None
-        best_score = 0.0
-
-        for pname in person_names:
-            score = difflib.SequenceMatcher(None, ename, pname).ratio()
-            if score > best_score:
-                best_score = score
-                best_match = pname
-
-        if best_match and best_score >= FUZZY_THRESHOLD:
-            matches[eid] = {
-                "person": name_index[best_match][0],
+                "person": name_index[names[idx]][0],
                 "method": "fuzzy",
-                "score": best_score,
+                "score": score,
             }
             unmatched_ids.discard(eid)
 
@@ -154,6 +283,7 @@ def match_entities(entities, persons):
 
 def emit_cue(matches):
     """Print CUE overlay to stdout."""
+    print("@if(!compact_ids)\n")
     print("package creeps\n")
     print("entities: {")
     for eid in sorted(matches.keys()):
@@ -164,6 +294,8 @@ def emit_cue(matches):
         score_note = ""
         if method == "fuzzy":
             score_note = f"  // fuzzy {m['score']:.2f}: \"{person['name']}\""
+        elif method == "alias":
+            score_note = f"  // alias: \"{person['name']}\""
         print(f'\t{eid}: external_ids: epstein_exposed: "{slug}"{score_note}')
     print("}")
 
@@ -175,9 +307,12 @@ def print_summary(matches, unmatched_ids, entities, persons):
     print(f"Unmatched: {len(unmatched_ids)}/{len(entities)}", file=sys.stderr)
 
     exact = sum(1 for m in matches.values() if m["method"] == "exact")
+    alias = sum(1 for m in matches.values() if m["method"] == "alias")
     fuzzy = sum(1 for m in matches.values() if m["method"] == "fuzzy")
     print(f"  Exact:  {exact}", file=sys.stderr)
+    print(f"  Alias:  {alias}", file=sys.stderr)
     print(f"  Fuzzy:  {fuzzy}", file=sys.stderr)
+    print(f"  {resolve.summary()}", file=sys.stderr)
 
     if unmatched_ids:
         print(f"\nUnmatched entities:", file=sys.stderr)
@@ -205,15 +340,25 @@ def print_summary(matches, unmatched_ids, entities, persons):
               file=sys.stderr)
 
 
+def _arg(flag, default, cast):
+    if flag in sys.argv:
+        idx = sys.argv.index(flag)
+        if idx + 1 < len(sys.argv):
+            return cast(sys.argv[idx + 1])
+    return default
+
+
 def main():
     dry_run = "--dry-run" in sys.argv
+    since = "--since" in sys.argv
+    concurrency = max(1, _arg("--concurrency", CONCURRENCY, int))
 
-    print("Loading entities from CUE...", file=sys.stderr)
-    entities = load_entities()
+    print("Loading entities...", file=sys.stderr)
+    entities, aliases = load_entities()
     print(f"  {len(entities)} entities loaded\n", file=sys.stderr)
 
-    persons = fetch_all_persons()
-    matches, unmatched_ids = match_entities(entities, persons)
+    persons = fetch_all_persons(since=since, concurrency=concurrency)
+    matches, unmatched_ids = match_entities(entities, persons, aliases)
 
     print_summary(matches, unmatched_ids, entities, persons)
 
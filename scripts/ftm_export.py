@@ -6,18 +6,55 @@ and produces a JSONL file compatible with OCCRP Aleph.
 
 Usage:
     python3 scripts/ftm_export.py [--outfile site/data/entities.ftm.jsonl]
+    python3 scripts/ftm_export.py --shards 100000 [--outdir site/data/entities.ftm]
+    python3 scripts/ftm_export.py --delta [--outfile site/data/entities.ftm.delta.jsonl]
+
+Records are converted one at a time and written straight to the output,
+so memory does not grow with the number of connections and documents.
+Every record of one run carries the same first_seen/last_change stamp.
+
+--shards N writes gzip-compressed JSONL parts of at most N records each
+(part-00000.ftm.jsonl.gz, ...) plus manifest.json listing every part with
+its record count and size. Parts from an earlier run are removed first.
+
+site/data/entities.ftm.index.json (--index) holds a content hash (the
+record without its timestamps) and the first_seen/last_change of every
+FtM ID as of the last import into Aleph. Every run reads it: unchanged
+records get their previous timestamps and changed ones their original
+first_seen, so Aleph sees last_change move only for records that
+actually changed. --delta writes only records new or changed since the
+index, and the IDs in the index but no longer exported to
+entities.ftm.deleted.txt (--deleted, one per line).
+
+The index belongs to the import pipeline: only --delta runs (or a run
+with --update-index, e.g. after a full import) write it. The plain full
+export build.sh runs on every build leaves it alone, so the next delta
+still contains everything changed since the last import. Import each
+delta before producing the next.
 
 Import to Aleph:
     alephclient write-entities --infile entities.ftm.jsonl \
         --foreign-id epstein-network-unify
+
+    # sharded: one importer per part
+    ls site/data/entities.ftm/part-*.ftm.jsonl.gz | xargs -P 4 -I{} sh -c \
+        'gunzip -c {} | alephclient write-entities --foreign-id epstein-network-unify'
+
+    # delta: changed records, then remove the deleted IDs from the collection
+    alephclient write-entities --infile entities.ftm.delta.jsonl \
+        --foreign-id epstein-network-unify
 """
 from __future__ import annotations
 
+import gzip
+import hashlib
 import json
+import os
 import sys
 from datetime import datetime, timezone
+from itertools import chain
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
 
 SCRIPT_DIR = Path(__file__).resolve().parent
 PROJECT_ROOT = SCRIPT_DIR.parent
@@ -48,14 +85,22 @@ REL_SCHEMA_MAP = {
 }
 # Everything else → UnknownLink
 
+# ── Sharded output ──────────────────────────────────────────────
+PART_PATTERN = "part-{:05d}.ftm.jsonl.gz"
+MANIFEST_NAME = "manifest.json"
+
+# ── Export index (content hash + timestamps per FtM ID) ─────────
+INDEX_FORMAT = 1
+TIMESTAMP_FIELDS = ("first_seen", "last_change")
+
 
 def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
-def _ftm_base(entity_id: str, schema: str) -> Dict[str, Any]:
+def _ftm_base(entity_id: str, schema: str, now: str | None = None) -> Dict[str, Any]:
     """Create the base FtM entity structure."""
-    now = _now_iso()
+    now = now or _now_iso()
     return {
         "id": entity_id,
         "schema": schema,
@@ -74,10 +119,10 @@ def determine_schema(type_map: Dict[str, bool]) -> str:
     return "LegalEntity"
 
 
-def convert_entity(eid: str, entity: Dict[str, Any]) -> Dict[str, Any]:
+def convert_entity(eid: str, entity: Dict[str, Any], now: str | None = None) -> Dict[str, Any]:
     """Convert a CUE entity to an FtM entity."""
     schema = determine_schema(entity.get("@type", {}))
-    ftm = _ftm_base(eid, schema)
+    ftm = _ftm_base(eid, schema, now)
     props = ftm["properties"]
 
     # Name
@@ -149,6 +194,7 @@ def convert_entity(eid: str, entity: Dict[str, Any]) -> Dict[str, Any]:
 def convert_connection(
     source_id: str, target_id: str,
     detail: Dict[str, Any] | None,
+    now: str | None = None,
 ) -> Dict[str, Any]:
     """Convert a CUE connection to an FtM relationship entity."""
     rel_type = (detail or {}).get("rel_type", "associate")
@@ -156,7 +202,7 @@ def convert_connection(
 
     schema = REL_SCHEMA_MAP.get(rel_type, "UnknownLink")
     conn_id = f"conn-{source_id}-{target_id}"
-    ftm = _ftm_base(conn_id, schema)
+    ftm = _ftm_base(conn_id, schema, now)
     props = ftm["properties"]
 
     if schema == "UnknownLink":
@@ -190,9 +236,9 @@ def convert_connection(
     return ftm
 
 
-def convert_flow(flow_id: str, flow: Dict[str, Any]) -> Dict[str, Any]:
+def convert_flow(flow_id: str, flow: Dict[str, Any], now: str | None = None) -> Dict[str, Any]:
     """Convert a CUE financial flow to an FtM Payment entity."""
-    ftm = _ftm_base(f"flow-{flow_id}", "Payment")
+    ftm = _ftm_base(f"flow-{flow_id}", "Payment", now)
     props = ftm["properties"]
 
     props["payer"] = [flow["source"]]
@@ -221,9 +267,9 @@ def convert_flow(flow_id: str, flow: Dict[str, Any]) -> Dict[str, Any]:
     return ftm
 
 
-def convert_document(doc_id: str, doc: Dict[str, Any]) -> Dict[str, Any]:
+def convert_document(doc_id: str, doc: Dict[str, Any], now: str | None = None) -> Dict[str, Any]:
     """Convert a CUE document to an FtM Document entity."""
-    ftm = _ftm_base(doc_id, "Document")
+    ftm = _ftm_base(doc_id, "Document", now)
     props = ftm["properties"]
 
     props["title"] = [doc["description"]]
@@ -249,12 +295,238 @@ def convert_document(doc_id: str, doc: Dict[str, Any]) -> Dict[str, Any]:
     return ftm
 
 
+# ── Export index ────────────────────────────────────────────────
+
+def content_hash(record: Dict[str, Any]) -> str:
+    """Hash of an FtM record's content, ignoring its timestamps."""
+    body = {k: v for k, v in record.items() if k not in TIMESTAMP_FIELDS}
+    raw = json.dumps(body, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(raw.encode()).hexdigest()[:16]
+
+
+class ExportIndex:
+    """Content hash, first_seen and last_change of every record of the
+    last export, keyed by FtM ID."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.previous: Dict[str, List[str]] = {}
+        if self.path.exists():
+            try:
+                data = json.loads(self.path.read_text())
+                if data.get("format") == INDEX_FORMAT:
+                    self.previous = data["records"]
+            except (json.JSONDecodeError, KeyError):
+                pass
+        self.current: Dict[str, List[str]] = {}
+        self.counts = {"new": 0, "changed": 0, "unchanged": 0}
+
+    def stamp(self, records: Iterable[Dict[str, Any]],
+              changed_only: bool = False) -> Iterator[Dict[str, Any]]:
+        """Carry timestamps over from the last export and record each
+        record in the new index.
+
+        Unchanged records keep first_seen and last_change, changed ones
+        keep first_seen. With changed_only, unchanged records are indexed
+        but not yielded.
+        """
+        for record in records:
+            first_seen, last_change, status = self._carry(
+                record["id"], content_hash(record), record["first_seen"], record["last_change"])
+            record["first_seen"], record["last_change"] = first_seen, last_change
+            if status != "unchanged" or not changed_only:
+                yield record
+
+    def _carry(self, record_id: str, digest: str, first_seen: str, last_change: str
+               ) -> Tuple[str, str, str]:
+        """(first_seen, last_change, status) for one record; records it."""
+        prev = self.previous.get(record_id)
+        if prev is None:
+            status = "new"
+        else:
+            first_seen = prev[1]
+            if prev[0] == digest:
+                last_change = prev[2]
+                status = "unchanged"
+            else:
+                status = "changed"
+        self.counts[status] += 1
+        self.current[record_id] = [digest, first_seen, last_change]
+        return first_seen, last_change, status
+
+    def deleted(self) -> List[str]:
+        """IDs in the last export that this one did not produce."""
+        return sorted(set(self.previous) - set(self.current))
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(json.dumps({"format": INDEX_FORMAT, "generated": _now_iso(),
+                                   "records": self.current}, separators=(",", ":")))
+        os.replace(tmp, self.path)
+
+
+# ── Record streams ──────────────────────────────────────────────
+
+def entity_records(entities: Dict[str, Any], now: str) -> Iterator[Dict[str, Any]]:
+    """Step 1: one FtM entity per CUE entity."""
+    for eid, entity in entities.items():
+        yield convert_entity(eid, entity, now)
+
+
+def connection_records(entities: Dict[str, Any], now: str) -> Iterator[Dict[str, Any]]:
+    """Step 2: one FtM relationship per connected pair (A→B / B→A deduplicated).
+
+    A pair is emitted from whichever side comes first in `entities`, as
+    the old seen-set did, but without remembering every pair.
+    """
+    order = {eid: i for i, eid in enumerate(entities)}
+    for eid, entity in entities.items():
+        yield from _entity_connections(eid, entity, entities, order, now)
+
+
+def _entity_connections(eid: str, entity: Dict[str, Any], entities: Dict[str, Any],
+                        order: Dict[str, int], now: str) -> Iterator[Dict[str, Any]]:
+    """The connection records emitted from one entity's side."""
+    details = entity.get("connection_details", {})
+    for target_id in entity.get("connections", {}):
+        other = entities.get(target_id, {})
+        if (target_id in order and order[target_id] < order[eid]
+                and eid in other.get("connections", {})):
+            continue  # already emitted from the target's side
+        # Use connection_details if available from either side
+        detail = details.get(target_id)
+        if not detail:
+            # Check reverse side
+            detail = other.get("connection_details", {}).get(eid)
+        yield convert_connection(eid, target_id, detail, now)
+
+
+def flow_records(flows: Dict[str, Any], now: str) -> Iterator[Dict[str, Any]]:
+    """Step 3: one FtM Payment per financial flow."""
+    for fid, flow in flows.items():
+        yield convert_flow(fid, flow, now)
+
+
+def document_records(documents: Dict[str, Any], now: str) -> Iterator[Dict[str, Any]]:
+    """Step 4: one FtM Document per document."""
+    for did, doc in documents.items():
+        yield convert_document(did, doc, now)
+
+
+def iter_records(entities: Dict[str, Any], flows: Dict[str, Any],
+                 documents: Dict[str, Any], now: str | None = None
+                 ) -> Iterator[Dict[str, Any]]:
+    """Every FtM record of the export, in output order."""
+    now = now or _now_iso()
+    return chain(entity_records(entities, now), connection_records(entities, now),
+                 flow_records(flows, now), document_records(documents, now))
+
+
+def _line(record: Dict[str, Any]) -> str:
+    return json.dumps(record, separators=(",", ":")) + "\n"
+
+
+def lines(records: Iterable[Dict[str, Any]]) -> Iterator[Tuple[str, str]]:
+    """(schema, JSONL line) per record, as the writers take them."""
+    for record in records:
+        yield record["schema"], _line(record)
+
+
+def write_jsonl(rows: Iterable[Tuple[str, str]], outpath: Path) -> Dict[str, int]:
+    """Write (schema, line) rows to one JSONL file as they come.
+    Returns {schema: count}."""
+    schemas: Dict[str, int] = {}
+    tmp = outpath.with_name(outpath.name + ".tmp")
+    with tmp.open("w") as f:
+        for schema, line in rows:
+            f.write(line)
+            schemas[schema] = schemas.get(schema, 0) + 1
+    os.replace(tmp, outpath)
+    return schemas
+
+
+def write_shards(rows: Iterable[Tuple[str, str]], outdir: Path,
+                 shard_size: int) -> Dict[str, Any]:
+    """Write (schema, line) rows as gzip JSONL parts of at most shard_size records.
+
+    Parts are compressed as they are written (mtime 0, so identical data
+    gives identical parts). Stale parts are removed first and the
+    manifest is written last, so a manifest always describes a complete
+    set. Returns the manifest.
+    """
+    outdir.mkdir(parents=True, exist_ok=True)
+    for stale in outdir.glob("part-*.ftm.jsonl.gz"):
+        stale.unlink()
+    manifest_path = outdir / MANIFEST_NAME
+    if manifest_path.exists():
+        manifest_path.unlink()
+
+    parts: List[Dict[str, Any]] = []
+    schemas: Dict[str, int] = {}
+    out = None
+    count = 0
+
+    def close_part():
+        out.close()
+        path = outdir / parts[-1]["file"]
+        parts[-1].update(records=count, bytes=path.stat().st_size)
+
+    for schema, line in rows:
+        if out is None or count >= shard_size:
+            if out is not None:
+                close_part()
+            parts.append({"file": PART_PATTERN.format(len(parts))})
+            out = gzip.GzipFile(outdir / parts[-1]["file"], "wb", mtime=0)
+            count = 0
+        out.write(line.encode())
+        count += 1
+        schemas[schema] = schemas.get(schema, 0) + 1
+    if out is not None:
+        close_part()
+
+    manifest = {
+        "dataset": DATASET_ID,
+        "generated": _now_iso(),
+        "format": "ftm+jsonl+gzip",
+        "shard_size": shard_size,
+        "records": sum(p["records"] for p in parts),
+        "schemas": dict(sorted(schemas.items())),
+        "parts": parts,
+    }
+    tmp = manifest_path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(manifest, indent=2) + "\n")
+    os.replace(tmp, manifest_path)
+    return manifest
+
+
 def main():
     import argparse
     parser = argparse.ArgumentParser(description="Export CUE graph to FtM JSONL")
-    parser.add_argument("--outfile", default=str(SITE_DATA / "entities.ftm.jsonl"),
-                        help="Output JSONL file path")
+    parser.add_argument("--outfile",
+                        help="Output JSONL file path (default site/data/entities.ftm.jsonl, "
+                             "or entities.ftm.delta.jsonl with --delta)")
+    parser.add_argument("--shards", type=int, metavar="N",
+                        help="Write gzip JSONL parts of at most N records plus a manifest")
+    parser.add_argument("--outdir", default=str(SITE_DATA / "entities.ftm"),
+                        help="Directory for --shards parts and manifest.json")
+    parser.add_argument("--delta", action="store_true",
+                        help="Write only records new or changed since the last export")
+    parser.add_argument("--index", default=str(SITE_DATA / "entities.ftm.index.json"),
+                        help="Content-hash index of the last import (read by every run, "
+                             "written by --delta and --update-index runs)")
+    parser.add_argument("--update-index", action="store_true",
+                        help="Record this export in the index (implied by --delta)")
+    parser.add_argument("--deleted", default=str(SITE_DATA / "entities.ftm.deleted.txt"),
+                        help="With --delta: where to list IDs no longer exported")
     args = parser.parse_args()
+    if args.shards is not None and args.shards < 1:
+        parser.error("--shards must be at least 1")
+    if args.shards and args.delta:
+        parser.error("--delta writes a single file; it can't be combined with --shards")
+    if args.outfile is None:
+        args.outfile = str(SITE_DATA / ("entities.ftm.delta.jsonl" if args.delta
+                                        else "entities.ftm.jsonl"))
 
     # Load CUE-exported JSON
     entities_path = SITE_DATA / "entities.json"
@@ -270,52 +542,52 @@ def main():
     flows = json.loads(flows_path.read_text())
     documents = json.loads(documents_path.read_text())
 
-    output: List[Dict[str, Any]] = []
-    conn_seen: set = set()
-
-    # Step 1: Convert entities
-    for eid, entity in entities.items():
-        output.append(convert_entity(eid, entity))
-
-    # Step 2: Convert connections (deduplicate A→B / B→A)
-    for eid, entity in entities.items():
-        details = entity.get("connection_details", {})
-        for target_id in entity.get("connections", {}):
-            pair = tuple(sorted([eid, target_id]))
-            if pair in conn_seen:
-                continue
-            conn_seen.add(pair)
-            # Use connection_details if available from either side
-            detail = details.get(target_id)
-            if not detail:
-                # Check reverse side
-                other = entities.get(target_id, {})
-                detail = other.get("connection_details", {}).get(eid)
-            output.append(convert_connection(eid, target_id, detail))
-
-    # Step 3: Convert flows
-    for fid, flow in flows.items():
-        output.append(convert_flow(fid, flow))
-
-    # Step 4: Convert documents
-    for did, doc in documents.items():
-        output.append(convert_document(did, doc))
+    index = ExportIndex(Path(args.index))
+    if args.delta and not index.previous:
+        print(f"No previous export index at {index.path}; the delta is the full export",
+              file=sys.stderr)
+    now = _now_iso()
+    rows = lines(index.stamp(iter_records(entities, flows, documents, now),
+                             changed_only=args.delta))
+    _write(args, rows, index)
+
+
+def _write(args, rows: Iterable[Tuple[str, str]], index: ExportIndex) -> None:
+    if args.shards:
+        outdir = Path(args.outdir)
+        manifest = write_shards(rows, outdir, args.shards)
+        if args.update_index:
+            index.save()
+        size = sum(p["bytes"] for p in manifest["parts"])
+        print(f"FtM export: {manifest['records']} entities → {outdir} "
+              f"({len(manifest['parts'])} parts of ≤{args.shards})", file=sys.stderr)
+        print(f"  Schemas: {manifest['schemas']}", file=sys.stderr)
+        print(f"  Size: {size:,} bytes compressed", file=sys.stderr)
+        print(f"  Manifest: {outdir / MANIFEST_NAME}", file=sys.stderr)
+        counts = index.counts
+        print(f"  Since the index: {counts['new']} new, {counts['changed']} changed, "
+              f"{counts['unchanged']} unchanged, {len(index.deleted())} deleted", file=sys.stderr)
+        return
 
     # Write JSONL
     outpath = Path(args.outfile)
-    with outpath.open("w") as f:
-        for entity in output:
-            f.write(json.dumps(entity, separators=(",", ":")) + "\n")
+    schemas = write_jsonl(rows, outpath)
+    deleted = index.deleted()
+    if args.delta:
+        deleted_path = Path(args.deleted)
+        deleted_path.write_text("".join(f"{eid}\n" for eid in deleted))
+    if args.delta or args.update_index:
+        index.save()
 
     # Summary
-    schemas = {}
-    for e in output:
-        s = e["schema"]
-        schemas[s] = schemas.get(s, 0) + 1
-
-    print(f"FtM export: {len(output)} entities → {outpath}", file=sys.stderr)
+    print(f"FtM export: {sum(schemas.values())} entities → {outpath}", file=sys.stderr)
     print(f"  Schemas: {dict(sorted(schemas.items()))}", file=sys.stderr)
     print(f"  Size: {outpath.stat().st_size:,} bytes", file=sys.stderr)
+    counts = index.counts
+    print(f"  Since the index: {counts['new']} new, {counts['changed']} changed, "
+          f"{counts['unchanged']} unchanged, {len(deleted)} deleted", file=sys.stderr)
+    if args.delta:
+        print(f"  Deleted IDs: {deleted_path}", file=sys.stderr)
 
 
 if __name__ == "__main__":
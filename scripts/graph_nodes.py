@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Local graph nodes for the reconcilers, evaluating CUE at most once.
+
+The reconcilers only need graph.nodes (id, name, types, ...), but each
+used to run `cue export -e graph.nodes ./...`, which evaluates the whole
+module. load_nodes() takes the cheapest source that is current:
+
+  1. site/data/graph.json, when it is newer than every *.cue input
+     (build.sh exports it)
+  2. .cache/graph_nodes.json, the result of an earlier cue export, when
+     the *.cue inputs still hash to what they were then
+  3. `cue export -e graph.nodes ./...`, whose result is written to (2)
+
+so running several reconcilers back to back costs one evaluation at
+most. source_digest() identifies the current node data without loading
+it, for artifacts derived from the nodes (name_index.py).
+
+Usage:
+  from graph_nodes import GraphUnavailable, load_nodes
+
+  python3 scripts/graph_nodes.py        # show which source is current
+"""
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+GRAPH_FILE = REPO_ROOT / "site" / "data" / "graph.json"
+CACHE_FILE = REPO_ROOT / ".cache" / "graph_nodes.json"
+CUE_TIMEOUT = 120
+
+
+class GraphUnavailable(Exception):
+    """No current graph.json, no cached export, and cue export failed."""
+
+
+def cue_inputs():
+    """Every *.cue file the module is evaluated from."""
+    found = []
+    for root, dirs, files in os.walk(REPO_ROOT):
+        dirs[:] = [d for d in dirs if not d.startswith(".") and d != "node_modules"]
+        found.extend(Path(root) / f for f in files if f.endswith(".cue"))
+    return sorted(found)
+
+
+def inputs_digest():
+    """SHA-256 over the paths and contents of all *.cue inputs."""
+    h = hashlib.sha256()
+    for path in cue_inputs():
+        h.update(str(path.relative_to(REPO_ROOT)).encode() + b"\0")
+        h.update(path.read_bytes() + b"\0")
+    return h.hexdigest()
+
+
+def graph_json_current():
+    """True if site/data/graph.json is newer than every *.cue input."""
+    try:
+        built = GRAPH_FILE.stat().st_mtime_ns
+    except FileNotFoundError:
+        return False
+    return all(p.stat().st_mtime_ns < built for p in cue_inputs())
+
+
+def source_digest():
+    """An id for the node data load_nodes() would return right now."""
+    if graph_json_current():
+        return "graph.json:" + hashlib.sha256(GRAPH_FILE.read_bytes()).hexdigest()
+    return "cue:" + inputs_digest()
+
+
+def _cue_export():
+    try:
+        proc = subprocess.run(
+            ["cue", "export", "-e", "graph.nodes", "./..."],
+            capture_output=True, text=True, timeout=CUE_TIMEOUT, cwd=str(REPO_ROOT),
+        )
+    except FileNotFoundError:
+        raise GraphUnavailable("'cue' command not found. Install CUE or run ./build.sh.")
+    except subprocess.TimeoutExpired:
+        raise GraphUnavailable(f"cue export timed out after {CUE_TIMEOUT}s.")
+    if proc.returncode != 0:
+        raise GraphUnavailable(f"cue export failed:\n{proc.stderr.strip()}")
+    try:
+        return json.loads(proc.stdout)
+    except json.JSONDecodeError as e:
+        raise GraphUnavailable(f"failed to parse cue export output: {e}")
+
+
+def load_nodes():
+    """graph.nodes as a list of dicts, from the cheapest current source."""
+    if graph_json_current():
+        return json.loads(GRAPH_FILE.read_text())["nodes"]
+
+    digest = inputs_digest()
+    try:
+        cached = json.loads(CACHE_FILE.read_text())
+        if cached.get("inputs") == digest:
+            return cached["nodes"]
+    except (FileNotFoundError, json.JSONDecodeError):
+        pass
+
+    nodes = _cue_export()
+    CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp = CACHE_FILE.with_suffix(".tmp")
+    tmp.write_text(json.dumps({"inputs": digest, "nodes": nodes}))
+    os.replace(tmp, CACHE_FILE)
+    return nodes
+
+
+def main():
+    if graph_json_current():
+        print(f"Current source: {GRAPH_FILE}")
+    elif CACHE_FILE.exists() and json.loads(CACHE_FILE.read_text()).get("inputs") == inputs_digest():
+        print(f"Current source: {CACHE_FILE} (cached cue export)")
+    else:
+        print("Current source: cue export (graph.json and cache are stale)")
+    start = time.perf_counter()
+    try:
+        nodes = load_nodes()
+    except GraphUnavailable as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"{len(nodes)} nodes in {(time.perf_counter() - start) * 1000:.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,550 @@
+"""Shared HTTP client for the enrichment, reconciliation and sweep scripts.
+
+Every script used to carry its own `urllib.request.urlopen` helper, which
+opened a fresh TCP+TLS connection per request and handled timeouts and
+errors differently. This module replaces them with one client that keeps:
+
+  - persistent keep-alive connections, pooled per (scheme, host, port)
+  - per-host rate limiting (token bucket; replaces the sleeps between calls)
+  - retry with jittered exponential backoff on 429/5xx and dropped
+    connections, honoring Retry-After
+  - transparent gzip/deflate response decoding, also for streamed bodies
+    (request(..., stream=True) returns a StreamingResponse that is read
+    and decompressed chunk by chunk)
+  - an optional persistent response cache (scripts/response_cache.py);
+    cache hits skip the network and the rate limiter entirely
+
+Usage:
+  from http_client import HttpClient, RequestError
+
+  client = HttpClient(user_agent=UA, rate_limits={API_BASE: 1 / 1.5})
+  data = client.get_json("https://littlesis.org/api/entities/search", {"q": name})
+
+Environment:
+  UNIFY_MOCK_URL=http://127.0.0.1:8900   send every request to a local mock
+      server (scripts/mock_api.py) instead of the real host. The original
+      host goes along in X-Upstream-Host; rate limits still apply per
+      original host, and the response cache is bypassed.
+
+Errors surface as RequestError subclasses: HTTPError (non-2xx status after
+retries, with .code and .reason like urllib's), TransportError
+(connection/timeout failures after retries) and OfflineError (offline
+mode and no cached response). Stdlib only.
+"""
+import codecs
+import gzip
+import http.client
+import json
+import os
+import random
+import ssl
+import sys
+import threading
+import time
+import urllib.parse
+import zlib
+from email.utils import parsedate_to_datetime
+
+from response_cache import CacheMiss
+
+DEFAULT_UA = "unify-graph/1.0 (https://github.com/unify-graph/unify-graph)"
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+MAX_REDIRECTS = 5
+STREAM_CHUNK = 64 * 1024
+
+# Errors that mean a pooled keep-alive connection went stale between uses.
+# The request is resent once on a fresh connection without counting a retry.
+_STALE_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    BrokenPipeError,
+    ConnectionResetError,
+)
+_TRANSPORT_ERRORS = (OSError, http.client.HTTPException)
+
+
+class RequestError(Exception):
+    """Base class for all client errors."""
+
+
+class HTTPError(RequestError):
+    """Non-2xx response (after retries, for retryable statuses)."""
+
+    def __init__(self, code, reason, url, headers=None, body=b""):
+        super().__init__(f"HTTP {code}: {reason}")
+        self.code = code
+        self.reason = reason
+        self.url = url
+        self.headers = headers or {}
+        self.body = body
+
+
+class TransportError(RequestError):
+    """Connection failure or timeout (after retries)."""
+
+
+class OfflineError(RequestError):
+    """Offline mode and the response cache has no entry for the request."""
+
+
+class Response:
+    """A fully read, decoded response."""
+
+    def __init__(self, status, reason, headers, body, url):
+        self.status = status
+        self.reason = reason
+        self.headers = headers  # lowercase header name -> value
+        self.body = body
+        self.url = url
+
+    def text(self, encoding="utf-8", errors="replace"):
+        return self.body.decode(encoding, errors=errors)
+
+    def json(self):
+        return json.loads(self.body)
+
+
+class StreamingResponse:
+    """A response whose body is still on the wire.
+
+    iter_bytes() reads it in chunks, undoing any Content-Encoding as it
+    goes; iter_lines() decodes those chunks incrementally into text
+    lines (split on "\n" only and kept, so csv.reader sees quoted
+    newlines intact). A connection dropped mid-body raises TransportError
+    and is not retried. The connection goes back to the pool once the
+    body has been read to the end; close() before that drops it. Use as
+    a context manager.
+    """
+
+    def __init__(self, status, reason, headers, raw, url, release):
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.url = url
+        self._raw = raw
+        self._release = release
+
+    def iter_bytes(self, chunk_size=STREAM_CHUNK):
+        decoder = _decompressor(self.headers.get("content-encoding"))
+        try:
+            while True:
+                try:
+                    chunk = self._raw.read(chunk_size)
+                except _TRANSPORT_ERRORS as e:
+                    raise TransportError(f"reading {self.url}: {e}") from e
+                if not chunk:
+                    break
+                if decoder:
+                    chunk = decoder.decompress(chunk)
+                if chunk:
+                    yield chunk
+            if decoder:
+                tail = decoder.flush()
+                if tail:
+                    yield tail
+        except BaseException:
+            self.close()
+            raise
+        self._finish(complete=True)
+
+    def iter_lines(self, encoding="utf-8", errors="replace", chunk_size=STREAM_CHUNK):
+        decoder = codecs.getincrementaldecoder(encoding)(errors=errors)
+        pending = ""
+        for chunk in self.iter_bytes(chunk_size):
+            text = pending + decoder.decode(chunk)
+            cut = text.rfind("\n") + 1
+            pending = text[cut:]
+            for line in text[:cut].split("\n")[:-1]:
+                yield line + "\n"
+        pending += decoder.decode(b"", final=True)
+        if pending:
+            yield pending
+
+    def read(self):
+        """Read the rest of the body into a Response."""
+        return Response(self.status, self.reason, self.headers,
+                        b"".join(self.iter_bytes()), self.url)
+
+    def close(self):
+        self._finish(complete=False)
+
+    def _finish(self, complete):
+        release, self._release = self._release, None
+        if release:
+            release(complete)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, up to `burst`."""
+
+    def __init__(self, rate, burst=1):
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self):
+        """Take a token if one is available. Returns 0 on success, else the
+        seconds until the next token."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst,
+                               self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self):
+        """Block until a token is available, then take it. Returns the
+        seconds spent waiting."""
+        waited = 0.0
+        while True:
+            wait = self.try_acquire()
+            if not wait:
+                return waited
+            time.sleep(wait)
+            waited += wait
+
+
+class ConnectionPool:
+    """Idle keep-alive connections for one (scheme, host, port)."""
+
+    def __init__(self, scheme, host, port, timeout, max_idle):
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def get(self):
+        """Return (connection, reused), preferring an idle connection."""
+        with self._lock:
+            if self._idle:
+                return self._idle.pop(), True
+        return self.connect(), False
+
+    def connect(self):
+        """Open a new (not yet connected) connection."""
+        if self.scheme == "https":
+            return http.client.HTTPSConnection(
+                self.host, self.port, timeout=self.timeout,
+                context=ssl.create_default_context())
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def put(self, conn):
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+def _decode_body(body, encoding):
+    encoding = (encoding or "").lower()
+    if encoding == "gzip":
+        return gzip.decompress(body)
+    if encoding == "deflate":
+        try:
+            return zlib.decompress(body)
+        except zlib.error:
+            return zlib.decompress(body, -zlib.MAX_WBITS)
+    return body
+
+
+class _DeflateDecoder:
+    """Streaming deflate that accepts zlib-wrapped or raw streams, like
+    _decode_body."""
+
+    def __init__(self):
+        self._zlib = None
+
+    def decompress(self, chunk):
+        if self._zlib is None:
+            self._zlib = zlib.decompressobj()
+            try:
+                return self._zlib.decompress(chunk)
+            except zlib.error:
+                self._zlib = zlib.decompressobj(-zlib.MAX_WBITS)
+        return self._zlib.decompress(chunk)
+
+    def flush(self):
+        return self._zlib.flush() if self._zlib else b""
+
+
+def _decompressor(encoding):
+    encoding = (encoding or "").lower()
+    if encoding == "gzip":
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+    if encoding == "deflate":
+        return _DeflateDecoder()
+    return None
+
+
+def parse_retry_after(value):
+    """Parse a Retry-After header (seconds or HTTP date) into seconds."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class HttpClient:
+    """Pooled, rate-limited, retrying HTTP client. Safe to share across threads."""
+
+    def __init__(self, user_agent=DEFAULT_UA, timeout=15, retries=3,
+                 backoff=0.5, max_backoff=30.0, rate_limits=None, max_idle=8,
+                 headers=None, cache=None):
+        self.user_agent = user_agent
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_idle = max_idle
+        self.headers = dict(headers or {})
+        self.cache = cache
+        self.mock_url = os.environ.get("UNIFY_MOCK_URL") or None
+        self._pools = {}
+        self._limits = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        for host, rate in (rate_limits or {}).items():
+            self.set_rate(host, rate)
+
+    # ── configuration ──────────────────────────────────────────
+
+    def set_rate(self, host, per_second, burst=1):
+        """Limit requests to `host` to `per_second` (None removes the limit).
+
+        `host` may also be a full URL, e.g. a script's API_BASE constant.
+        """
+        if "://" in host:
+            host = urllib.parse.urlsplit(host).hostname
+        with self._lock:
+            if per_second:
+                self._limits[host] = TokenBucket(per_second, burst)
+            else:
+                self._limits.pop(host, None)
+
+    def clear_rates(self):
+        """Remove every per-host rate limit."""
+        with self._lock:
+            self._limits.clear()
+
+    def throttle_wait(self):
+        """Seconds the calling thread has spent waiting for rate-limit
+        tokens. Take the difference around a request to split its time
+        into queueing and the network round trip."""
+        return getattr(self._local, "waited", 0.0)
+
+    def close(self):
+        with self._lock:
+            pools, self._pools = list(self._pools.values()), {}
+        for pool in pools:
+            pool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ── requests ───────────────────────────────────────────────
+
+    def get(self, url, params=None, **kwargs):
+        return self.request("GET", url, params=params, **kwargs)
+
+    def get_json(self, url, params=None, **kwargs):
+        return self.get(url, params=params, **kwargs).json()
+
+    def post_json(self, url, payload, **kwargs):
+        """POST `payload` as JSON, return the parsed JSON response."""
+        return self.request("POST", url, json_body=payload, **kwargs).json()
+
+    def request(self, method, url, params=None, data=None, json_body=None,
+                headers=None, timeout=None, retries=None, cacheable=None,
+                stream=False):
+        """Send a request and return a Response.
+
+        Retries 429/5xx and transport failures up to `retries` times with
+        jittered exponential backoff (or the server's Retry-After, if
+        longer). Raises HTTPError for any final non-2xx status and
+        TransportError when the host could not be reached.
+
+        With a cache configured, GET requests (or any request with
+        cacheable=True) are answered from it when a fresh entry exists,
+        and successful responses are stored.
+
+        With stream=True the body is left unread and a StreamingResponse
+        is returned instead; streamed requests bypass the cache. Retries
+        and redirects still apply up to the first 2xx status.
+        """
+        if params:
+            sep = "&" if urllib.parse.urlsplit(url).query else "?"
+            url = f"{url}{sep}{urllib.parse.urlencode(params)}"
+        if json_body is not None:
+            data = json.dumps(json_body).encode("utf-8")
+        hdrs = {
+            "User-Agent": self.user_agent,
+            "Accept-Encoding": "gzip, deflate",
+            **self.headers,
+            **(headers or {}),
+        }
+        if json_body is not None:
+            hdrs.setdefault("Content-Type", "application/json")
+        retries = self.retries if retries is None else retries
+
+        if cacheable is None:
+            cacheable = method == "GET"
+        cache = self.cache if cacheable and not stream else None
+        source = urllib.parse.urlsplit(url).hostname
+        request_url = url
+        if cache is not None:
+            try:
+                hit = cache.get(source, method, url, data)
+            except CacheMiss as e:
+                raise OfflineError(str(e)) from e
+            if hit:
+                status, cached_headers, body = hit
+                return Response(status, "OK", cached_headers, body, url)
+
+        attempt = 0
+        redirects = 0
+        while True:
+            try:
+                resp = self._send(method, url, data, hdrs, timeout or self.timeout, stream)
+            except _TRANSPORT_ERRORS as e:
+                if attempt >= retries:
+                    raise TransportError(f"{method} {url}: {e}") from e
+                self._sleep_backoff(attempt, None)
+                attempt += 1
+                continue
+
+            if stream and not 200 <= resp.status < 300:
+                try:
+                    resp = resp.read()
+                except _TRANSPORT_ERRORS:
+                    resp = Response(resp.status, resp.reason, resp.headers, b"", url)
+
+            if resp.status in REDIRECT_STATUSES and "location" in resp.headers:
+                redirects += 1
+                if redirects > MAX_REDIRECTS:
+                    raise HTTPError(resp.status, "too many redirects", url, resp.headers)
+                url = urllib.parse.urljoin(url, resp.headers["location"])
+                if resp.status == 303:
+                    method, data = "GET", None
+                continue
+
+            if resp.status in RETRY_STATUSES and attempt < retries:
+                self._sleep_backoff(attempt, parse_retry_after(resp.headers.get("retry-after")))
+                attempt += 1
+                continue
+
+            if not 200 <= resp.status < 300:
+                raise HTTPError(resp.status, resp.reason, url, resp.headers, resp.body)
+            if cache is not None:
+                stored = {k: v for k, v in resp.headers.items()
+                          if k not in ("content-encoding", "content-length",
+                                       "transfer-encoding", "connection")}
+                cache.put(source, method, request_url, data, resp.status, stored, resp.body)
+            return resp
+
+    # ── internals ──────────────────────────────────────────────
+
+    def _pool(self, scheme, host, port, timeout):
+        key = (scheme, host, port)
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = self._pools[key] = ConnectionPool(
+                    scheme, host, port, timeout, self.max_idle)
+            return pool
+
+    def _throttle(self, host):
+        with self._lock:
+            bucket = self._limits.get(host)
+        if bucket:
+            self._local.waited = self.throttle_wait() + bucket.acquire()
+
+    def _send(self, method, url, data, headers, timeout, stream=False):
+        parts = urllib.parse.urlsplit(url)
+        scheme = parts.scheme or "http"
+        host = parts.hostname
+        port = parts.port or (443 if scheme == "https" else 80)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+
+        self._throttle(host)
+        if self.mock_url:
+            headers = {**headers, "X-Upstream-Host": parts.netloc, "X-Upstream-Scheme": scheme}
+            mock = urllib.parse.urlsplit(self.mock_url)
+            scheme, host, port = mock.scheme, mock.hostname, mock.port or 80
+        pool = self._pool(scheme, host, port, timeout)
+        conn, reused = pool.get()
+        try:
+            try:
+                raw = self._roundtrip(conn, method, path, data, headers, stream)
+            except _STALE_ERRORS:
+                if not reused:
+                    raise
+                # Idle connection was closed by the server; resend once.
+                conn.close()
+                conn = pool.connect()
+                raw = self._roundtrip(conn, method, path, data, headers, stream)
+        except BaseException:
+            conn.close()
+            raise
+
+        status, reason, hdrs, body, will_close = raw
+        if stream:
+            def release(complete):
+                if complete and not will_close:
+                    pool.put(conn)
+                else:
+                    conn.close()
+            return StreamingResponse(status, reason, hdrs, body, url, release)
+        if will_close:
+            conn.close()
+        else:
+            pool.put(conn)
+        body = _decode_body(body, hdrs.get("content-encoding"))
+        return Response(status, reason, hdrs, body, url)
+
+    @staticmethod
+    def _roundtrip(conn, method, path, data, headers, stream=False):
+        conn.request(method, path, body=data, headers=headers)
+        resp = conn.getresponse()
+        body = resp if stream else resp.read()
+        hdrs = {k.lower(): v for k, v in resp.getheaders()}
+        return resp.status, resp.reason, hdrs, body, resp.will_close
+
+    def _sleep_backoff(self, attempt, retry_after):
+        delay = random.uniform(0, min(self.max_backoff, self.backoff * (2 ** attempt)))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_backoff * 4))
+        print(f"  retrying in {delay:.1f}s...", file=sys.stderr)
+        time.sleep(delay)
@@ -0,0 +1,157 @@
+"""Per-entity fingerprints for incremental reconciliation.
+
+The reconcilers (wikidata_reconcile, littlesis_enrich, propublica_enrich,
+opensanctions_reconcile) used to query every target entity on every run,
+even when only two entities had been added. Each now records, per
+entity, a fingerprint of what its query depends on (name, types,
+aliases, plus anything script-specific such as a known QID or EIN)
+together with the outcome and the external ID it produced:
+
+  scripts/reconcile_state/<name>.json
+    {"entities": {"<id>": {"fingerprint": "...", "status": "...",
+                           "result": "<external id or null>"}}}
+
+The state belongs with the outputs it describes; commit it with them.
+
+A later run reconciles only entities that are new, whose fingerprint
+changed, or whose last outcome was an error, and merges those results
+into the existing output files. Unchanged entities keep their lines in
+the output verbatim, reviewed corrections and REMOVED notes included;
+entities that left the graph are dropped. --full (or a missing state
+file or output) reconciles everything and rewrites the outputs as before.
+--adopt records the current entities' fingerprints against the existing
+outputs without querying anything, so reviewed outputs can be taken as
+the starting point instead of being regenerated by a full run.
+
+Usage:
+  from incremental import ReconcileState, fingerprint, merge_overlay
+
+  state = ReconcileState("littlesis_enrich", full="--full" in sys.argv)
+  todo, unchanged, removed = state.plan({key: fingerprint(name, types, aliases)})
+  ...query todo, state.record(key, fp, status, ls_id)...
+  merge_overlay(cue_path, "littlesis", {key: ls_id or None}, drop=removed)
+  state.save()
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from compact_ids import ID_LINE, REMOVED_LINE, parse_overlay
+from name_index import ENRICHED_FILE, enriched_aliases
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+STATE_DIR = REPO_ROOT / "scripts" / "reconcile_state"
+
+ERROR = "error"
+
+
+def fingerprint(name, types=(), aliases=(), **extra):
+    """Stable hash of the inputs an entity's reconciliation depends on."""
+    payload = {"name": name, "types": sorted(types), "aliases": sorted(aliases), **extra}
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(raw.encode()).hexdigest()[:16]
+
+
+def alias_map():
+    """{id: [alias, ...]} from wikidata_enriched.json, as name_index reads them."""
+    try:
+        enriched = json.loads(ENRICHED_FILE.read_text())
+    except FileNotFoundError:
+        return {}
+    return {eid: enriched_aliases(entry) for eid, entry in enriched.items()}
+
+
+class ReconcileState:
+    """Fingerprints and outcomes from earlier runs of one script."""
+
+    def __init__(self, name, full=False, directory=STATE_DIR):
+        self.path = Path(directory) / f"{name}.json"
+        self.entities = {}
+        if self.path.exists():
+            try:
+                self.entities = json.loads(self.path.read_text())["entities"]
+            except (json.JSONDecodeError, KeyError):
+                self.entities = {}
+        self.full = full or not self.entities
+
+    def plan(self, fingerprints):
+        """Split {key: fingerprint} into (todo, unchanged, removed) key lists.
+
+        removed are keys reconciled before that are no longer targets.
+        """
+        todo, unchanged = [], []
+        for key in sorted(fingerprints):
+            prev = self.entities.get(key)
+            if (self.full or prev is None or prev["status"] == ERROR
+                    or prev["fingerprint"] != fingerprints[key]):
+                todo.append(key)
+            else:
+                unchanged.append(key)
+        removed = sorted(set(self.entities) - set(fingerprints))
+        return todo, unchanged, removed
+
+    def record(self, key, fp, status, result=None):
+        self.entities[key] = {"fingerprint": fp, "status": status, "result": result}
+
+    def adopt(self, fingerprints, ids):
+        """Record every target as reconciled to its current output value
+        ({key: external id}), without querying."""
+        self.entities = {}
+        for key, fp in fingerprints.items():
+            value = ids.get(key)
+            self.record(key, fp, "ok" if value else "no_match", value)
+
+    def forget(self, keys):
+        for key in keys:
+            self.entities.pop(key, None)
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"entities": self.entities}, indent=1, sort_keys=True) + "\n")
+        os.replace(tmp, self.path)
+
+
+def overlay_ids(path, source):
+    """{entity: value} for `source` in an overlay ({} if it doesn't exist)."""
+    path = Path(path)
+    if not path.exists():
+        return {}
+    ids, _removed, _guarded = parse_overlay(path)
+    return {entity: value for entity, src, value, _note in ids if src == source}
+
+
+def _line_entity(line):
+    m = ID_LINE.match(line) or REMOVED_LINE.match(line)
+    return m.group(1) if m else None
+
+
+def merge_overlay(path, source, updates, drop=()):
+    """Merge reconciled entities into an existing *_ids.cue overlay.
+
+    `updates` maps each reconciled entity to its new value (None: no
+    match). Their old lines, REMOVED notes included, are replaced; lines
+    of entities in `drop` are deleted; every other line, header included,
+    is kept as is. Entity lines stay in sorted order.
+    """
+    path = Path(path)
+    lines = path.read_text().splitlines()
+    start = next(i for i, line in enumerate(lines) if line.startswith("entities:"))
+    end = next(i for i in range(start + 1, len(lines)) if lines[i] == "}")
+
+    replaced = set(updates) | set(drop)
+    body = []
+    owner = ""
+    for i, line in enumerate(lines[start + 1:end]):
+        # A line that names no entity (a comment) stays with the one above it
+        owner = _line_entity(line) or owner
+        if owner not in replaced:
+            body.append(((owner, 0, i), line))
+    for key, value in updates.items():
+        if value:
+            body.append(((key, 1, 0), f'\t{key}: external_ids: {source}: "{value}"'))
+    body.sort(key=lambda item: item[0])
+
+    merged = lines[:start + 1] + [line for _, line in body] + lines[end:]
+    path.write_text("\n".join(merged) + "\n")
@@ -6,23 +6,40 @@ information for individuals in the Epstein network.
 
 Usage:
   Local:  .venv/bin/python3 scripts/littlesis_enrich.py
-          python3 scripts/littlesis_enrich.py
+          python3 scripts/littlesis_enrich.py [--offline] [--resume] [--full]
+
+Only Person entities that are new or whose name, types or aliases changed
+since the last run are queried (scripts/reconcile_state/littlesis_enrich.json,
+see incremental.py), and their results are merged into the existing
+outputs. --full queries every Person entity and rewrites both files;
+--adopt records the current entities against littlesis_ids.cue without
+querying. The overlay and the state are committed; the results file is a
+local report, and without it a run reports only the entities it queried.
+
+Each entity's outcome is appended to .cache/checkpoints/littlesis_enrich.jsonl
+as soon as it is known; --resume skips entities already done (errors are
+retried). The results file and CUE overlay are written from the checkpoint
+once every entity has been queried.
+
+Responses are cached in .cache/http_cache.sqlite; --offline serves only
+from the cache.
 
 LittleSis API docs:
   https://littlesis.org/api
 
 No authentication required. Rate-limited to 1.5s between requests.
 """
-import difflib
 import json
 import sys
-import time
-import urllib.error
-import urllib.request
-import urllib.parse
 from datetime import datetime, timezone
 from pathlib import Path
 
+from checkpoint import Checkpoint
+from http_client import HTTPError, HttpClient, RequestError
+from incremental import ReconcileState, alias_map, fingerprint, merge_overlay, overlay_ids
+import resolve
+from response_cache import ResponseCache
+
 API_BASE = "https://littlesis.org/api"
 ENTITY_SEARCH = f"{API_BASE}/entities/search"
 RELATIONSHIPS = f"{API_BASE}/entities/{{id}}/relationships"
@@ -32,28 +49,31 @@ UA = "unify-graph/1.0 (Epstein network research)"
 # Rate limit: be respectful
 RATE_LIMIT_SECONDS = 1.5
 
+HTTP = HttpClient(user_agent=UA, rate_limits={API_BASE: 1 / RATE_LIMIT_SECONDS},
+                  cache=ResponseCache())
 
-def api_get(url):
-    """GET a JSON endpoint, return parsed dict or None on error."""
+RESULTS_PATH = Path("scripts/littlesis_results.json")
+CUE_PATH = Path("littlesis_ids.cue")
+
+
+def api_get(url, params=None):
+    """GET a JSON endpoint, return parsed dict or None if not found.
+
+    Other failures (retries exhausted, 5xx, offline cache miss, bad JSON)
+    raise RequestError or ValueError, so the caller records them as
+    errors to retry instead of as no match.
+    """
     try:
-        req = urllib.request.Request(url, headers={"User-Agent": UA})
-        with urllib.request.urlopen(req, timeout=15) as resp:
-            return json.loads(resp.read())
-    except urllib.error.HTTPError as e:
+        return HTTP.get_json(url, params)
+    except HTTPError as e:
         if e.code == 404:
             return None
-        print(f"  ERROR: HTTP {e.code}: {e.reason}", file=sys.stderr)
-        return None
-    except Exception as e:
-        print(f"  ERROR: {e}", file=sys.stderr)
-        return None
+        raise
 
 
 def search_littlesis(name):
     """Search LittleSis for entities matching name."""
-    params = urllib.parse.urlencode({"q": name})
-    url = f"{ENTITY_SEARCH}?{params}"
-    data = api_get(url)
+    data = api_get(ENTITY_SEARCH, {"q": name})
     if data and "data" in data:
         # Normalize: flatten attributes into top-level for matching
         results = []
@@ -96,15 +116,13 @@ def get_relationships(entity_id):
     return []
 
 
-def name_similarity_ratio(name1, name2):
-    """Return similarity ratio (0.0-1.0) between two names using SequenceMatcher."""
-    return difflib.SequenceMatcher(None, name1.lower(), name2.lower()).ratio()
-
-
-def pick_best_match(results, name, threshold=0.85):
+def pick_best_match(results, name, threshold=None):
     """Pick the best match from search results by name similarity.
 
-    Returns (match_dict, ratio) or (None, 0.0) if no good match found.
+    Similarity is the shared resolver's trigram cosine; threshold defaults
+    to the littlesis entry in resolve.SOURCE_THRESHOLDS.
+
+    Returns (match_dict, score) or (None, 0.0) if no good match found.
     """
     if not results:
         return None, 0.0
@@ -117,20 +135,11 @@ def pick_best_match(results, name, threshold=0.85):
         if result_name.lower() == name_lower:
             return r, 1.0
 
-    # Score by similarity ratio
-    scored = []
-    for r in results:
-        result_name = r.get("name", "")
-        ratio = name_similarity_ratio(name, result_name)
-        if ratio >= threshold:
-            scored.append((ratio, r))
-
-    if scored:
-        scored.sort(key=lambda x: x[0], reverse=True)
-        best_ratio, best_result = scored[0]
-        return best_result, best_ratio
-
-    return None, 0.0
+    idx, score = resolve.pick(name, [r.get("name", "") for r in results], "littlesis",
+                              threshold=threshold)
+    if idx is None:
+        return None, 0.0
+    return results[idx], score
 
 
 def extract_notable_relationships(relationships):
@@ -154,6 +163,10 @@ def extract_notable_relationships(relationships):
 
 
 def main():
+    if "--offline" in sys.argv:
+        HTTP.cache.offline = True
+    resume = "--resume" in sys.argv
+
     # Load entities
     try:
         with open("site/data/entities.json") as f:
@@ -170,13 +183,31 @@ def main():
         if "Person" in types:
             targets[key] = entity
 
-    print(f"Querying LittleSis for {len(targets)} Person entities...\n")
-
-    matches = {}
-    no_match = []
-    errors = []
-
-    for key in sorted(targets.keys()):
+    aliases = alias_map()
+    fingerprints = {key: fingerprint(e["name"], e.get("@type", {}), aliases.get(key, []))
+                    for key, e in targets.items()}
+    state = ReconcileState("littlesis_enrich",
+                           full="--full" in sys.argv or not CUE_PATH.exists())
+    if "--adopt" in sys.argv:
+        state.adopt(fingerprints, overlay_ids(CUE_PATH, "littlesis"))
+        state.save()
+        print(f"Recorded {len(fingerprints)} entities against {CUE_PATH} ({state.path})")
+        return
+    todo, unchanged, removed = state.plan(fingerprints)
+
+    print(f"Querying LittleSis for {len(todo)} Person entities...")
+    if not state.full:
+        print(f"  {len(unchanged)} unchanged since the last run, {len(removed)} removed "
+              f"(--full to query all {len(targets)})")
+    print()
+
+    checkpoint = Checkpoint("littlesis_enrich", resume=resume)
+    if checkpoint.resumed:
+        print(f"  resuming: {checkpoint.resumed} already done\n")
+
+    for key in todo:
+        if checkpoint.is_done(key):
+            continue
         entity = targets[key]
         name = entity["name"]
 
@@ -186,11 +217,10 @@ def main():
         try:
             # Search for entity
             results = search_littlesis(name)
-            time.sleep(RATE_LIMIT_SECONDS)
 
-            best_match, ratio = pick_best_match(results, name, threshold=0.85)
+            best_match, ratio = pick_best_match(results, name)
             if not best_match:
-                no_match.append(key)
+                checkpoint.record(key, "no_match")
                 print(f"NO MATCH (best ratio: {ratio:.2f})")
                 continue
 
@@ -203,12 +233,11 @@ def main():
 
             # Get relationships
             rels = get_relationships(ls_id)
-            time.sleep(RATE_LIMIT_SECONDS)
 
             # Extract notable relationships
             notable = extract_notable_relationships(rels)
 
-            matches[key] = {
+            checkpoint.record(key, "ok", {
                 "name": name,
                 "littlesis_id": ls_id,
                 "littlesis_url": ls_url,
@@ -216,14 +245,48 @@ def main():
                 "match_ratio": round(ratio, 4),
                 "relationship_count": len(rels),
                 "notable_relationships": notable[:10],  # Top 10 for readability
-            }
+            })
 
             print(f"OK -- {len(rels)} rels, {len(notable)} notable")
 
-        except Exception as e:
-            errors.append((key, str(e)))
+        except (RequestError, ValueError) as e:
+            # Transient: recorded as an error so --resume and the next run retry it
+            checkpoint.record(key, "error", str(e))
             print(f"ERROR: {e}")
 
+    # Compact the checkpoint into the final outputs
+    matches = {}
+    no_match = []
+    errors = []
+    for key, (status, data) in sorted(checkpoint.load().items()):
+        if key not in fingerprints:
+            continue
+        state.record(key, fingerprints[key], status,
+                     data["littlesis_id"] if status == "ok" else None)
+        if status == "ok":
+            matches[key] = data
+        elif status == "no_match":
+            no_match.append(key)
+        else:
+            errors.append((key, data))
+    reconciled = sorted(matches) + no_match
+    failed = {key for key, _ in errors}
+    state.forget(removed)
+
+    previous = {"matches": {}, "no_match": [], "errors": []}
+    if RESULTS_PATH.exists():
+        with open(RESULTS_PATH) as f:
+            previous = json.load(f)
+    # Entities whose query failed keep their previous result until a retry succeeds
+    kept = failed if state.full else set(targets) - set(reconciled)
+    matches = dict(sorted({**{k: v for k, v in previous["matches"].items() if k in kept},
+                           **matches}.items()))
+    no_match = sorted(set(no_match) | {k for k in previous["no_match"] if k in kept})
+    if not state.full:
+        errors = [list(e) for e in errors] + [e for e in previous["errors"]
+                                              if e[0] in kept and e[0] not in failed]
+    errors = sorted(list(e) for e in errors)
+
     # Write results JSON
     output_data = {
         "matches": matches,
@@ -236,11 +299,11 @@ def main():
         "error_count": len(errors),
     }
 
-    results_path = Path("scripts/littlesis_results.json")
-    with open(results_path, "w") as f:
+    with open(RESULTS_PATH, "w") as f:
         json.dump(output_data, f, indent=2)
 
     print(f"\nDone: {len(matches)} matched, {len(no_match)} no match")
+    print(resolve.summary())
     if no_match:
         print(f"No match: {', '.join(no_match[:10])}")
         if len(no_match) > 10:
@@ -252,24 +315,36 @@ def main():
         if len(errors) > 5:
             print(f"  ... and {len(errors) - 5} more")
 
-    print(f"\nOutput: {results_path}")
-
-    # Generate CUE overlay
-    cue_path = Path("littlesis_ids.cue")
-    with open(cue_path, "w") as f:
-        f.write("// External identifiers -- LittleSis IDs for entity enrichment.\n")
-        f.write("// Auto-generated by scripts/littlesis_enrich.py\n")
-        f.write("//\n")
-        f.write(f"// Generated: {datetime.now(tz=timezone.utc).isoformat()}Z\n")
-        f.write(f"// Matched: {len(matches)} entities\n")
-        f.write("package creeps\n\n")
-        f.write("entities: {\n")
-        for key in sorted(matches.keys()):
-            ls_id = matches[key]["littlesis_id"]
-            f.write(f'\t{key}: external_ids: littlesis: "{ls_id}"\n')
-        f.write("}\n")
-
-    print(f"Output: {cue_path}")
+    print(f"\nOutput: {RESULTS_PATH}")
+
+    # Generate CUE overlay (or merge the reconciled entities into it);
+    # failed entities are not in `reconciled`, so their lines stay as they are
+    if not state.full:
+        merge_overlay(CUE_PATH, "littlesis",
+                      {key: state.entities[key]["result"] for key in reconciled},
+                      drop=removed)
+    else:
+        ids = {key: m["littlesis_id"] for key, m in matches.items()}
+        ids.update({key: value for key, value in overlay_ids(CUE_PATH, "littlesis").items()
+                    if key in failed})
+        with open(CUE_PATH, "w") as f:
+            f.write("// External identifiers -- LittleSis IDs for entity enrichment.\n")
+            f.write("// Auto-generated by scripts/littlesis_enrich.py\n")
+            f.write("//\n")
+            f.write(f"// Generated: {datetime.now(tz=timezone.utc).isoformat()}Z\n")
+            f.write(f"// Matched: {len(ids)} entities\n")
+            f.write("@if(!compact_ids)\n\n")
+            f.write("package creeps\n\n")
+            f.write("entities: {\n")
+            for key in sorted(ids):
+                f.write(f'\t{key}: external_ids: littlesis: "{ids[key]}"\n')
+            f.write("}\n")
+
+    checkpoint.remove()
+    state.save()
+
+    print(f"Output: {CUE_PATH}")
+    print(HTTP.cache.summary())
 
     # Summary table
     if matches:
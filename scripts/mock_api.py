@@ -0,0 +1,513 @@
+#!/usr/bin/env python3
+"""Local stand-in for every external API the scripts call.
+
+Serves each endpoint shape the sweep, enrichment and reconciliation
+scripts parse, so their fetch layers can be load-tested and benchmarked
+(scripts/bench_fetch.py) without touching the real services:
+
+  analytics.dugganusa.com       GET  /api/v1/search              discover, duggan_sweep
+  www.wikidata.org              GET  /w/api.php (wbsearchentities) wikidata_reconcile
+  query.wikidata.org            GET  /sparql                     wikidata_enrich
+  littlesis.org                 GET  /api/entities/search        littlesis_enrich
+                                GET  /api/entities/{id}/relationships
+  projects.propublica.org       GET  /nonprofits/api/v2/search.json
+                                GET  /nonprofits/api/v2/organizations/{ein}.json
+  localhost:8000 (yente)        POST /match/default              opensanctions_reconcile
+                                (batches of up to 100 named queries)
+  epsteinexposed.com            GET  /api/v1/persons             epstein_exposed_sweep
+  www.epsteininvestigation.org  GET  /api/download/entities      epstein_archive_sweep
+
+Responses are recorded ones where available: with --replay, a request
+is answered from a response cache (.cache/http_cache.sqlite, see
+scripts/response_cache.py) when it holds the same request. Everything
+else is synthesized deterministically from the request, so the same
+query always gets the same documents, people and IDs. Successful GETs
+carry an ETag (a hash of the body) and answer a matching If-None-Match
+with 304.
+
+Faults are injected per request, in this order:
+  --max-rps N        per upstream host; over the limit -> 429 + Retry-After
+  --throttle-rate R  fraction of requests answered 429 + Retry-After
+  --error-rate R     fraction of requests answered 503
+  --latency MS       median response delay, log-normal with --jitter sigma
+
+Point the scripts at it with UNIFY_MOCK_URL (see scripts/http_client.py):
+
+  python3 scripts/mock_api.py --port 8900 --latency 80 --throttle-rate 0.02
+  UNIFY_MOCK_URL=http://127.0.0.1:8900 python3 scripts/duggan_sweep.py
+
+Outputs written by a script run against the mock are synthetic; don't
+commit them. GET /__stats returns request counts per route and status.
+"""
+import argparse
+import csv
+import hashlib
+import io
+import json
+import random
+import re
+import sys
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from http_client import TokenBucket
+from response_cache import DEFAULT_PATH, CacheMiss, ResponseCache
+
+DEFAULT_PORT = 8900
+
+FIRST = ["James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda",
+         "David", "Elizabeth", "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica",
+         "Thomas", "Sarah", "Charles", "Karen", "Ghislaine", "Leon", "Glenn", "Reid"]
+LAST = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis",
+        "Rodriguez", "Martinez", "Hernandez", "Lopez", "Wilson", "Anderson", "Thomas",
+        "Taylor", "Moore", "Jackson", "Martin", "Lee", "Black", "Dubin", "Wexner", "Hoffman"]
+PLACES = ["New York", "Palm Beach", "London", "Paris", "Santa Fe", "Little St. James",
+          "Washington", "Los Angeles", "Miami", "Teterboro"]
+CATEGORIES = ["associate", "employee", "victim-advocate", "politician", "financier",
+              "academic", "celebrity", "lawyer"]
+
+DATE_PROPS = {"P569", "P570", "P571", "P576"}
+STRING_PROPS = {"P214", "P244", "P227", "P345", "P646", "P535", "P1566", "P213",
+                "P742", "P968"}
+
+
+def _seed(*parts):
+    """Stable integer seed for a request (Python's hash() is salted)."""
+    digest = hashlib.sha256("\x1f".join(str(p) for p in parts).encode()).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+def _rng(*parts):
+    return random.Random(_seed(*parts))
+
+
+def person_name(i):
+    return f"{FIRST[i % len(FIRST)]} {LAST[(i // len(FIRST)) % len(LAST)]}" + (
+        f" {i // (len(FIRST) * len(LAST))}" if i >= len(FIRST) * len(LAST) else "")
+
+
+class Fixtures:
+    """Deterministic synthetic payloads, one method per endpoint."""
+
+    def __init__(self, documents=50_000, persons=1_500, archive_rows=5_000,
+                 match_ms=0.0, match_workers=4, match_max_batch=100):
+        self.documents = documents
+        self.persons = persons
+        self.archive_rows = archive_rows
+        # yente: scoring time per query, worker processes, MAX_BATCH
+        self.match_ms = match_ms
+        self.match_max_batch = match_max_batch
+        self._match_workers = threading.BoundedSemaphore(match_workers)
+
+    # ── DugganUSA search ───────────────────────────────────────
+
+    def document(self, doc_no):
+        """A document's fields depend only on its number, so queries agree."""
+        rng = _rng("doc", doc_no)
+        people = sorted({person_name(rng.randrange(2_000)) for _ in range(rng.randrange(6))})
+        return {
+            "efta_id": f"EFTA{doc_no:08d}",
+            "doc_type": rng.choice(["email", "deposition", "flight_log", "court_filing"]),
+            "source": rng.choice(["doj", "court", "foia"]),
+            "dataset": f"DataSet {rng.randrange(1, 13)}",
+            "file_path": f"/data/{doc_no % 100:02d}/EFTA{doc_no:08d}.pdf",
+            "pages": rng.randrange(1, 40),
+            "char_count": rng.randrange(500, 80_000),
+            "people": people,
+            "locations": sorted({rng.choice(PLACES) for _ in range(rng.randrange(3))}),
+            "content_preview": f"Document {doc_no} mentioning {', '.join(people) or 'no one'}. "
+                               * 4,
+        }
+
+    def duggan_search(self, params, body):
+        q = params.get("q", "")
+        limit = int(params.get("limit", 10))
+        offset = int(params.get("offset", 0))
+        total = 5 + _seed("total", q.lower()) % 1_500
+        hits = [self.document(_seed("hit", q.lower(), i) % self.documents)
+                for i in range(offset, min(total, offset + limit))]
+        return 200, {"success": True,
+                     "data": {"query": q, "totalHits": total, "hits": hits}}
+
+    # ── Wikidata ───────────────────────────────────────────────
+
+    def wikidata_search(self, params, body):
+        name = params.get("search", "")
+        rng = _rng("wd", name.lower())
+        n = min(int(params.get("limit", 7)), rng.choice([0, 1, 1, 2, 3, 3]))
+        results = []
+        for i in range(n):
+            qid = f"Q{_seed('wdq', name.lower(), i) % 10_000_000}"
+            label = name if i == 0 else f"{name} ({rng.choice(CATEGORIES)})"
+            results.append({"id": qid, "label": label,
+                            "description": f"{rng.choice(CATEGORIES)} born {1930 + i}"})
+        return 200, {"searchinfo": {"search": name}, "search": results, "success": 1}
+
+    def sparql(self, params, body):
+        query = params.get("query", "")
+        qids = re.findall(r"wd:(Q\d+)", query)
+        props = re.findall(r"wdt:(P\d+)", query)
+        bindings = []
+        for qid in qids:
+            rng = _rng("sparql", qid)
+            for pid in rng.sample(props, min(len(props), rng.randrange(3, 12))):
+                for k in range(rng.choice([1, 1, 1, 2, 3])):
+                    bindings.append(self._binding(qid, pid, rng, k))
+        return 200, {"head": {"vars": ["entity", "prop", "val", "valLabel"]},
+                     "results": {"bindings": bindings}}
+
+    @staticmethod
+    def _binding(qid, pid, rng, k):
+        b = {"entity": {"type": "uri", "value": f"http://www.wikidata.org/entity/{qid}"},
+             "prop": {"type": "uri", "value": f"http://www.wikidata.org/prop/direct/{pid}"}}
+        if pid in DATE_PROPS:
+            date = f"{rng.randrange(1900, 2020)}-{rng.randrange(1, 13):02d}-01T00:00:00Z"
+            b["val"] = {"datatype": "http://www.w3.org/2001/XMLSchema#dateTime",
+                        "type": "literal", "value": date}
+            b["valLabel"] = {"type": "literal", "value": date}
+        elif pid in STRING_PROPS:
+            value = str(rng.randrange(10 ** 6, 10 ** 9))
+            b["val"] = {"type": "literal", "value": value}
+            b["valLabel"] = {"type": "literal", "value": value}
+        else:
+            target = f"Q{rng.randrange(1, 10_000_000)}"
+            b["val"] = {"type": "uri", "value": f"http://www.wikidata.org/entity/{target}"}
+            b["valLabel"] = {"xml:lang": "en", "type": "literal",
+                             "value": f"{rng.choice(PLACES)} item {k}"}
+        return b
+
+    # ── LittleSis ──────────────────────────────────────────────
+
+    def littlesis_search(self, params, body):
+        name = params.get("q", "")
+        rng = _rng("ls", name.lower())
+        data = []
+        for i in range(rng.choice([0, 1, 2, 3])):
+            ls_id = _seed("lsid", name.lower(), i) % 500_000
+            data.append({"type": "entities", "id": ls_id, "attributes": {
+                "id": ls_id, "name": name if i == 0 else f"{name} Jr.",
+                "blurb": f"{rng.choice(CATEGORIES)}", "primary_ext": "Person",
+                "types": ["Person"], "start_date": None, "end_date": None}})
+        return 200, {"data": data, "meta": {"currentPage": 1, "pageCount": 1}}
+
+    def littlesis_relationships(self, params, body, ls_id):
+        rng = _rng("lsrel", ls_id)
+        data = []
+        for i in range(rng.randrange(0, 40)):
+            rel_id = _seed("rel", ls_id, i) % 10_000_000
+            data.append({"type": "relationships", "id": rel_id, "attributes": {
+                "id": rel_id, "description1": rng.choice(["Board Member", "Donor", "Friend",
+                                                          "Employee", "Trustee"]),
+                "description2": "", "category_id": rng.randrange(1, 13),
+                "entity1_id": int(ls_id), "entity2_id": rng.randrange(1, 500_000),
+                "start_date": None, "end_date": None,
+                "amount": rng.choice([None, rng.randrange(1_000, 5_000_000)])}})
+        return 200, {"data": data}
+
+    # ── ProPublica ─────────────────────────────────────────────
+
+    def propublica_search(self, params, body):
+        name = params.get("q", "")
+        rng = _rng("pp", name.lower())
+        n = rng.choice([0, 1, 2, 5])
+        if not n:
+            return 404, {"error": "not found"}  # ProPublica's empty search
+        orgs = [{"ein": _seed("ein", name.lower(), i) % 10 ** 9,
+                 "name": (name if i == 0 else f"{name} Trust {i}").upper(),
+                 "city": rng.choice(PLACES).upper(), "state": "NY",
+                 "ntee_code": "T20"} for i in range(n)]
+        return 200, {"total_results": n, "organizations": orgs}
+
+    def propublica_org(self, params, body, ein):
+        rng = _rng("org", ein)
+        filings = [{"tax_prd_yr": 2022 - i, "totrevenue": rng.randrange(10 ** 4, 10 ** 8),
+                    "totassetsend": rng.randrange(10 ** 4, 10 ** 9),
+                    "totfuncexpns": rng.randrange(10 ** 4, 10 ** 8)}
+                   for i in range(rng.randrange(0, 12))]
+        return 200, {"organization": {
+            "ein": int(ein), "name": f"FOUNDATION {ein}", "city": rng.choice(PLACES).upper(),
+            "state": "NY", "ntee_code": "T20",
+            "income_amount": filings[0]["totrevenue"] if filings else 0,
+            "asset_amount": filings[0]["totassetsend"] if filings else 0},
+            "filings_with_data": filings}
+
+    # ── yente ──────────────────────────────────────────────────
+
+    def yente_match(self, params, body):
+        queries = json.loads(body or b"{}").get("queries", {})
+        if len(queries) > self.match_max_batch:
+            return 400, {"detail": f"Too many queries in one batch (limit: {self.match_max_batch})"}
+        if self.match_ms:
+            # Each query costs match_ms of a worker; requests queue for workers
+            with self._match_workers:
+                time.sleep(len(queries) * self.match_ms / 1000)
+        responses = {}
+        for qkey, query in queries.items():
+            names = query.get("properties", {}).get("name", [""])
+            rng = _rng("yente", names[0].lower(), query.get("schema"))
+            results = [{"id": f"Q{rng.randrange(1, 10 ** 7)}" if i == 0 else
+                        f"NK-{rng.randrange(10 ** 6)}",
+                        "caption": names[0], "schema": query.get("schema", "Person"),
+                        "score": round(rng.uniform(0.5, 1.0) * (0.8 ** i), 3),
+                        "match": i == 0, "datasets": rng.sample(
+                            ["us_ofac_sdn", "eu_fsf", "wikidata", "us_cia_world_leaders"],
+                            rng.randrange(1, 3))}
+                       for i in range(rng.choice([0, 1, 2, 5]))]
+            responses[qkey] = {"status": 200, "results": results,
+                               "total": {"value": len(results), "relation": "eq"},
+                               "query": query}
+        return 200, {"responses": responses, "limit": 5}
+
+    # ── Epstein Exposed / archive ──────────────────────────────
+
+    def exposed_persons(self, params, body):
+        page = max(1, int(params.get("page", 1)))
+        per_page = int(params.get("per_page", 20))
+        start = (page - 1) * per_page
+        data = []
+        for i in range(start, min(self.persons, start + per_page)):
+            rng = _rng("person", i)
+            name = person_name(i)
+            data.append({"id": i + 1, "slug": name.lower().replace(" ", "-"), "name": name,
+                         "category": rng.choice(CATEGORIES),
+                         "documentCount": rng.randrange(0, 400),
+                         "flightCount": rng.randrange(0, 30)})
+        return 200, {"status": "ok", "data": data,
+                     "meta": {"total": self.persons, "page": page, "per_page": per_page}}
+
+    def archive_csv(self, params, body):
+        out = io.StringIO()
+        writer = csv.writer(out)
+        writer.writerow(["id", "name", "type", "doc_count"])
+        for i in range(self.archive_rows):
+            writer.writerow([f"ent-{i:06d}", person_name(i), "person",
+                             _seed("archive", i) % 500])
+        return 200, out.getvalue().encode()
+
+
+ROUTES = [
+    ("GET", re.compile(r"/api/v1/search"), "duggan_search"),
+    ("GET", re.compile(r"/w/api\.php"), "wikidata_search"),
+    ("GET", re.compile(r"/sparql"), "sparql"),
+    ("GET", re.compile(r"/api/entities/search"), "littlesis_search"),
+    ("GET", re.compile(r"/api/entities/(\d+)/relationships"), "littlesis_relationships"),
+    ("GET", re.compile(r"/nonprofits/api/v2/search\.json"), "propublica_search"),
+    ("GET", re.compile(r"/nonprofits/api/v2/organizations/(\d+)\.json"), "propublica_org"),
+    ("POST", re.compile(r"/match/\w+"), "yente_match"),
+    ("GET", re.compile(r"/api/v1/persons"), "exposed_persons"),
+    ("GET", re.compile(r"/api/download/entities"), "archive_csv"),
+]
+
+
+class Faults:
+    """Latency, error and throttling settings, shared by all handler threads."""
+
+    def __init__(self, latency_ms=0.0, jitter=0.5, error_rate=0.0, throttle_rate=0.0,
+                 max_rps=None, retry_after=1, seed=0):
+        self.latency_ms = latency_ms
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.max_rps = max_rps
+        self.retry_after = retry_after
+        self._rng = random.Random(seed)
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _admit(self, host):
+        """False when `host` is over --max-rps."""
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = TokenBucket(self.max_rps, burst=self.max_rps)
+        return not bucket.try_acquire()
+
+    def decide(self, host):
+        """Return (delay seconds, fault status or None) for one request."""
+        with self._lock:
+            roll = self._rng.random()
+            delay = (self.latency_ms / 1000 * self._rng.lognormvariate(0, self.jitter)
+                     if self.latency_ms else 0.0)
+        if self.max_rps and not self._admit(host):
+            return 0.0, 429
+        if roll < self.throttle_rate:
+            return 0.0, 429
+        if roll < self.throttle_rate + self.error_rate:
+            return delay, 503
+        return delay, None
+
+
+class MockServer:
+    """Threaded mock API server. Use as a context manager or start()/stop()."""
+
+    def __init__(self, port=0, faults=None, fixtures=None, replay=None, verbose=False):
+        self.faults = faults or Faults()
+        self.fixtures = fixtures or Fixtures()
+        self.replay = ResponseCache(replay, offline=True, enabled=True) if replay else None
+        self.verbose = verbose
+        self.stats = {}
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def reset_stats(self):
+        with self._lock:
+            self.stats = {}
+
+    def count(self, route, status):
+        with self._lock:
+            counts = self.stats.setdefault(route, {})
+            counts[status] = counts.get(status, 0) + 1
+
+    def respond(self, method, host, scheme, path, query, body):
+        """(status, content type, payload bytes, route name) for one request."""
+        for route_method, pattern, name in ROUTES:
+            match = pattern.fullmatch(path)
+            if match and route_method == method:
+                break
+        else:
+            return 404, "application/json", b'{"error": "no such route"}', "unknown"
+
+        if self.replay is not None:
+            url = f"{scheme}://{host}{path}" + (f"?{query}" if query else "")
+            try:
+                hit = self.replay.get(host.split(":")[0], method, url, body or None)
+            except CacheMiss:
+                hit = None
+            if hit:
+                status, headers, payload = hit
+                return status, headers.get("content-type", "application/json"), payload, name
+
+        params = dict(urllib.parse.parse_qsl(query))
+        status, payload = getattr(self.fixtures, name)(params, body, *match.groups())
+        if isinstance(payload, bytes):
+            return status, "text/csv; charset=utf-8", payload, name
+        return status, "application/json", json.dumps(payload).encode(), name
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True  # headers and body go out as separate writes
+
+            def do_GET(self):
+                self._serve("GET")
+
+            def do_POST(self):
+                self._serve("POST")
+
+            def _serve(self, method):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                parts = urllib.parse.urlsplit(self.path)
+                if parts.path == "/__stats":
+                    return self._send(200, "application/json", json.dumps(server.stats).encode())
+                host = self.headers.get("X-Upstream-Host") or self.headers.get("Host", "")
+                scheme = self.headers.get("X-Upstream-Scheme", "https")
+
+                status, ctype, payload, route = server.respond(
+                    method, host, scheme, parts.path, parts.query, body)
+                delay, fault = server.faults.decide(host)
+                if delay:
+                    time.sleep(delay)
+                if fault == 429:
+                    server.count(route, 429)
+                    return self._send(429, "application/json", b'{"error": "rate limited"}',
+                                      {"Retry-After": str(server.faults.retry_after)})
+                if fault:
+                    server.count(route, fault)
+                    return self._send(fault, "application/json", b'{"error": "unavailable"}')
+                headers = None
+                if method == "GET" and status == 200:
+                    # Conditional GET, as a CDN in front of the real APIs would do
+                    etag = '"' + hashlib.sha256(payload).hexdigest()[:16] + '"'
+                    if self.headers.get("If-None-Match") == etag:
+                        server.count(route, 304)
+                        return self._send(304, ctype, b"", {"ETag": etag})
+                    headers = {"ETag": etag}
+                server.count(route, status)
+                self._send(status, ctype, payload, headers)
+
+            def _send(self, status, ctype, payload, headers=None):
+                self.send_response(status)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, fmt, *args):
+                if server.verbose:
+                    super().log_message(fmt, *args)
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock server for the scripts' external APIs")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--latency", type=float, default=0.0, help="Median delay in ms")
+    parser.add_argument("--jitter", type=float, default=0.5,
+                        help="Log-normal sigma of the delay (tail heaviness)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of 503s")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of 429s")
+    parser.add_argument("--max-rps", type=float, default=None,
+                        help="Per-host request limit; excess requests get 429")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds on 429")
+    parser.add_argument("--replay", nargs="?", const=str(DEFAULT_PATH), default=None,
+                        help="Answer from a response cache when it has the request "
+                             f"(default {DEFAULT_PATH})")
+    parser.add_argument("--persons", type=int, default=1_500,
+                        help="Epstein Exposed persons to serve")
+    parser.add_argument("--archive-rows", type=int, default=5_000,
+                        help="Rows in the archive entity CSV")
+    parser.add_argument("--match-ms", type=float, default=0.0,
+                        help="Yente scoring time per query in a /match batch")
+    parser.add_argument("--match-workers", type=int, default=4,
+                        help="Yente workers; /match requests beyond this queue")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for fault injection")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args()
+
+    server = MockServer(
+        args.port,
+        Faults(args.latency, args.jitter, args.error_rate, args.throttle_rate,
+               args.max_rps, args.retry_after, args.seed),
+        Fixtures(persons=args.persons, archive_rows=args.archive_rows,
+                 match_ms=args.match_ms, match_workers=args.match_workers),
+        replay=args.replay, verbose=args.verbose)
+    print(f"Mock APIs on {server.url}  (UNIFY_MOCK_URL={server.url})", file=sys.stderr)
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
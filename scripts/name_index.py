@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""Prebuilt name and alias index for the local entities.
+
+The reconcilers each rebuilt their lookup tables for our own entities on
+every run. This module builds them once into site/data/name_index.json:
+
+  - id, name and types of every graph node (graph_nodes.load_nodes():
+    site/data/graph.json, or one cached cue export)
+  - aliases: Wikidata pseudonyms (P742) and any "aliases" list from
+    scripts/wikidata_enriched.json
+  - normalized forms of names and aliases (resolve.normalize)
+  - a token inverted index: normalized token -> entity positions
+  - phonetic keys: Soundex per token (soundex()), both as an
+    inverted index and as each name's full key ("J616 E123")
+
+The file is compact JSON (entities referenced by position, no
+whitespace) and loads in a few milliseconds. It records which node data
+it was built from (graph_nodes.source_digest()) and the SHA-256 of
+wikidata_enriched.json; NameIndex.load() rebuilds it only when either
+has changed.
+
+Usage:
+  from name_index import NameIndex
+
+  index = NameIndex.load()
+  index.entities()                  # {id: name}
+  index.lookup("Jeffrey E. Epstein")  # ids whose name or alias normalizes the same
+  index.candidates("jefry epstien")   # ids sharing a token or phonetic code
+
+  python3 scripts/name_index.py            # build if stale, print stats
+  python3 scripts/name_index.py --force    # rebuild
+  python3 scripts/name_index.py --show NAME
+"""
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+import graph_nodes
+import resolve
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+INDEX_PATH = REPO_ROOT / "site" / "data" / "name_index.json"
+ENRICHED_FILE = REPO_ROOT / "scripts" / "wikidata_enriched.json"
+FORMAT = 1
+
+_TOKEN = re.compile(r"[^\W_]+")
+_SOUNDEX = str.maketrans("bfpvcgjkqsxzdtlmnr", "111122222222334556")
+
+
+def _fingerprint(path, previous=None):
+    """Size, mtime and SHA-256 of a source file (None if missing). The hash
+    is reused from `previous` when size and mtime are unchanged."""
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    if (previous and previous["size"] == st.st_size
+            and previous["mtime_ns"] == st.st_mtime_ns):
+        return previous
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns,
+            "sha256": hashlib.sha256(path.read_bytes()).hexdigest()}
+
+
+def _sources(recorded=None):
+    recorded = recorded or {}
+    return {"nodes": graph_nodes.source_digest(),
+            "wikidata_enriched": _fingerprint(ENRICHED_FILE, recorded.get("wikidata_enriched"))}
+
+
+def _same(current, recorded):
+    return (current["nodes"] == recorded.get("nodes")
+            and (current["wikidata_enriched"] or {}).get("sha256")
+            == (recorded.get("wikidata_enriched") or {}).get("sha256"))
+
+
+def enriched_aliases(enriched_entry):
+    """Aliases for one wikidata_enriched.json entry: its "aliases" list and
+    Wikidata pseudonyms (P742)."""
+    aliases = list(enriched_entry.get("aliases", []))
+    aliases += enriched_entry.get("properties", {}).get("pseudonym", [])
+    return aliases
+
+
+def soundex(token):
+    """American Soundex of one token (digits are kept as-is)."""
+    token = token.lower()
+    if not token:
+        return ""
+    if not token[0].isalpha():
+        return token
+    codes = token.translate(_SOUNDEX)
+    out = [token[0].upper()]
+    prev = codes[0]
+    for ch, code in zip(token[1:], codes[1:]):
+        if code.isdigit() and code != prev:
+            out.append(code)
+        if ch not in "hw":
+            prev = code
+    return ("".join(out) + "000")[:4]
+
+
+def phonetic_key(name):
+    """Soundex of every token: "jeffrey epstien" -> "J160 E123"."""
+    return " ".join(soundex(t) for t in _TOKEN.findall(name))
+
+
+def build(nodes, enriched):
+    """Index data for graph nodes plus aliases from wikidata_enriched.json."""
+    nodes = sorted(nodes, key=lambda n: n["id"])
+    data = {"format": FORMAT, "ids": [], "names": [], "types": [], "norms": [],
+            "aliases": [], "alias_norms": [], "keys": [], "tokens": {}, "phonetic": {}}
+    for pos, node in enumerate(nodes):
+        name = node["name"]
+        norm = resolve.normalize(name)
+        aliases, alias_norms = [], []
+        for alias in enriched_aliases(enriched.get(node["id"], {})):
+            alias_norm = resolve.normalize(alias)
+            if alias_norm and alias_norm != norm and alias_norm not in alias_norms:
+                aliases.append(alias)
+                alias_norms.append(alias_norm)
+
+        data["ids"].append(node["id"])
+        data["names"].append(name)
+        data["types"].append(node.get("types", []))
+        data["norms"].append(norm)
+        data["aliases"].append(aliases)
+        data["alias_norms"].append(alias_norms)
+        data["keys"].append(phonetic_key(norm))
+        tokens = {t for n in (norm, *alias_norms) for t in n.split()}
+        for token in sorted(tokens):
+            data["tokens"].setdefault(token, []).append(pos)
+        for code in sorted({soundex(t) for t in tokens}):
+            data["phonetic"].setdefault(code, []).append(pos)
+    return data
+
+
+class NameIndex:
+    """Loaded name index. Entities are addressed by id."""
+
+    def __init__(self, data, path=None):
+        self.path = path
+        self.data = data
+        self.ids = data["ids"]
+        self.names = data["names"]
+        self.positions = {eid: pos for pos, eid in enumerate(self.ids)}
+        self.exact = {}
+        for pos, norm in enumerate(data["norms"]):
+            for n in (norm, *data["alias_norms"][pos]):
+                self.exact.setdefault(n, []).append(pos)
+
+    @classmethod
+    def load(cls, path=INDEX_PATH, force=False):
+        """Load the index, rebuilding it first if its sources changed.
+
+        Raises graph_nodes.GraphUnavailable when the nodes can't be loaded.
+        """
+        path = Path(path)
+        if path.exists() and not force:
+            data = json.loads(path.read_text())
+            recorded = data.get("sources", {})
+            current = _sources(recorded)
+            if data.get("format") == FORMAT and _same(current, recorded):
+                if current != recorded:
+                    # touched but unchanged: remember the new mtimes
+                    data["sources"] = current
+                    _write(path, data)
+                return cls(data, path)
+        return cls(rebuild(path), path)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def entities(self):
+        """{id: name} for every entity."""
+        return dict(zip(self.ids, self.names))
+
+    def nodes(self):
+        """[{"id", "name", "types", "aliases"}] in id order."""
+        return [{"id": eid, "name": name, "types": types, "aliases": aliases}
+                for eid, name, types, aliases in zip(self.ids, self.names, self.data["types"],
+                                                     self.data["aliases"])]
+
+    def alias_map(self):
+        """{id: [alias, ...]} for entities that have aliases."""
+        return {eid: aliases for eid, aliases in zip(self.ids, self.data["aliases"]) if aliases}
+
+    def name(self, eid):
+        return self.names[self.positions[eid]]
+
+    def aliases(self, eid):
+        return self.data["aliases"][self.positions[eid]]
+
+    def lookup(self, name):
+        """Ids whose name or an alias normalizes to the same string."""
+        return [self.ids[p] for p in self.exact.get(resolve.normalize(name), [])]
+
+    def by_token(self, token):
+        return [self.ids[p] for p in self.data["tokens"].get(resolve.normalize(token), [])]
+
+    def by_phonetic(self, token):
+        return [self.ids[p] for p in self.data["phonetic"].get(soundex(token), [])]
+
+    def phonetic_key(self, eid):
+        return self.data["keys"][self.positions[eid]]
+
+    def candidates(self, name):
+        """Ids sharing a normalized token or a token's Soundex code with `name`."""
+        found = set()
+        for token in resolve.normalize(name).split():
+            found.update(self.data["tokens"].get(token, ()))
+            found.update(self.data["phonetic"].get(soundex(token), ()))
+        return [self.ids[p] for p in sorted(found)]
+
+
+def _write(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(data, separators=(",", ":"), ensure_ascii=False))
+    os.replace(tmp, path)
+
+
+def rebuild(path=INDEX_PATH):
+    """Build the index from its sources and write it. Returns the data."""
+    sources = _sources()
+    nodes = graph_nodes.load_nodes()
+    enriched = json.loads(ENRICHED_FILE.read_text()) if sources["wikidata_enriched"] else {}
+    data = build(nodes, enriched)
+    data["sources"] = sources
+    _write(Path(path), data)
+    return data
+
+
+def main():
+    force = "--force" in sys.argv
+    start = time.perf_counter()
+    try:
+        index = NameIndex.load(force=force)
+    except graph_nodes.GraphUnavailable as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(1)
+    elapsed = time.perf_counter() - start
+
+    n_aliases = sum(len(a) for a in index.data["aliases"])
+    print(f"{index.path}: {len(index)} entities, {n_aliases} aliases, "
+          f"{len(index.data['tokens'])} tokens, {len(index.data['phonetic'])} phonetic codes "
+          f"({index.path.stat().st_size:,} bytes, loaded in {elapsed * 1000:.1f}ms)")
+
+    if "--show" in sys.argv:
+        idx = sys.argv.index("--show")
+        query = " ".join(sys.argv[idx + 1:])
+        for eid in index.lookup(query):
+            print(f"  exact      {eid:<30} {index.name(eid)}")
+        for eid in index.candidates(query):
+            aliases = ", ".join(index.aliases(eid))
+            print(f"  candidate  {eid:<30} {index.name(eid)}"
+                  f"  [{index.phonetic_key(eid)}]" + (f"  aka {aliases}" if aliases else ""))
+
+
+if __name__ == "__main__":
+    main()
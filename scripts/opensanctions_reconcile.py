@@ -6,26 +6,55 @@ optionally Wikidata ID) and outputs results with matched sanctions entries.
 
 Usage:
   Local:  .venv/bin/python3 scripts/opensanctions_reconcile.py
+              [--batch-size 25] [--concurrency 4] [--full]
   CI:     triggered manually via CI pipeline
 
+Entities are matched in batches: Yente's /match endpoint takes many named
+queries per request (up to its MAX_BATCH, 100 by default), so each POST
+carries --batch-size entities keyed by entity ID, and --concurrency
+batches are in flight at once. --batch-size 1 sends one entity per
+request. A batch that fails is retried one entity at a time.
+
+Only entities that are new or whose name, types, aliases, Wikidata QID or
+schema changed since the last run are matched
+(scripts/reconcile_state/opensanctions_reconcile.json, see incremental.py),
+as are entities whose last query failed. Their results are merged into the
+existing outputs; every other overlay line, REMOVED notes included, is
+kept as is. --full matches every entity and rewrites both outputs;
+--adopt records the current entities against the existing overlay without
+querying. The overlay and the state are committed; the results file is a
+local report, and without it a run reports only the entities it queried.
+
+Offline benchmarking: scripts/mock_api.py serves /match (with
+--match-ms per-query scoring time and --match-workers), e.g.
+  python3 scripts/bench_fetch.py opensanctions_reconcile --n 500
+
 Output:
   scripts/opensanctions_results.json  (detailed match results)
   opensanctions_ids.cue              (CUE overlay with external_ids.opensanctions)
 
-Note: Only matches with score >= 0.7 are included. Rate-limited to 1 req/sec.
+Note: Only matches with score >= 0.7 are included. Rate-limited to 10 req/sec.
 """
 import json
 import sys
 import time
-import urllib.request
-import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+from http_client import HttpClient
+from incremental import ERROR, ReconcileState, alias_map, fingerprint, merge_overlay, overlay_ids
+import resolve
 
 API = "http://localhost:8000/match/default"
 UA = "unify-graph/1.0 (https://github.com/unify-graph/unify-graph; entity reconciliation)"
 MIN_SCORE = 0.7
+DEFAULT_BATCH_SIZE = 25
+MAX_BATCH_SIZE = 100  # yente's default MAX_BATCH
+DEFAULT_CONCURRENCY = 4
+
+HTTP = HttpClient(user_agent=UA, timeout=10, rate_limits={API: 1 / 0.1})  # Local instance: minimal delay
 
 # Paths relative to repo root
 REPO_ROOT = Path(__file__).resolve().parent.parent
@@ -34,6 +63,10 @@ ENTITIES_FILE = SITE_DATA / "entities.json"
 RESULTS_FILE = REPO_ROOT / "scripts" / "opensanctions_results.json"
 CUE_OVERLAY = REPO_ROOT / "opensanctions_ids.cue"
 
+# Entities whose query failed outright (as opposed to finding no match);
+# recorded as errors so the next incremental run retries them
+FAILED = set()
+
 
 def determine_schema(entity: Dict[str, Any]) -> str:
     """Determine OpenSanctions schema based on entity @type.
@@ -56,66 +89,120 @@ def determine_schema(entity: Dict[str, Any]) -> str:
     return "Person"
 
 
-def query_opensanctions(
-    entity_id: str,
-    name: str,
-    wikidata_qid: Optional[str] = None,
-    schema: str = "Person"
-) -> Optional[Dict[str, Any]]:
-    """Query OpenSanctions Yente matching API.
-
-    Tries matching by name and optionally by wikidataId.
-    Returns the best match dict if score >= MIN_SCORE, else None.
-    """
-    # Build query
+def build_query(name: str, wikidata_qid: Optional[str] = None,
+                schema: str = "Person") -> Dict[str, Any]:
+    """One Yente match query: by name and optionally by wikidataId."""
     query: Dict[str, Any] = {
         "schema": schema,
         "properties": {"name": [name]},
     }
-
     if wikidata_qid:
         query["properties"]["wikidataId"] = [wikidata_qid]
+    return query
 
-    payload = json.dumps({"queries": {"q1": query}}).encode("utf-8")
 
-    try:
-        req = urllib.request.Request(
-            API,
-            data=payload,
-            headers={
-                "User-Agent": UA,
-                "Content-Type": "application/json",
-            },
-            method="POST"
-        )
-
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            data = json.loads(resp.read())
-
-        # Extract match results (yente uses "responses" key)
-        results = data.get("responses", data.get("results", {})).get("q1", {}).get("results", [])
-        if results:
-            match = results[0]
-            score = match.get("score", 0.0)
-
-            if score >= MIN_SCORE:
-                return {
-                    "entity_id": entity_id,
-                    "name": name,
-                    "opensanctions_id": match.get("id"),
-                    "datasets": match.get("datasets", []),
-                    "score": score,
-                    "caption": match.get("caption", ""),
-                    "schema": match.get("schema", schema),
-                }
+def pick_match(entity_id: str, name: str, schema: str,
+               results: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """The best result as a match dict if its score >= MIN_SCORE, else None.
 
+    Yente's score decides what qualifies; among qualifying results the
+    caption closest to the name (shared resolver cosine) wins.
+    """
+    qualifying = [r for r in results if r.get("score", 0.0) >= MIN_SCORE]
+    if not qualifying:
         return None
+    idx, _ = resolve.pick(name, [r.get("caption", "") for r in qualifying],
+                          "opensanctions", threshold=0.0)
+    match = qualifying[idx or 0]
+    return {
+        "entity_id": entity_id,
+        "name": name,
+        "opensanctions_id": match.get("id"),
+        "datasets": match.get("datasets", []),
+        "score": match.get("score", 0.0),
+        "caption": match.get("caption", ""),
+        "schema": match.get("schema", schema),
+    }
+
+
+def _responses(data: Dict[str, Any]) -> Dict[str, Any]:
+    # yente uses the "responses" key; older versions used "results"
+    return data.get("responses", data.get("results", {}))
+
+
+def query_opensanctions(
+    entity_id: str,
+    name: str,
+    wikidata_qid: Optional[str] = None,
+    schema: str = "Person"
+) -> Optional[Dict[str, Any]]:
+    """Query OpenSanctions Yente matching API for one entity.
 
+    Returns the best match dict (see pick_match), else None.
+    """
+    try:
+        data = HTTP.post_json(API, {"queries": {"q1": build_query(name, wikidata_qid, schema)}})
+        results = _responses(data).get("q1", {}).get("results", [])
+        return pick_match(entity_id, name, schema, results)
     except Exception as e:
         print(f"  ERROR querying OpenSanctions for {entity_id}: {e}", file=sys.stderr)
+        FAILED.add(entity_id)
         return None
 
 
+Target = Tuple[str, str, Optional[str], str]  # (entity_id, name, wikidata_qid, schema)
+
+
+def query_batch(batch: List[Target]) -> Dict[str, Optional[Dict[str, Any]]]:
+    """Match a batch of entities in one request, keyed by entity ID.
+
+    Falls back to one request per entity if the batch request fails or
+    a query in it comes back with an error status.
+    """
+    queries = {eid: build_query(name, qid, schema) for eid, name, qid, schema in batch}
+    try:
+        responses = _responses(HTTP.post_json(API, {"queries": queries}))
+    except Exception as e:
+        print(f"  Batch of {len(batch)} failed ({e}); querying one at a time", file=sys.stderr)
+        responses = {}
+
+    out = {}
+    for eid, name, qid, schema in batch:
+        response = responses.get(eid)
+        if response is None or response.get("status", 200) != 200:
+            out[eid] = query_opensanctions(eid, name, qid, schema)
+        else:
+            out[eid] = pick_match(eid, name, schema, response.get("results", []))
+    return out
+
+
+def batch_match(targets: List[Target], batch_size: int = DEFAULT_BATCH_SIZE,
+                concurrency: int = DEFAULT_CONCURRENCY, on_batch=None
+                ) -> Dict[str, Optional[Dict[str, Any]]]:
+    """Match all targets, batch_size per request, concurrency requests at once.
+
+    on_batch(results) is called as each batch completes. Returns
+    {entity_id: match dict or None}.
+    """
+    batch_size = max(1, min(MAX_BATCH_SIZE, batch_size))
+    batches = [targets[i:i + batch_size] for i in range(0, len(targets), batch_size)]
+    results: Dict[str, Optional[Dict[str, Any]]] = {}
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        for batch_results in pool.map(query_batch, batches):
+            results.update(batch_results)
+            if on_batch:
+                on_batch(batch_results)
+    return results
+
+
+def _arg(flag, default, cast):
+    if flag in sys.argv:
+        idx = sys.argv.index(flag)
+        if idx + 1 < len(sys.argv):
+            return cast(sys.argv[idx + 1])
+    return default
+
+
 def main():
     # Load entities
     try:
@@ -128,33 +215,80 @@ def main():
         print(f"Error parsing entities JSON: {e}", file=sys.stderr)
         sys.exit(1)
 
-    print(f"Reconciling {len(entities)} entities against OpenSanctions...\n", file=sys.stderr)
-
-    matches: Dict[str, Dict[str, Any]] = {}
-    no_match: List[str] = []
+    batch_size = _arg("--batch-size", DEFAULT_BATCH_SIZE, int)
+    concurrency = _arg("--concurrency", DEFAULT_CONCURRENCY, int)
 
+    aliases = alias_map()
+    targets: List[Target] = []
+    fingerprints: Dict[str, str] = {}
     for entity_id in sorted(entities.keys()):
         entity = entities[entity_id]
-        name = entity["name"]
-
         # Determine schema and extract Wikidata QID if available
         schema = determine_schema(entity)
-        external_ids = entity.get("external_ids", {})
-        wikidata_qid = external_ids.get("wikidata")
-
-        sys.stdout.write(f"  {entity_id}: {name} ({schema}) ... ")
-        sys.stdout.flush()
-
-        # Query API
-        result = query_opensanctions(entity_id, name, wikidata_qid, schema)
-        time.sleep(0.1)  # Local instance: minimal delay
-
-        if result:
-            matches[entity_id] = result
-            print(f"MATCH {result['opensanctions_id']} (score: {result['score']:.2f})", file=sys.stderr)
+        qid = entity.get("external_ids", {}).get("wikidata")
+        targets.append((entity_id, entity["name"], qid, schema))
+        fingerprints[entity_id] = fingerprint(entity["name"], entity.get("@type", {}),
+                                              aliases.get(entity_id, []),
+                                              wikidata=qid, schema=schema)
+
+    state = ReconcileState("opensanctions_reconcile",
+                           full="--full" in sys.argv or not CUE_OVERLAY.exists())
+    if "--adopt" in sys.argv:
+        state.adopt(fingerprints, overlay_ids(CUE_OVERLAY, "opensanctions"))
+        state.save()
+        print(f"Recorded {len(fingerprints)} entities against {CUE_OVERLAY.name} "
+              f"({state.path})", file=sys.stderr)
+        return
+    todo, unchanged, removed = state.plan(fingerprints)
+    todo_set = set(todo)
+    targets = [t for t in targets if t[0] in todo_set]
+
+    print(f"Reconciling {len(targets)} entities against OpenSanctions "
+          f"({batch_size} per request, {concurrency} concurrent)...", file=sys.stderr)
+    if not state.full:
+        print(f"  {len(unchanged)} unchanged since the last run, {len(removed)} removed "
+              f"(--full to match all {len(fingerprints)})", file=sys.stderr)
+    print(file=sys.stderr)
+
+    def report(batch_results):
+        for entity_id, result in sorted(batch_results.items()):
+            if result:
+                print(f"  {entity_id}: MATCH {result['opensanctions_id']} "
+                      f"(score: {result['score']:.2f})", file=sys.stderr)
+            else:
+                print(f"  {entity_id}: no match", file=sys.stderr)
+
+    start = time.perf_counter()
+    results = batch_match(targets, batch_size, concurrency, on_batch=report)
+    elapsed = time.perf_counter() - start
+
+    for entity_id, result in results.items():
+        if entity_id in FAILED:
+            state.record(entity_id, fingerprints[entity_id], ERROR)
+        elif result:
+            state.record(entity_id, fingerprints[entity_id], "ok", result["opensanctions_id"])
         else:
-            no_match.append(entity_id)
-            print("no match", file=sys.stderr)
+            state.record(entity_id, fingerprints[entity_id], "no_match")
+    state.forget(removed)
+    # A failed query leaves the entity's previous result in place
+    results = {eid: r for eid, r in results.items() if eid not in FAILED}
+
+    matches: Dict[str, Dict[str, Any]] = {eid: r for eid, r in sorted(results.items()) if r}
+    no_match: List[str] = sorted(eid for eid, r in results.items() if not r)
+    print(f"\n{len(targets)} entities in {elapsed:.1f}s "
+          f"({len(targets) / elapsed if elapsed else 0:.0f}/s)", file=sys.stderr)
+    print(resolve.summary(), file=sys.stderr)
+    if FAILED:
+        print(f"{len(FAILED)} queries failed; rerun to retry them", file=sys.stderr)
+
+    if not state.full:
+        # Merge into the previous results; unchanged entities keep theirs
+        previous = json.loads(RESULTS_FILE.read_text()) if RESULTS_FILE.exists() else {}
+        stale = set(results) | set(removed)
+        matches = dict(sorted({**{eid: r for eid, r in previous.get("matches", {}).items()
+                                  if eid not in stale}, **matches}.items()))
+        no_match = sorted({eid for eid in previous.get("no_match", []) if eid not in stale}
+                          | set(no_match))
 
     # Write results JSON
     timestamp = datetime.now(timezone.utc).isoformat()
@@ -167,21 +301,28 @@ def main():
     with open(RESULTS_FILE, "w") as f:
         json.dump(results_data, f, indent=2)
 
-    # Write CUE overlay
-    with open(CUE_OVERLAY, "w") as f:
-        f.write("// External identifiers — OpenSanctions IDs for entity reconciliation.\n")
-        f.write("// Auto-generated by scripts/opensanctions_reconcile.py\n")
-        f.write("// Reviewed and disambiguated manually. Run reconcile script to refresh.\n")
-        f.write("//\n")
-        f.write(f"// {len(matches)} entities matched, {len(no_match)} with no match\n")
-        f.write("package creeps\n\n")
-        f.write("entities: {\n")
-
-        for entity_id in sorted(matches.keys()):
-            os_id = matches[entity_id]["opensanctions_id"]
-            f.write(f'\t{entity_id}: external_ids: opensanctions: "{os_id}"\n')
-
-        f.write("}\n")
+    if not state.full:
+        merge_overlay(CUE_OVERLAY, "opensanctions",
+                      {eid: r["opensanctions_id"] if r else None for eid, r in results.items()},
+                      drop=removed)
+    else:
+        # Write CUE overlay
+        with open(CUE_OVERLAY, "w") as f:
+            f.write("// External identifiers — OpenSanctions IDs for entity reconciliation.\n")
+            f.write("// Auto-generated by scripts/opensanctions_reconcile.py\n")
+            f.write("// Reviewed and disambiguated manually. Run reconcile script to refresh.\n")
+            f.write("//\n")
+            f.write(f"// {len(matches)} entities matched, {len(no_match)} with no match\n")
+            f.write("@if(!compact_ids)\n\n")
+            f.write("package creeps\n\n")
+            f.write("entities: {\n")
+
+            for entity_id in sorted(matches.keys()):
+                os_id = matches[entity_id]["opensanctions_id"]
+                f.write(f'\t{entity_id}: external_ids: opensanctions: "{os_id}"\n')
+
+            f.write("}\n")
+    state.save()
 
     # Print summary
     print(f"\nDone: {len(matches)} matched, {len(no_match)} no match", file=sys.stderr)
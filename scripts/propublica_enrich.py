@@ -7,7 +7,19 @@ entity graph.
 
 Usage:
   Local:  .venv/bin/python3 scripts/propublica_enrich.py
-          python3 scripts/propublica_enrich.py
+          python3 scripts/propublica_enrich.py [--resume] [--full]
+
+Only foundations that are new or whose name, types, aliases or known EIN
+changed since the last run are queried
+(scripts/reconcile_state/propublica_enrich.json, see incremental.py), and
+their results are merged into the existing output. --full queries every
+foundation; --adopt records the current foundations against the existing
+output without querying.
+
+Each foundation's outcome is appended to
+.cache/checkpoints/propublica_enrich.jsonl as soon as it is known;
+--resume skips foundations already done. The output file is written from
+the checkpoint at the end of the run.
 
 ProPublica API docs:
   https://projects.propublica.org/nonprofits/api
@@ -15,11 +27,13 @@ ProPublica API docs:
 No authentication required. Be polite (0.5s between requests).
 """
 import json
+import os
 import sys
-import time
-import urllib.error
-import urllib.request
-import urllib.parse
+
+from checkpoint import Checkpoint
+from http_client import HTTPError, HttpClient, RequestError
+from incremental import ReconcileState, alias_map, fingerprint
+import resolve
 
 SEARCH_API = "https://projects.propublica.org/nonprofits/api/v2/search.json"
 ORG_API = "https://projects.propublica.org/nonprofits/api/v2/organizations/{ein}.json"
@@ -41,36 +55,30 @@ EXTRA_SEARCHES = {
     "couq_foundation": "COUQ Foundation",
 }
 
-# Generic org-type words that should not count toward name matching
-STOP_WORDS = {
-    "foundation", "inc", "incorporated", "ltd", "limited", "corp",
-    "corporation", "trust", "fund", "the", "of", "and", "for",
-    "project", "institute", "organization", "association", "society",
-}
+
+HTTP = HttpClient(user_agent=UA, rate_limits={SEARCH_API: 1 / 0.5})  # Be polite
+
+OUTPUT_PATH = "scripts/propublica_enriched.json"
 
 
-def api_get(url):
-    """GET a JSON endpoint, return parsed dict or None on error."""
+def api_get(url, params=None):
+    """GET a JSON endpoint, return parsed dict or None if not found.
+
+    Other failures (retries exhausted, 5xx, bad JSON) raise RequestError or
+    ValueError, so the caller can record them as errors to retry.
+    """
     try:
-        req = urllib.request.Request(url, headers={"User-Agent": UA})
-        with urllib.request.urlopen(req, timeout=15) as resp:
-            return json.loads(resp.read())
-    except urllib.error.HTTPError as e:
+        return HTTP.get_json(url, params)
+    except HTTPError as e:
         if e.code == 404:
             # ProPublica returns 404 for empty search results
             return None
-        print(f"  ERROR: HTTP {e.code}: {e.reason}", file=sys.stderr)
-        return None
-    except Exception as e:
-        print(f"  ERROR: {e}", file=sys.stderr)
-        return None
+        raise
 
 
 def search_nonprofit(name):
     """Search ProPublica for nonprofits matching name."""
-    params = urllib.parse.urlencode({"q": name})
-    url = f"{SEARCH_API}?{params}"
-    data = api_get(url)
+    data = api_get(SEARCH_API, {"q": name})
     if data and "organizations" in data:
         return data["organizations"]
     return []
@@ -104,26 +112,13 @@ def get_org_detail(ein):
     return None
 
 
-def name_similarity(search_name, result_name):
-    """Score how well a search name matches a result name.
+def pick_best(results, name):
+    """Pick the best match from search results by name similarity.
 
-    Returns (total_score, substantive_matches) where substantive_matches
-    counts non-stop-word matches. This prevents "COUQ Foundation" from
-    matching "De La Cour Family Foundation" on just "Foundation".
+    Generic org words (resolve.ORG_STOP_WORDS) are dropped before scoring,
+    so "COUQ Foundation" can't match "De La Cour Family Foundation" on
+    "Foundation" alone.
     """
-    a = set(w.lower() for w in search_name.split())
-    b = set(w.lower() for w in result_name.split())
-    if not a or not b:
-        return 0.0, 0
-
-    common = a & b
-    substantive = common - STOP_WORDS
-    score = len(common) / len(a)
-    return score, len(substantive)
-
-
-def pick_best(results, name):
-    """Pick the best match from search results by name similarity."""
     if not results:
         return None
     name_lower = name.lower()
@@ -133,20 +128,59 @@ def pick_best(results, name):
         if r.get("name", "").lower() == name_lower:
             return r
 
-    # Score by word overlap; require at least one substantive word match
-    scored = []
-    for r in results:
-        rname = r.get("name", "")
-        score, substantive = name_similarity(name, rname)
-        if score >= 0.5 and substantive >= 1:
-            scored.append((score, substantive, r))
+    idx, _ = resolve.pick(name, [r.get("name", "") for r in results], "propublica",
+                          stop_words=resolve.ORG_STOP_WORDS)
+    return None if idx is None else results[idx]
 
-    if scored:
-        scored.sort(key=lambda x: (x[0], x[1]), reverse=True)
-        return scored[0][2]
 
-    # No good match found
-    return None
+def enrich_one(checkpoint, key, name):
+    """Look up one foundation and record its outcome in the checkpoint.
+
+    Raises RequestError/ValueError on a transient failure; the caller
+    records those as errors.
+    """
+    # If we have a known EIN, go straight to detail
+    if key in KNOWN_EINS:
+        ein = KNOWN_EINS[key]
+        sys.stdout.write(f"(known EIN {ein}) ")
+        sys.stdout.flush()
+        detail = get_org_detail(ein)
+        if detail:
+            checkpoint.record(key, "ok", detail)
+            rev = detail.get("total_revenue")
+            rev_str = f"${rev:,.0f}" if rev else "N/A"
+            print(f"OK -- revenue: {rev_str}")
+        else:
+            checkpoint.record(key, "not_found")
+            print("DETAIL NOT FOUND")
+        return
+
+    # Otherwise search first
+    hits = search_nonprofit(name)
+
+    best = pick_best(hits, name)
+    if not best:
+        checkpoint.record(key, "not_found")
+        print("NOT FOUND")
+        return
+
+    ein = str(best.get("ein", ""))
+    org_name = best.get("name", "")
+    sys.stdout.write(f"-> {org_name} (EIN {ein}) ... ")
+    sys.stdout.flush()
+
+    # Get detailed filing data
+    detail = get_org_detail(ein)
+
+    if detail:
+        checkpoint.record(key, "ok", detail)
+        rev = detail.get("total_revenue")
+        rev_str = f"${rev:,.0f}" if rev else "N/A"
+        n_filings = len(detail.get("filings", []))
+        print(f"OK -- revenue: {rev_str}, {n_filings} filings")
+    else:
+        checkpoint.record(key, "not_found")
+        print("DETAIL NOT FOUND")
 
 
 def main():
@@ -171,69 +205,87 @@ def main():
         if key not in targets:
             targets[key] = name
 
-    print(f"Enriching {len(targets)} foundations via ProPublica Nonprofit Explorer...\n")
-
-    results = {}
-    not_found = []
-
-    for key, name in sorted(targets.items()):
+    aliases = alias_map()
+    fingerprints = {key: fingerprint(name, entities.get(key, {}).get("@type", {}),
+                                     aliases.get(key, []), ein=KNOWN_EINS.get(key))
+                    for key, name in targets.items()}
+    state = ReconcileState("propublica_enrich",
+                           full="--full" in sys.argv or not os.path.exists(OUTPUT_PATH))
+    if "--adopt" in sys.argv:
+        with open(OUTPUT_PATH) as f:
+            current = {key: str(org["ein"]) for key, org in json.load(f).items()}
+        state.adopt(fingerprints, current)
+        state.save()
+        print(f"Recorded {len(fingerprints)} foundations against {OUTPUT_PATH} ({state.path})")
+        return
+    todo, unchanged, removed = state.plan(fingerprints)
+
+    print(f"Enriching {len(todo)} foundations via ProPublica Nonprofit Explorer...")
+    if not state.full:
+        print(f"  {len(unchanged)} unchanged since the last run, {len(removed)} removed "
+              f"(--full to query all {len(targets)})")
+    print()
+
+    checkpoint = Checkpoint("propublica_enrich", resume="--resume" in sys.argv)
+    if checkpoint.resumed:
+        print(f"  resuming: {checkpoint.resumed} already done\n")
+
+    for key in todo:
+        name = targets[key]
+        if checkpoint.is_done(key):
+            continue
         sys.stdout.write(f"  {key}: {name} ... ")
         sys.stdout.flush()
-
-        # If we have a known EIN, go straight to detail
-        if key in KNOWN_EINS:
-            ein = KNOWN_EINS[key]
-            sys.stdout.write(f"(known EIN {ein}) ")
-            sys.stdout.flush()
-            detail = get_org_detail(ein)
-            time.sleep(0.5)
-            if detail:
-                results[key] = detail
-                rev = detail.get("total_revenue")
-                rev_str = f"${rev:,.0f}" if rev else "N/A"
-                print(f"OK -- revenue: {rev_str}")
-            else:
-                not_found.append(key)
-                print("DETAIL FAILED")
-            continue
-
-        # Otherwise search first
-        hits = search_nonprofit(name)
-        time.sleep(0.5)
-
-        best = pick_best(hits, name)
-        if not best:
-            not_found.append(key)
-            print("NOT FOUND")
+        try:
+            enrich_one(checkpoint, key, name)
+        except (RequestError, ValueError) as e:
+            # Transient: recorded as an error so --resume and the next run retry it
+            checkpoint.record(key, "error", str(e))
+            print(f"ERROR: {e}")
+
+    # Compact the checkpoint into the output file
+    results = {}
+    not_found = []
+    errors = []
+    for key, (status, detail) in sorted(checkpoint.load().items()):
+        if key not in targets:
             continue
-
-        ein = str(best.get("ein", ""))
-        org_name = best.get("name", "")
-        sys.stdout.write(f"-> {org_name} (EIN {ein}) ... ")
-        sys.stdout.flush()
-
-        # Get detailed filing data
-        detail = get_org_detail(ein)
-        time.sleep(0.5)
-
-        if detail:
+        state.record(key, fingerprints[key], status,
+                     str(detail.get("ein", "")) if status == "ok" else None)
+        if status == "ok":
             results[key] = detail
-            rev = detail.get("total_revenue")
-            rev_str = f"${rev:,.0f}" if rev else "N/A"
-            n_filings = len(detail.get("filings", []))
-            print(f"OK -- revenue: {rev_str}, {n_filings} filings")
+        elif status == "error":
+            errors.append(key)
         else:
             not_found.append(key)
-            print("DETAIL FAILED")
-
-    # Write output
-    outpath = "scripts/propublica_enriched.json"
+    state.forget(removed)
+
+    previous = {}
+    if os.path.exists(OUTPUT_PATH):
+        with open(OUTPUT_PATH) as f:
+            previous = json.load(f)
+    if not state.full:
+        # Merge into the previous output; unchanged foundations keep theirs
+        for key in not_found + removed:
+            previous.pop(key, None)
+        results = dict(sorted({**previous, **results}.items()))
+    else:
+        # A foundation whose lookup failed keeps its previous entry
+        results.update({key: previous[key] for key in errors if key in previous})
+        results = dict(sorted(results.items()))
+
+    outpath = OUTPUT_PATH
     with open(outpath, "w") as f:
         json.dump(results, f, indent=2)
+    checkpoint.remove()
+    state.save()
 
-    print(f"\nDone: {len(results)} enriched, {len(not_found)} not found")
+    print(f"\nDone: {len(results)} enriched, {len(not_found)} not found, {len(errors)} errors")
+    print(resolve.summary())
     if not_found:
         print(f"Not found: {', '.join(not_found)}")
+    if errors:
+        print(f"Errors (retried with --resume or on the next run): {', '.join(errors)}")
     print(f"\nOutput: {outpath}")
 
     # Summary table
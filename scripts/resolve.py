@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""Shared entity-resolution engine for the reconcilers.
+
+Every reconciler used to carry its own name normalization and scalar
+similarity loop (difflib ratios, word overlap). They now all go through
+Resolver:
+
+  - names are normalized the same way everywhere (normalize(): accents
+    folded, punctuation dropped, whitespace collapsed, optional per-source
+    stop words removed)
+  - both sides become character trigram TF-IDF vectors (sublinear tf,
+    smoothed idf fitted on the candidate side, L2-normalized) held in
+    scipy.sparse CSR matrices
+  - one sparse product queries x candidates.T gives every cosine score at
+    once; the top k per query come from k vectorized per-row max passes
+    over the product's nonzeros
+  - a per-source cosine threshold (SOURCE_THRESHOLDS) decides what counts
+    as a match
+
+Only pairs that share a trigram get a nonzero in the product, so it
+needs no separate candidate-blocking pass: a pair sharing none would
+score 0 anyway, and every pair that could score is scored exactly.
+
+Queries go through in chunks so the product stays within memory for
+large registries. Resolver timings accumulate in STATS; scripts print
+summary() to report batch throughput.
+
+Usage:
+  from resolve import Resolver, pick
+
+  resolver = Resolver(registry_names, source="rhowardstone")
+  for idx, score in resolver.best(local_names):
+      ...                               # idx is None below the threshold
+  resolver.top_k(local_names, k=5)      # [[(idx, score), ...], ...]
+
+  idx, score = pick(name, [r["name"] for r in results], "littlesis")
+
+  python3 scripts/resolve.py --bench 100000     # batch throughput on synthetic names
+
+Requires numpy and scipy (requirements.txt).
+"""
+import argparse
+import math
+import re
+import time
+import unicodedata
+
+import numpy as np
+from scipy import sparse
+
+NGRAM = 3
+CHUNK_ROWS = 512
+
+# Cosine thresholds on trigram TF-IDF vectors. On person names 0.75 passes
+# a typo or transposition ("Epstien"), a dropped middle initial and swapped
+# word order, and keeps out relatives and namesakes ("Mark Epstein",
+# "Hillary Clinton"); it finds more than difflib's 0.85 ratio did for about
+# as many false matches. ProPublica compares organization names without
+# ORG_STOP_WORDS, and its search hits often add a word ("Wexner Family
+# Foundation"), so it accepts less.
+DEFAULT_THRESHOLD = 0.75
+SOURCE_THRESHOLDS = {
+    "wikidata": 0.9,          # below this, keep Wikidata's own ranking
+    "littlesis": 0.75,
+    "propublica": 0.5,
+    "rhowardstone": 0.75,
+    "epstein_exposed": 0.75,
+    "epstein_archive": 0.75,
+}
+
+# Generic organization words that say nothing about which organization it is
+ORG_STOP_WORDS = frozenset({
+    "foundation", "inc", "incorporated", "ltd", "limited", "corp",
+    "corporation", "trust", "fund", "the", "of", "and", "for",
+    "project", "institute", "organization", "association", "society",
+})
+
+_NON_WORD = re.compile(r"[^\w]+|_")
+
+STATS = {"batches": 0, "queries": 0, "candidates": 0, "seconds": 0.0}
+
+
+def normalize(name, stop_words=()):
+    """Lowercase, fold accents, drop punctuation, collapse whitespace."""
+    name = unicodedata.normalize("NFKD", name)
+    name = "".join(ch for ch in name if not unicodedata.combining(ch))
+    tokens = _NON_WORD.sub(" ", name.lower()).split()
+    if stop_words:
+        tokens = [t for t in tokens if t not in stop_words]
+    return " ".join(tokens)
+
+
+def ngrams(norm, n=NGRAM):
+    """Character n-grams of each token, padded with a space either side.
+    Grams never span tokens, so word order and an extra middle initial
+    cost little."""
+    grams = []
+    for token in norm.split():
+        padded = f" {token} "
+        grams.extend(padded[i:i + n] for i in range(max(1, len(padded) - n + 1)))
+    return grams
+
+
+def threshold_for(source):
+    return SOURCE_THRESHOLDS.get(source, DEFAULT_THRESHOLD)
+
+
+class Resolver:
+    """Trigram TF-IDF cosine matching of query names against candidate names."""
+
+    def __init__(self, candidates, source=None, threshold=None, stop_words=()):
+        self.candidates = list(candidates)
+        self.source = source
+        self.threshold = threshold_for(source) if threshold is None else threshold
+        self.stop_words = frozenset(stop_words)
+
+        grams = [ngrams(normalize(c, self.stop_words)) for c in self.candidates]
+        self.vocab = {}
+        for gs in grams:
+            for g in gs:
+                self.vocab.setdefault(g, len(self.vocab))
+        rows, cols = self._coo(grams)
+        df = np.bincount(np.unique(np.stack([rows, cols]), axis=1)[1]
+                         if len(cols) else cols, minlength=len(self.vocab))
+        n_docs = len(self.candidates)
+        self.idf = np.log((1 + n_docs) / (1 + df)) + 1
+        # A query gram no candidate has still lengthens the query vector,
+        # but at the lowest idf: such grams are mostly typos, and weighing
+        # them as the rarest grams of all would sink every misspelled name
+        self.unseen_idf = 1.0
+        self.matrix = self._weigh(rows, cols, len(self.candidates), grams)
+
+    def _coo(self, grams):
+        rows = np.repeat(np.arange(len(grams)), [len(gs) for gs in grams])
+        cols = np.fromiter((self.vocab.get(g, -1) for gs in grams for g in gs),
+                           dtype=np.int64, count=len(rows))
+        return rows, cols
+
+    def _weigh(self, rows, cols, n_rows, grams):
+        """L2-normalized sublinear TF-IDF rows. Grams outside the vocabulary
+        count toward a row's norm (at unseen_idf) but not its vector."""
+        known = cols >= 0
+        counts = sparse.coo_matrix((np.ones(known.sum()), (rows[known], cols[known])),
+                                   shape=(n_rows, len(self.vocab))).tocsr()
+        counts.sum_duplicates()
+        counts.data = (1 + np.log(counts.data)) * self.idf[counts.indices]
+
+        unseen = np.zeros(n_rows)
+        if not known.all():
+            for i, gs in enumerate(grams):
+                missing = {}
+                for g in gs:
+                    if g not in self.vocab:
+                        missing[g] = missing.get(g, 0) + 1
+                unseen[i] = sum(((1 + math.log(c)) * self.unseen_idf) ** 2
+                                for c in missing.values())
+        norms = np.sqrt(np.asarray(counts.multiply(counts).sum(axis=1)).ravel() + unseen)
+        norms[norms == 0] = 1
+        return sparse.diags(1 / norms) @ counts
+
+    def vectors(self, names):
+        grams = [ngrams(normalize(n, self.stop_words)) for n in names]
+        rows, cols = self._coo(grams)
+        return self._weigh(rows, cols, len(grams), grams)
+
+    def top_k(self, queries, k=5, min_score=0.0):
+        """Best k (candidate index, cosine) per query, highest first; ties
+        go to the lower index."""
+        queries = list(queries)
+        start = time.perf_counter()
+        out = []
+        target = self.matrix.T.tocsr()
+        for lo in range(0, len(queries), CHUNK_ROWS):
+            chunk = self.vectors(queries[lo:lo + CHUNK_ROWS])
+            scores = (chunk @ target).tocsr()
+            scores.eliminate_zeros()
+            out.extend(_row_top_k(scores, k, min_score))
+            STATS["batches"] += 1
+        STATS["queries"] += len(queries)
+        STATS["candidates"] += len(self.candidates) if queries else 0
+        STATS["seconds"] += time.perf_counter() - start
+        return out
+
+    def best(self, queries, threshold=None):
+        """(candidate index, cosine) per query, or (None, best cosine) when
+        nothing reaches the threshold."""
+        threshold = self.threshold if threshold is None else threshold
+        results = []
+        for top in self.top_k(queries, k=1):
+            if top and top[0][1] >= threshold - 1e-9:
+                results.append(top[0])
+            else:
+                results.append((None, top[0][1] if top else 0.0))
+        return results
+
+
+def _row_top_k(scores, k, min_score):
+    """Per row of a CSR score matrix, the k largest (col, value), ties to
+    the lower col. Takes k passes of a per-row max over the nonzeros
+    rather than sorting them."""
+    n_rows = scores.shape[0]
+    counts = np.diff(scores.indptr)
+    filled = np.flatnonzero(counts)
+    out = [[] for _ in range(n_rows)]
+    if not len(filled):
+        return out
+    data = np.where(scores.data >= min_score, scores.data, -1.0)
+    owner = np.repeat(np.arange(len(filled)), counts[filled])
+    starts = scores.indptr[filled]
+    no_col = np.iinfo(scores.indices.dtype).max
+    for _ in range(k):
+        best = np.maximum.reduceat(data, starts)
+        tied = (data == best[owner]) & (data >= 0)
+        col = np.minimum.reduceat(np.where(tied, scores.indices, no_col), starts)
+        first = np.flatnonzero(tied & (scores.indices == col[owner]))
+        if not len(first):
+            break
+        for r, c, v in zip(filled[owner[first]].tolist(), scores.indices[first].tolist(),
+                           np.minimum(data[first], 1.0).tolist()):
+            out[r].append((c, v))
+        data[first] = -1.0
+    return out
+
+
+def pick(name, options, source, threshold=None, stop_words=()):
+    """Best of `options` for one name: (index, cosine), or (None, best cosine)."""
+    if not options:
+        return None, 0.0
+    resolver = Resolver(options, source=source, threshold=threshold, stop_words=stop_words)
+    return resolver.best([name])[0]
+
+
+def summary():
+    """One-line batch throughput report for everything resolved so far."""
+    if not STATS["queries"]:
+        return "resolver: no names resolved"
+    rate = STATS["queries"] / STATS["seconds"] if STATS["seconds"] else float("inf")
+    return (f"resolver: {STATS['queries']:,} names in {STATS['batches']} batches, "
+            f"{STATS['seconds'] * 1000:.0f}ms ({rate:,.0f} names/s)")
+
+
+# ── benchmark data ─────────────────────────────────────────────
+
+def _synthetic_names(n, rng):
+    first = ["james", "mary", "robert", "patricia", "john", "jennifer", "michael", "linda",
+             "david", "elizabeth", "william", "barbara", "richard", "susan", "joseph",
+             "jessica", "thomas", "sarah", "charles", "karen", "ghislaine", "leon", "glenn"]
+    syllables = ["ab", "an", "ber", "ca", "del", "er", "fo", "gan", "har", "in", "jo", "ka",
+                 "lo", "man", "ne", "or", "pe", "qui", "ro", "sen", "ter", "u", "vi", "wex"]
+    names = set()
+    while len(names) < n:
+        last = "".join(rng.choice(syllables) for _ in range(rng.randint(2, 4)))
+        middle = f" {rng.choice('abcdefghjklmnprstw')}." if rng.random() < 0.2 else ""
+        names.add(f"{rng.choice(first)}{middle} {last}")
+    return sorted(names)
+
+
+def _typo(name, rng):
+    chars = list(name)
+    for _ in range(rng.randint(1, 2)):
+        i = rng.randrange(len(chars))
+        op = rng.random()
+        if op < 0.4:
+            chars[i] = rng.choice("abcdefghijklmnopqrstuvwxyz")
+        elif op < 0.7 and len(chars) > 4:
+            del chars[i]
+        else:
+            chars.insert(i, rng.choice("abcdefghijklmnopqrstuvwxyz"))
+    return "".join(chars)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resolver batch throughput benchmark")
+    parser.add_argument("--bench", type=int, default=100_000, help="Synthetic registry size")
+    parser.add_argument("--queries", type=int, default=5_000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    import random
+    rng = random.Random(args.seed)
+    names = _synthetic_names(args.bench, rng)
+    truth = [rng.randrange(len(names)) for _ in range(args.queries)]
+    queries = [_typo(names[i], rng) for i in truth]
+
+    start = time.perf_counter()
+    resolver = Resolver(names)
+    print(f"Vectorized {len(names):,} candidates ({len(resolver.vocab):,} trigrams, "
+          f"{resolver.matrix.nnz:,} nonzeros) in {time.perf_counter() - start:.2f}s")
+    start = time.perf_counter()
+    best = resolver.best(queries)
+    elapsed = time.perf_counter() - start
+    hit = sum(1 for (idx, _), t in zip(best, truth) if idx is not None and
+              normalize(names[idx]) == normalize(names[t]))
+    matched = sum(1 for idx, _ in best if idx is not None)
+    print(f"Resolved {len(queries):,} typo'd names in {elapsed:.2f}s "
+          f"({len(queries) / elapsed:,.0f} names/s)")
+    print(f"  {matched:,} above {resolver.threshold}, {hit:,} to the name they came from")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""Persistent SQLite cache for external API responses.
+
+Used by HttpClient (scripts/http_client.py) so that rerunning a sweep or
+enrichment script — e.g. just to change output formatting — replays
+stored responses instead of re-issuing every request and waiting out the
+rate limits.
+
+  - keyed by method, normalized URL (sorted query params) and body hash
+  - per-source TTLs, where the source is the request's host
+  - size-bounded LRU eviction (least recently read entries go first)
+  - offline mode: serve only from cache, expired entries included, and
+    fail on a miss instead of touching the network
+  - hit/miss counts per source, kept per run and accumulated on disk
+
+Environment:
+  UNIFY_OFFLINE=1    serve only from cache (same as the scripts' --offline)
+  UNIFY_NO_CACHE=1   bypass the cache entirely
+  UNIFY_MOCK_URL     requests go to a mock server (scripts/mock_api.py);
+                     the cache is bypassed so mock data never lands in it
+
+Usage:
+  python3 scripts/response_cache.py            # show cache stats
+  python3 scripts/response_cache.py --prune    # drop expired entries
+  python3 scripts/response_cache.py --clear [SOURCE]
+"""
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import urllib.parse
+import zlib
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_PATH = REPO_ROOT / ".cache" / "http_cache.sqlite"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+DAY = 24 * 3600
+DEFAULT_TTL = 7 * DAY
+# Per-source TTLs (seconds). Search indexes change as documents are added;
+# registry and filing data moves slowly.
+SOURCE_TTLS = {
+    "analytics.dugganusa.com": 3 * DAY,
+    "query.wikidata.org": 30 * DAY,
+    "www.wikidata.org": 30 * DAY,
+    "littlesis.org": 30 * DAY,
+    "projects.propublica.org": 90 * DAY,
+    "epsteinexposed.com": 7 * DAY,
+    "www.epsteininvestigation.org": 7 * DAY,
+    "raw.githubusercontent.com": 7 * DAY,
+    "localhost": 1 * DAY,
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key         TEXT PRIMARY KEY,
+    source      TEXT NOT NULL,
+    method      TEXT NOT NULL,
+    url         TEXT NOT NULL,
+    status      INTEGER NOT NULL,
+    headers     TEXT NOT NULL,
+    body        BLOB NOT NULL,
+    size        INTEGER NOT NULL,
+    fetched_at  REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_lru ON responses (last_access);
+CREATE TABLE IF NOT EXISTS stats (
+    source  TEXT PRIMARY KEY,
+    hits    INTEGER NOT NULL DEFAULT 0,
+    misses  INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+class CacheMiss(Exception):
+    """Raised in offline mode when a request has no cached response."""
+
+
+def normalize_url(url):
+    """Lowercase scheme/host, drop fragments and sort query parameters."""
+    parts = urllib.parse.urlsplit(url)
+    query = urllib.parse.urlencode(sorted(urllib.parse.parse_qsl(parts.query,
+                                                                 keep_blank_values=True)))
+    return urllib.parse.urlunsplit((parts.scheme.lower(), parts.netloc.lower(),
+                                    parts.path or "/", query, ""))
+
+
+def _body_digest(body):
+    if not body:
+        return ""
+    try:
+        # JSON bodies hash the same regardless of key order.
+        body = json.dumps(json.loads(body), sort_keys=True).encode()
+    except (ValueError, UnicodeDecodeError):
+        pass
+    return hashlib.sha256(body).hexdigest()
+
+
+def cache_key(method, url, body=None):
+    raw = f"{method.upper()} {normalize_url(url)} {_body_digest(body)}"
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class ResponseCache:
+    """SQLite-backed response cache. Safe to share across threads."""
+
+    def __init__(self, path=DEFAULT_PATH, max_bytes=DEFAULT_MAX_BYTES,
+                 ttls=None, offline=None, enabled=None):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.ttls = {**SOURCE_TTLS, **(ttls or {})}
+        self.offline = (os.environ.get("UNIFY_OFFLINE") == "1"
+                        if offline is None else offline)
+        if enabled is None:
+            enabled = (os.environ.get("UNIFY_NO_CACHE") != "1"
+                       and not os.environ.get("UNIFY_MOCK_URL"))
+        self.enabled = enabled
+        self.hits = {}
+        self.misses = {}
+        self._db = None
+        self._lock = threading.Lock()
+
+    def _conn(self):
+        if self._db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(SCHEMA)
+        return self._db
+
+    def ttl(self, source):
+        return self.ttls.get(source, DEFAULT_TTL)
+
+    def get(self, source, method, url, body=None):
+        """Return (status, headers, body) for a fresh entry, or None.
+
+        In offline mode expired entries are served too, and a miss raises
+        CacheMiss.
+        """
+        if not self.enabled:
+            return None
+        key = cache_key(method, url, body)
+        now = time.time()
+        with self._lock:
+            db = self._conn()
+            row = db.execute(
+                "SELECT status, headers, body, fetched_at FROM responses WHERE key = ?",
+                (key,)).fetchone()
+            fresh = row is not None and (self.offline or now - row[3] <= self.ttl(source))
+            if fresh:
+                db.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self._count(db, source, hit=fresh)
+            db.commit()
+
+        if fresh:
+            status, headers, blob, _ = row
+            return status, json.loads(headers), zlib.decompress(blob)
+        if self.offline:
+            raise CacheMiss(f"offline: no cached response for {method} {url}")
+        return None
+
+    def put(self, source, method, url, body, status, headers, payload):
+        """Store a response and evict least recently used entries if over budget."""
+        if not self.enabled:
+            return
+        key = cache_key(method, url, body)
+        blob = zlib.compress(payload)
+        now = time.time()
+        with self._lock:
+            db = self._conn()
+            db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, source, method.upper(), normalize_url(url), status,
+                 json.dumps(headers), blob, len(blob), now, now))
+            self._evict(db)
+            db.commit()
+
+    def _count(self, db, source, hit):
+        counter = self.hits if hit else self.misses
+        counter[source] = counter.get(source, 0) + 1
+        column = "hits" if hit else "misses"
+        db.execute("INSERT OR IGNORE INTO stats (source) VALUES (?)", (source,))
+        db.execute(f"UPDATE stats SET {column} = {column} + 1 WHERE source = ?", (source,))
+
+    def _evict(self, db):
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        target = int(self.max_bytes * 0.9)
+        doomed = []
+        for key, size in db.execute("SELECT key, size FROM responses ORDER BY last_access"):
+            if total <= target:
+                break
+            doomed.append((key,))
+            total -= size
+        db.executemany("DELETE FROM responses WHERE key = ?", doomed)
+
+    def prune(self):
+        """Delete expired entries. Returns the number removed."""
+        now = time.time()
+        with self._lock:
+            db = self._conn()
+            rows = db.execute("SELECT key, source, fetched_at FROM responses").fetchall()
+            doomed = [(k,) for k, src, at in rows if now - at > self.ttl(src)]
+            db.executemany("DELETE FROM responses WHERE key = ?", doomed)
+            db.commit()
+        return len(doomed)
+
+    def clear(self, source=None):
+        with self._lock:
+            db = self._conn()
+            if source:
+                db.execute("DELETE FROM responses WHERE source = ?", (source,))
+            else:
+                db.execute("DELETE FROM responses")
+            db.commit()
+
+    def summary(self):
+        """One-line hit/miss summary for this run."""
+        hits = sum(self.hits.values())
+        misses = sum(self.misses.values())
+        total = hits + misses
+        if not total:
+            return "HTTP cache: no lookups"
+        mode = ", offline" if self.offline else ""
+        return (f"HTTP cache: {hits} hits, {misses} misses "
+                f"({hits / total:.0%} hit rate{mode})")
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect the HTTP response cache")
+    parser.add_argument("--prune", action="store_true", help="Drop expired entries")
+    parser.add_argument("--clear", nargs="?", const="", metavar="SOURCE",
+                        help="Delete all entries (or only those for SOURCE)")
+    parser.add_argument("--path", default=str(DEFAULT_PATH))
+    args = parser.parse_args()
+
+    if not Path(args.path).exists():
+        print(f"No cache at {args.path}", file=sys.stderr)
+        return
+
+    cache = ResponseCache(args.path, enabled=True, offline=False)
+    if args.prune:
+        print(f"Pruned {cache.prune()} expired entries")
+    if args.clear is not None:
+        cache.clear(args.clear or None)
+        print(f"Cleared {args.clear or 'all sources'}")
+
+    db = cache._conn()
+    rows = db.execute(
+        "SELECT r.source, COUNT(*), SUM(r.size), COALESCE(s.hits, 0), COALESCE(s.misses, 0) "
+        "FROM responses r LEFT JOIN stats s ON s.source = r.source "
+        "GROUP BY r.source ORDER BY r.source").fetchall()
+    print(f"{'Source':<32} {'Entries':>8} {'Bytes':>12} {'Hits':>8} {'Misses':>8}")
+    for source, n, size, hits, misses in rows:
+        print(f"{source:<32} {n:>8} {size:>12,} {hits:>8} {misses:>8}")
+    cache.close()
+
+
+if __name__ == "__main__":
+    main()
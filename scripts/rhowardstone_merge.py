@@ -9,13 +9,12 @@ Usage:
   python3 scripts/rhowardstone_merge.py             # emit CUE to stdout
   python3 scripts/rhowardstone_merge.py --dry-run    # preview matches only
 """
-import difflib
-import json
-import subprocess
 import sys
-import urllib.error
-import urllib.request
-from pathlib import Path
+
+from graph_nodes import GraphUnavailable
+from http_client import HTTPError, HttpClient, TransportError
+from name_index import NameIndex
+import resolve
 
 REGISTRY_URL = (
     "https://raw.githubusercontent.com/rhowardstone/"
@@ -23,19 +22,19 @@ REGISTRY_URL = (
 )
 UA = "unify-graph/1.0 (Epstein network research)"
 
+HTTP = HttpClient(user_agent=UA, timeout=30)
+
 
 def fetch_registry():
     """Download persons_registry.json from GitHub, return parsed list."""
     try:
-        req = urllib.request.Request(REGISTRY_URL, headers={"User-Agent": UA})
-        with urllib.request.urlopen(req, timeout=30) as resp:
-            return json.loads(resp.read())
-    except urllib.error.HTTPError as e:
+        return HTTP.get_json(REGISTRY_URL)
+    except HTTPError as e:
         print(f"ERROR: HTTP {e.code} fetching {REGISTRY_URL}: {e.reason}",
               file=sys.stderr)
         sys.exit(1)
-    except urllib.error.URLError as e:
-        print(f"ERROR: Cannot reach GitHub: {e.reason}", file=sys.stderr)
+    except TransportError as e:
+        print(f"ERROR: Cannot reach GitHub: {e}", file=sys.stderr)
         print("Check your internet connection or try again later.",
               file=sys.stderr)
         sys.exit(1)
@@ -46,30 +45,13 @@ def fetch_registry():
 
 
 def load_local_entities():
-    """Run cue export to get our entity list, return list of node dicts."""
+    """Return our entity list as node dicts ("id", "name", "types",
+    "aliases") from the prebuilt name index."""
     try:
-        result = subprocess.run(
-            ["cue", "export", "-e", "graph.nodes", "./..."],
-            capture_output=True, text=True, timeout=30,
-            cwd=str(Path(__file__).resolve().parent.parent),
-        )
-        if result.returncode != 0:
-            print(f"ERROR: cue export failed:\n{result.stderr}",
-                  file=sys.stderr)
-            sys.exit(1)
-        return json.loads(result.stdout)
-    except FileNotFoundError:
-        print("ERROR: 'cue' command not found. Install CUE first.",
-              file=sys.stderr)
+        return NameIndex.load().nodes()
+    except GraphUnavailable as e:
+        print(f"ERROR: {e}", file=sys.stderr)
         sys.exit(1)
-    except subprocess.TimeoutExpired:
-        print("ERROR: cue export timed out after 30s.", file=sys.stderr)
-        sys.exit(1)
-
-
-def normalize(name):
-    """Lowercase, strip whitespace for comparison."""
-    return " ".join(name.lower().split())
 
 
 def match_entities(local_nodes, registry):
@@ -92,25 +74,24 @@ def match_entities(local_nodes, registry):
         if name.startswith("(") and ")" in name:
             continue
 
-        norm = normalize(name)
+        norm = resolve.normalize(name)
         reg_by_norm[norm] = entry
 
         for alias in entry.get("aliases", []) or []:
-            alias_norm = normalize(alias)
+            alias_norm = resolve.normalize(alias)
             if alias_norm:
                 reg_by_alias[alias_norm] = entry
 
-    # All registry names for fuzzy matching
-    reg_names = list(reg_by_norm.keys())
-
     matches = []
     unmatched_local = []
     matched_slugs = set()
+    fuzzy_pending = []
 
     for node in local_nodes:
         entity_id = node["id"]
         entity_name = node["name"]
-        norm_name = normalize(entity_name)
+        norm_name = resolve.normalize(entity_name)
+        local_aliases = [resolve.normalize(a) for a in node.get("aliases", [])]
 
         # Pass 1: exact name match
         if norm_name in reg_by_norm:
@@ -120,28 +101,29 @@ def match_entities(local_nodes, registry):
             matched_slugs.add(entry["slug"])
             continue
 
-        # Pass 2: alias match
-        if norm_name in reg_by_alias:
-            entry = reg_by_alias[norm_name]
+        # Pass 2: alias match, our name or aliases against their names and aliases
+        entry = next((table[n] for n in [norm_name] + local_aliases
+                      for table in (reg_by_alias, reg_by_norm) if n in table), None)
+        if entry:
             matches.append((entity_id, entity_name, entry["slug"],
                             entry["name"], "alias"))
             matched_slugs.add(entry["slug"])
             continue
 
-        # Pass 3: fuzzy match against all registry names
-        best_matches = difflib.get_close_matches(
-            norm_name, reg_names, n=1, cutoff=0.85)
-        if best_matches:
-            best = best_matches[0]
-            entry = reg_by_norm[best]
-            ratio = difflib.SequenceMatcher(
-                None, norm_name, best).ratio()
-            matches.append((entity_id, entity_name, entry["slug"],
-                            entry["name"], f"fuzzy({ratio:.2f})"))
-            matched_slugs.add(entry["slug"])
-            continue
+        fuzzy_pending.append((entity_id, entity_name))
 
-        unmatched_local.append((entity_id, entity_name))
+    # Pass 3: fuzzy match against all registry names, in one batch
+    reg_names = list(reg_by_norm)
+    resolver = resolve.Resolver(reg_names, source="rhowardstone")
+    best = resolver.best(name for _, name in fuzzy_pending)
+    for (entity_id, entity_name), (idx, score) in zip(fuzzy_pending, best):
+        if idx is None:
+            unmatched_local.append((entity_id, entity_name))
+            continue
+        entry = reg_by_norm[reg_names[idx]]
+        matches.append((entity_id, entity_name, entry["slug"],
+                        entry["name"], f"fuzzy({score:.2f})"))
+        matched_slugs.add(entry["slug"])
 
     # Find unmatched registry entries (for discovery)
     unmatched_registry = [
@@ -155,6 +137,8 @@ def match_entities(local_nodes, registry):
 
 def emit_cue(matches):
     """Print CUE overlay to stdout."""
+    print("@if(!compact_ids)")
+    print()
     print("package creeps")
     print()
     print("entities: {")
@@ -179,6 +163,7 @@ def print_summary(matches, unmatched_local, unmatched_registry, local_nodes):
     print(f"Matched:           {matched}/{total} "
           f"({matched * 100 // total}%)", file=sys.stderr)
     print(f"Unmatched local:   {unmatched}", file=sys.stderr)
+    print(resolve.summary(), file=sys.stderr)
 
     if unmatched_local:
         print(f"\nUnmatched local entities:", file=sys.stderr)
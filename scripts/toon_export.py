@@ -3,14 +3,44 @@
 
 TOON reduces LLM token usage ~55% for tabular data by grouping into
 compact CSV-like tables. Output goes to site/data/graph.toon.
+
+Usage:
+  python3 scripts/toon_export.py                        # site/data/graph.toon
+  python3 scripts/toon_export.py --chunk-tokens 4000 [--outdir site/data/toon]
+
+--chunk-tokens N splits the export into chunks of at most about N tokens
+each, for prompts with a token budget. Rows are grouped by community
+(largest first): a community goes into one chunk whenever it fits in
+one, and several small communities share a chunk. A community larger
+than the budget continues over as many chunks as it needs. Each chunk is a
+self-contained TOON file (chunk-001.toon, ...) with the entities of its
+communities, the connections leaving them, and a communities table listing
+the members in that chunk. index.json maps every chunk to its
+communities, counts and estimated tokens, and every entity to its chunk.
+Chunks from an earlier run are removed first.
+
+Token counts are estimated (estimate_tokens) and err high for English
+words, so chunks usually come in under the budget.
 """
 
 import json
+import re
 import sys
 from pathlib import Path
 
 SITE_DATA = Path(__file__).parent.parent / "site" / "data"
 
+ENTITY_FIELDS = ("id,name,cluster,types,out,in,gaps,evidence,mentions,community,"
+                 "betweenness,pagerank,coreness,wikidata")
+CONNECTION_FIELDS = "source,target,bidir,context"
+COMMUNITY_FIELDS = "id,size,members"
+
+CHUNK_DIR = SITE_DATA / "toon"
+CHUNK_PATTERN = "chunk-{:03d}.toon"
+INDEX_NAME = "index.json"
+
+_TOKEN_PIECE = re.compile(r"[A-Za-z]+|[0-9]+|\S")
+
 
 def load(name):
     p = SITE_DATA / f"{name}.json"
@@ -27,6 +57,255 @@ def escape(val):
     return s.replace(",", ";").replace("|", "/")
 
 
+def estimate_tokens(line):
+    """Rough BPE token count of one output line (newline included):
+    a token per 4 letters, per 3 digits and per other symbol."""
+    n = 1
+    for piece in _TOKEN_PIECE.findall(line):
+        if piece[0].isascii() and piece[0].isalpha():
+            n += -(-len(piece) // 4)
+        elif piece[0].isdigit():
+            n += -(-len(piece) // 3)
+        else:
+            n += 1
+    return n
+
+
+def link_ends(link):
+    src = link["source"] if isinstance(link["source"], str) else link["source"].get("id", "")
+    tgt = link["target"] if isinstance(link["target"], str) else link["target"].get("id", "")
+    return src, tgt
+
+
+def entity_row(n, nx, qids):
+    vals = [
+        escape(n["id"]),
+        escape(n["name"]),
+        escape(n["cluster"]),
+        "|".join(escape(t) for t in n.get("types", [])),
+        str(n.get("connection_count", 0)),
+        str(n.get("inbound_count", 0)),
+        str(n.get("gap_count", 0)),
+        "Y" if n.get("has_evidence") else "N",
+        str(n.get("mention_count", 0)),
+        str(nx.get("community", "")),
+        f"{nx.get('betweenness', 0):.4f}" if "betweenness" in nx else "",
+        f"{nx.get('pagerank', 0):.4f}" if "pagerank" in nx else "",
+        str(nx.get("coreness", "")),
+        qids.get(n["id"], ""),
+    ]
+    return f"  {','.join(vals)}"
+
+
+def connection_row(link):
+    src, tgt = link_ends(link)
+    vals = [
+        escape(src),
+        escape(tgt),
+        "Y" if link.get("bidirectional") else "N",
+        escape(link.get("context", "")),
+    ]
+    return f"  {','.join(vals)}"
+
+
+def community_row(cid, size, members):
+    return f"  {cid},{size},{' '.join(sorted(members))}"
+
+
+def write_table(f, name, fields, count, rows):
+    """Write one table, preceded by a blank line, row by row."""
+    f.write(f"\n{name}[{count}]{{{fields}}}:\n")
+    for row in rows:
+        f.write(row + "\n")
+
+
+def write_single(out, nodes, links, nx_nodes, communities, qids):
+    """The whole export as one TOON file, written as it is generated."""
+    with open(out, "w") as f:
+        f.write(f"# unify-graph TOON export — {len(nodes)} entities, {len(links)} connections\n")
+        f.write("# Generated from site/data/{graph,networkx}.json\n")
+        write_table(f, "entities", ENTITY_FIELDS, len(nodes),
+                    (entity_row(n, nx_nodes.get(n["id"], {}), qids)
+                     for n in sorted(nodes, key=lambda x: x["id"])))
+        write_table(f, "connections", CONNECTION_FIELDS, len(links),
+                    (connection_row(link) for link in sorted(links, key=link_ends)))
+        if communities is not None:
+            write_table(f, "communities", COMMUNITY_FIELDS, len(communities),
+                        (community_row(c["id"], c["size"], c["members"])
+                         for c in sorted(communities, key=lambda x: -x["size"])))
+
+
+# ── Chunked export ──────────────────────────────────────────────
+
+def community_groups(nodes, links, nx_nodes, communities, qids):
+    """(community id, size, [(entity id, [row, ...])]) per community,
+    largest first, then entities in no community (id None).
+
+    An entity's rows are its entity row followed by the rows of the
+    connections it is the source of.
+    """
+    by_id = {n["id"]: n for n in nodes}
+    outgoing = {}
+    for link in sorted(links, key=link_ends):
+        outgoing.setdefault(link_ends(link)[0], []).append(link)
+
+    def units(member_ids):
+        for eid in sorted(member_ids):
+            rows = [entity_row(by_id[eid], nx_nodes.get(eid, {}), qids)]
+            rows += [connection_row(link) for link in outgoing.get(eid, [])]
+            yield eid, rows
+
+    placed = set()
+    for c in sorted(communities or [], key=lambda x: -x["size"]):
+        members = [m for m in c["members"] if m in by_id]
+        placed.update(members)
+        yield c["id"], c["size"], list(units(members))
+    rest = [eid for eid in by_id if eid not in placed]
+    if rest:
+        yield None, len(rest), list(units(rest))
+
+
+class Chunk:
+    """Rows of one chunk being filled, with their estimated tokens."""
+
+    # header comments, blank lines and table headers, with room for counts
+    OVERHEAD = sum(estimate_tokens(line) for line in (
+        "# unify-graph TOON chunk 000 — 000000 communities, 000000 entities, "
+        "000000 connections",
+        "# Part of the chunked TOON export; index.json maps entities to chunks.",
+        "# Connections are listed with their source entity.",
+        "", f"entities[000000]{{{ENTITY_FIELDS}}}:",
+        "", f"connections[000000]{{{CONNECTION_FIELDS}}}:",
+        "", f"communities[000000]{{{COMMUNITY_FIELDS}}}:",
+    ))
+
+    def __init__(self):
+        self.entities = []      # entity rows
+        self.connections = []   # connection rows
+        self.members = {}       # community id -> (size, [entity id])
+        self.entity_ids = []
+        self.tokens = self.OVERHEAD
+
+    def __bool__(self):
+        return bool(self.entities or self.connections)
+
+    def cost(self, cid, size, eid, rows):
+        """Tokens that adding entity `eid` with its rows would add."""
+        extra = sum(estimate_tokens(row) for row in rows)
+        if cid is not None:
+            if cid not in self.members:
+                extra += estimate_tokens(community_row(cid, size, []))
+            extra += estimate_tokens(eid) - 1  # " eid" in the member list
+        return extra
+
+    def add(self, cid, size, eid, rows):
+        self.tokens += self.cost(cid, size, eid, rows)
+        self.entities.append(rows[0])
+        self.connections.extend(rows[1:])
+        self.entity_ids.append(eid)
+        if cid is not None:
+            self.members.setdefault(cid, (size, []))[1].append(eid)
+
+    def add_connection(self, row):
+        self.tokens += estimate_tokens(row)
+        self.connections.append(row)
+
+
+def group_cost(cid, size, units):
+    """Tokens a whole community adds to a chunk that has none of it."""
+    tokens = sum(estimate_tokens(row) for _eid, rows in units for row in rows)
+    if cid is not None:
+        tokens += estimate_tokens(community_row(cid, size, []))
+        tokens += sum(estimate_tokens(eid) - 1 for eid, _rows in units)
+    return tokens
+
+
+def pack(groups, budget):
+    """Chunks of at most `budget` estimated tokens, filled in order.
+
+    A community that fits in a chunk is never split; one that doesn't is
+    continued over as many chunks as it needs, by entity, or by
+    connection row for an entity whose connections alone exceed the
+    budget.
+    """
+    chunk = Chunk()
+    for cid, size, units in groups:
+        if chunk and chunk.tokens + group_cost(cid, size, units) > budget:
+            yield chunk
+            chunk = Chunk()
+        for eid, rows in units:
+            if chunk and chunk.tokens + chunk.cost(cid, size, eid, rows) > budget:
+                yield chunk
+                chunk = Chunk()
+            if chunk.tokens + chunk.cost(cid, size, eid, rows) <= budget:
+                chunk.add(cid, size, eid, rows)
+                continue
+            # One entity's connections exceed a chunk: continue them row by row
+            chunk.add(cid, size, eid, rows[:1])
+            for row in rows[1:]:
+                if chunk.tokens + estimate_tokens(row) > budget:
+                    yield chunk
+                    chunk = Chunk()
+                chunk.add_connection(row)
+    if chunk:
+        yield chunk
+
+
+def write_chunk(path, number, chunk):
+    """Write one chunk as a self-contained TOON file. Returns the community
+    ids it covers."""
+    cids = sorted(chunk.members)
+    with open(path, "w") as f:
+        f.write(f"# unify-graph TOON chunk {number} — {len(cids)} communities, "
+                f"{len(chunk.entities)} entities, {len(chunk.connections)} connections\n")
+        f.write("# Part of the chunked TOON export; index.json maps entities to chunks.\n")
+        f.write("# Connections are listed with their source entity.\n")
+        write_table(f, "entities", ENTITY_FIELDS, len(chunk.entities), chunk.entities)
+        write_table(f, "connections", CONNECTION_FIELDS, len(chunk.connections),
+                    chunk.connections)
+        if cids:
+            write_table(f, "communities", COMMUNITY_FIELDS, len(cids),
+                        (community_row(cid, *chunk.members[cid]) for cid in cids))
+    return cids
+
+
+def write_chunks(outdir, budget, nodes, links, nx_nodes, communities, qids):
+    """Write chunk-NNN.toon files and index.json to outdir. Returns the index."""
+    outdir.mkdir(parents=True, exist_ok=True)
+    for stale in outdir.glob("chunk-*.toon"):
+        stale.unlink()
+
+    index = {"budget_tokens": budget, "entities": len(nodes), "connections": len(links),
+             "communities": len(communities or []), "chunks": [], "entity_chunk": {}}
+    groups = community_groups(nodes, links, nx_nodes, communities, qids)
+    for number, chunk in enumerate(pack(groups, budget), 1):
+        name = CHUNK_PATTERN.format(number)
+        cids = write_chunk(outdir / name, number, chunk)
+        index["chunks"].append({
+            "file": name,
+            "tokens": chunk.tokens,
+            "bytes": (outdir / name).stat().st_size,
+            "communities": cids,
+            "entities": len(chunk.entities),
+            "connections": len(chunk.connections),
+        })
+        for eid in chunk.entity_ids:
+            index["entity_chunk"].setdefault(eid, name)
+
+    tmp = outdir / (INDEX_NAME + ".tmp")
+    tmp.write_text(json.dumps(index, indent=1) + "\n")
+    tmp.replace(outdir / INDEX_NAME)
+    return index
+
+
+def _arg(flag, default, cast):
+    if flag in sys.argv:
+        idx = sys.argv.index(flag)
+        if idx + 1 < len(sys.argv):
+            return cast(sys.argv[idx + 1])
+    return default
+
+
 def main():
     graph = load("graph")
     networkx = load("networkx")
@@ -42,66 +321,30 @@ def main():
             qids = json.load(f)
 
     nx_nodes = networkx.get("nodes", {}) if networkx else {}
+    communities = networkx.get("communities") if networkx else None
     nodes = graph["nodes"]
     links = graph["links"]
 
-    lines = []
-    lines.append("# unify-graph TOON export — 132 entities, 398 connections")
-    lines.append("# Generated from site/data/{graph,networkx}.json")
-    lines.append("")
-
-    # Entity table
-    fields = "id,name,cluster,types,out,in,gaps,evidence,mentions,community,betweenness,pagerank,coreness,wikidata"
-    lines.append(f"entities[{len(nodes)}]{{{fields}}}:")
-    for n in sorted(nodes, key=lambda x: x["id"]):
-        nx = nx_nodes.get(n["id"], {})
-        vals = [
-            escape(n["id"]),
-            escape(n["name"]),
-            escape(n["cluster"]),
-            "|".join(escape(t) for t in n.get("types", [])),
-            str(n.get("connection_count", 0)),
-            str(n.get("inbound_count", 0)),
-            str(n.get("gap_count", 0)),
-            "Y" if n.get("has_evidence") else "N",
-            str(n.get("mention_count", 0)),
-            str(nx.get("community", "")),
-            f"{nx.get('betweenness', 0):.4f}" if "betweenness" in nx else "",
-            f"{nx.get('pagerank', 0):.4f}" if "pagerank" in nx else "",
-            str(nx.get("coreness", "")),
-            qids.get(n["id"], ""),
-        ]
-        lines.append(f"  {','.join(vals)}")
-
-    lines.append("")
-
-    # Connection table
-    fields = "source,target,bidir,context"
-    lines.append(f"connections[{len(links)}]{{{fields}}}:")
-    for link in sorted(links, key=lambda x: (x["source"], x["target"])):
-        src = link["source"] if isinstance(link["source"], str) else link["source"].get("id", "")
-        tgt = link["target"] if isinstance(link["target"], str) else link["target"].get("id", "")
-        vals = [
-            escape(src),
-            escape(tgt),
-            "Y" if link.get("bidirectional") else "N",
-            escape(link.get("context", "")),
-        ]
-        lines.append(f"  {','.join(vals)}")
-
-    lines.append("")
-
-    # Community summary table
-    if networkx and "communities" in networkx:
-        comms = networkx["communities"]
-        fields = "id,size,members"
-        lines.append(f"communities[{len(comms)}]{{{fields}}}:")
-        for c in sorted(comms, key=lambda x: -x["size"]):
-            lines.append(f"  {c['id']},{c['size']},{' '.join(sorted(c['members']))}")
-        lines.append("")
+    budget = _arg("--chunk-tokens", None, int)
+    if budget is not None:
+        if budget < 2 * Chunk.OVERHEAD:
+            print(f"Error: --chunk-tokens must be at least {2 * Chunk.OVERHEAD}",
+                  file=sys.stderr)
+            sys.exit(1)
+        outdir = Path(_arg("--outdir", CHUNK_DIR, str))
+        index = write_chunks(outdir, budget, nodes, links, nx_nodes, communities, qids)
+        chunks = index["chunks"]
+        print(f"TOON export: {len(nodes)} entities, {len(links)} connections → "
+              f"{len(chunks)} chunks in {outdir}")
+        if chunks:
+            tokens = [c["tokens"] for c in chunks]
+            print(f"Tokens per chunk (estimated): max {max(tokens):,}, "
+                  f"mean {sum(tokens) // len(tokens):,}, budget {budget:,}")
+        print(f"Index: {outdir / INDEX_NAME}")
+        return
 
     out = SITE_DATA / "graph.toon"
-    out.write_text("\n".join(lines))
+    write_single(out, nodes, links, nx_nodes, communities, qids)
     print(f"TOON export: {len(nodes)} entities, {len(links)} connections → {out}")
     print(f"Size: {out.stat().st_size:,} bytes vs ~{(SITE_DATA / 'graph.json').stat().st_size:,} bytes (graph.json)")
 
@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""Offline Wikidata lookups from a local JSON dump or filtered extract.
+
+wikidata_reconcile.py and wikidata_enrich.py normally call the live
+Wikidata APIs. With --dump they read from a local index instead, built
+in a single streaming pass over a dump:
+
+  - latest-all.json.bz2 / .gz / .json (one entity per line inside a
+    JSON array, as published at dumps.wikimedia.org), or
+  - a filtered extract in the same format or as plain JSON lines, e.g.
+    from wikibase-dump-filter. Include the entities the claims point to
+    as well, or their labels will fall back to bare QIDs (the same thing
+    the query service does for unlabelled items).
+
+The index (SQLite) maps QID -> English label, description, sitelink
+count and truthy claims, and label/alias -> QIDs. It is rebuilt only
+when the dump is newer than the index.
+
+Usage:
+  python3 scripts/wikidata_dump.py index DUMP [--index PATH] [--all-props]
+  python3 scripts/wikidata_dump.py search "Bill Clinton" [--index PATH]
+  python3 scripts/wikidata_dump.py show Q1124 [--index PATH]
+
+  python3 scripts/wikidata_reconcile.py --dump DUMP_OR_INDEX
+  .venv/bin/python3 scripts/wikidata_enrich.py --dump DUMP_OR_INDEX
+
+By default only the properties wikidata_enrich.py extracts are kept, to
+keep an index of the full dump manageable; --all-props keeps every claim.
+"""
+import argparse
+import bz2
+import gzip
+import json
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_INDEX = REPO_ROOT / ".cache" / "wikidata_dump.sqlite"
+
+ENTITY_URI = "http://www.wikidata.org/entity/"
+PROP_URI = "http://www.wikidata.org/prop/direct/"
+DATETIME = "http://www.w3.org/2001/XMLSchema#dateTime"
+DECIMAL = "http://www.w3.org/2001/XMLSchema#decimal"
+
+BATCH = 10_000
+
+SCHEMA = """
+CREATE TABLE entities (
+    qid          TEXT PRIMARY KEY,
+    label        TEXT,
+    description  TEXT,
+    sitelinks    INTEGER NOT NULL,
+    claims       TEXT NOT NULL     -- {pid: [[datatype, value], ...]}, truthy only
+);
+CREATE TABLE terms (
+    term      TEXT NOT NULL,       -- casefolded English label or alias
+    qid       TEXT NOT NULL,
+    is_alias  INTEGER NOT NULL
+);
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+INDEXES = "CREATE INDEX terms_term ON terms (term);"
+
+
+def open_dump(path):
+    """Open a dump for line-by-line text reading, decompressing by suffix."""
+    path = str(path)
+    if path.endswith(".bz2"):
+        return bz2.open(path, "rt", encoding="utf-8")
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, encoding="utf-8")
+
+
+def iter_entities(path):
+    """Yield entity dicts from a dump, one line at a time."""
+    with open_dump(path) as f:
+        for line in f:
+            line = line.strip().rstrip(",")
+            if not line or line in ("[", "]"):
+                continue
+            yield json.loads(line)
+
+
+def _simple_value(snak):
+    """(datatype, value) for a claim's main snak, as the query service has it."""
+    if snak.get("snaktype") != "value":
+        return None  # novalue / somevalue have no simple value
+    dv = snak["datavalue"]
+    kind, value = dv["type"], dv["value"]
+    if kind == "wikibase-entityid":
+        return ["item", value.get("id") or f"Q{value['numeric-id']}"]
+    if kind == "time":
+        # "+1953-00-00T00:00:00Z" at year precision -> "1953-01-01T00:00:00Z"
+        t = value["time"].lstrip("+")
+        date, _, rest = t.partition("T")
+        parts = date.rsplit("-", 2)
+        parts = [parts[0]] + [p if p != "00" else "01" for p in parts[1:]]
+        return ["time", "-".join(parts) + "T" + rest]
+    if kind == "monolingualtext":
+        return ["text", value["text"]]
+    if kind == "quantity":
+        return ["quantity", value["amount"].lstrip("+")]
+    if kind == "globecoordinate":
+        return ["coordinate", f"Point({value['longitude']} {value['latitude']})"]
+    if snak.get("datatype") in ("url", "commonsMedia"):
+        return ["url", value]
+    return ["string", value]
+
+
+def truthy_claims(entity, props=None):
+    """Best-rank claims per property: preferred if any, else normal."""
+    out = {}
+    for pid, statements in entity.get("claims", {}).items():
+        if props is not None and pid not in props:
+            continue
+        preferred = [s for s in statements if s.get("rank") == "preferred"]
+        best = preferred or [s for s in statements if s.get("rank") == "normal"]
+        values = [v for v in (_simple_value(s["mainsnak"]) for s in best) if v]
+        if values:
+            out[pid] = values
+    return out
+
+
+def build_index(dump, index=DEFAULT_INDEX, props=None):
+    """Stream `dump` once into a fresh index at `index`. Returns entity count."""
+    index = Path(index)
+    index.parent.mkdir(parents=True, exist_ok=True)
+    tmp = index.with_suffix(".building")
+    tmp.unlink(missing_ok=True)
+    db = sqlite3.connect(str(tmp))
+    db.execute("PRAGMA journal_mode=OFF")
+    db.execute("PRAGMA synchronous=OFF")
+    db.executescript(SCHEMA)
+
+    rows, terms = [], []
+    count = 0
+    start = time.perf_counter()
+    for entity in iter_entities(dump):
+        qid = entity.get("id", "")
+        if not qid.startswith("Q"):
+            continue  # properties and lexemes
+        label = entity.get("labels", {}).get("en", {}).get("value")
+        desc = entity.get("descriptions", {}).get("en", {}).get("value", "")
+        aliases = [a["value"] for a in entity.get("aliases", {}).get("en", [])]
+        rows.append((qid, label, desc, len(entity.get("sitelinks", {})),
+                     json.dumps(truthy_claims(entity, props), separators=(",", ":"))))
+        if label:
+            terms.append((label.casefold(), qid, 0))
+        terms.extend((alias.casefold(), qid, 1) for alias in aliases)
+
+        count += 1
+        if len(rows) >= BATCH:
+            _flush(db, rows, terms)
+            if count % (BATCH * 10) == 0:
+                print(f"  {count:,} entities ({count / (time.perf_counter() - start):,.0f}/s)",
+                      file=sys.stderr)
+    _flush(db, rows, terms)
+
+    db.executescript(INDEXES)
+    db.executemany("INSERT INTO meta VALUES (?, ?)", [
+        ("dump", str(Path(dump).resolve())),
+        ("entities", str(count)),
+        ("props", _props_key(props)),
+        ("built_at", str(time.time())),
+    ])
+    db.commit()
+    db.close()
+    tmp.replace(index)
+    return count
+
+
+def default_props():
+    """The property set wikidata_enrich.py extracts (imported lazily)."""
+    from wikidata_enrich import ALL_PROPS
+    return set(ALL_PROPS)
+
+
+def _props_key(props):
+    return "all" if props is None else " ".join(sorted(props))
+
+
+def _flush(db, rows, terms):
+    db.executemany("INSERT OR REPLACE INTO entities VALUES (?, ?, ?, ?, ?)", rows)
+    db.executemany("INSERT INTO terms VALUES (?, ?, ?)", terms)
+    db.commit()
+    rows.clear()
+    terms.clear()
+
+
+class DumpIndex:
+    """Read-only lookups against an index built by build_index()."""
+
+    def __init__(self, path=DEFAULT_INDEX):
+        self.path = Path(path)
+        self.db = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+        self._labels = {}
+
+    @classmethod
+    def open(cls, source, props=None):
+        """Open `source`: an index, or a dump (indexed first if needed).
+
+        A dump is indexed into DEFAULT_INDEX, keeping `props` (default: the
+        properties wikidata_enrich.py extracts). The index is reused until
+        the dump changes or a different property set is asked for.
+        """
+        source = Path(source)
+        if source.suffix in (".sqlite", ".db"):
+            return cls(source)
+        if props is None:
+            props = default_props()
+        index = DEFAULT_INDEX
+        wanted = {"dump": str(source.resolve()), "props": _props_key(props)}
+        if index.exists() and index.stat().st_mtime >= source.stat().st_mtime:
+            idx = cls(index)
+            if all(idx.meta(k) == v for k, v in wanted.items()):
+                return idx
+            idx.close()
+        print(f"Indexing {source} (single pass)...", file=sys.stderr)
+        count = build_index(source, index, props)
+        print(f"  {count:,} entities indexed into {index}", file=sys.stderr)
+        return cls(index)
+
+    def meta(self, key):
+        row = self.db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def label(self, qid):
+        """English label, or the QID itself when there is none."""
+        if qid not in self._labels:
+            row = self.db.execute("SELECT label FROM entities WHERE qid = ?", (qid,)).fetchone()
+            self._labels[qid] = (row[0] if row else None) or qid
+        return self._labels[qid]
+
+    def missing(self, qids):
+        """The QIDs in `qids` that are not in the index."""
+        present = set()
+        qids = list(qids)
+        for i in range(0, len(qids), 500):
+            chunk = qids[i:i + 500]
+            present.update(q for (q,) in self.db.execute(
+                f"SELECT qid FROM entities WHERE qid IN ({','.join('?' * len(chunk))})", chunk))
+        return [q for q in qids if q not in present]
+
+    def search(self, name, limit=3):
+        """Label/alias search shaped like wbsearchentities results.
+
+        Exact matches come before prefix matches, labels before aliases,
+        and ties go to the entity with more sitelinks. An entity ranks by
+        its best matching term: exact label, exact alias, label prefix,
+        alias prefix.
+        """
+        term = name.casefold()
+        rows = self.db.execute(
+            "SELECT e.qid, e.label, e.description, "
+            "MIN((t.term != ?) * 2 + t.is_alias) AS rank, e.sitelinks "
+            "FROM terms t JOIN entities e USING (qid) "
+            "WHERE t.term >= ? AND t.term < ? "
+            "GROUP BY e.qid ORDER BY rank, e.sitelinks DESC LIMIT ?",
+            (term, term, term + "￿", limit)).fetchall()
+        return [{"id": qid, "label": label or qid, "description": desc or ""}
+                for qid, label, desc, *_ in rows]
+
+    def bindings(self, qids, props):
+        """SPARQL-style bindings for `?entity wdt:P ?val` over qids x props,
+        matching what wikidata_enrich's query returns from the live service."""
+        out = []
+        marks = ",".join("?" * len(qids))
+        for qid, claims in self.db.execute(
+                f"SELECT qid, claims FROM entities WHERE qid IN ({marks})", list(qids)):
+            for pid, values in json.loads(claims).items():
+                if pid not in props:
+                    continue
+                for kind, value in values:
+                    out.append({
+                        "entity": {"type": "uri", "value": ENTITY_URI + qid},
+                        "prop": {"type": "uri", "value": PROP_URI + pid},
+                        "val": self._val(kind, value),
+                        "valLabel": self._label(kind, value),
+                    })
+        return out
+
+    def _label(self, kind, value):
+        if kind == "item":
+            return {"xml:lang": "en", "type": "literal", "value": self.label(value)}
+        return {"type": "literal", "value": value}
+
+    @staticmethod
+    def _val(kind, value):
+        if kind == "item":
+            return {"type": "uri", "value": ENTITY_URI + value}
+        if kind == "url":
+            return {"type": "uri", "value": value}
+        if kind == "time":
+            return {"datatype": DATETIME, "type": "literal", "value": value}
+        if kind == "quantity":
+            return {"datatype": DECIMAL, "type": "literal", "value": value}
+        return {"type": "literal", "value": value}
+
+    def close(self):
+        self.db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline Wikidata dump index")
+    parser.add_argument("--index", default=str(DEFAULT_INDEX), help="Index path")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    build = sub.add_parser("index", help="Build the index from a dump (one pass)")
+    build.add_argument("dump")
+    build.add_argument("--all-props", action="store_true",
+                       help="Keep every property, not just those wikidata_enrich uses")
+    search = sub.add_parser("search", help="Label/alias lookup")
+    search.add_argument("name")
+    show = sub.add_parser("show", help="Print an entity's indexed claims")
+    show.add_argument("qid")
+    args = parser.parse_args()
+
+    if args.cmd == "index":
+        props = None if args.all_props else default_props()
+        start = time.perf_counter()
+        count = build_index(args.dump, args.index, props)
+        print(f"Indexed {count:,} entities into {args.index} "
+              f"in {time.perf_counter() - start:.1f}s")
+        return
+
+    if not Path(args.index).exists():
+        print(f"ERROR: no index at {args.index}. Run: wikidata_dump.py index DUMP",
+              file=sys.stderr)
+        sys.exit(1)
+    idx = DumpIndex(args.index)
+    if args.cmd == "search":
+        for r in idx.search(args.name, limit=10):
+            print(f"{r['id']:<12} {r['label']}  — {r['description']}")
+    else:
+        row = idx.db.execute("SELECT label, description, sitelinks, claims FROM entities "
+                             "WHERE qid = ?", (args.qid,)).fetchone()
+        if not row:
+            print(f"{args.qid} not in index", file=sys.stderr)
+            sys.exit(1)
+        label, desc, sitelinks, claims = row
+        print(f"{args.qid}  {label} — {desc} ({sitelinks} sitelinks)")
+        for pid, values in json.loads(claims).items():
+            shown = [idx.label(v) if kind == "item" else v for kind, v in values]
+            print(f"  {pid}: {', '.join(shown)}")
+    idx.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -4,24 +4,47 @@
 Queries Wikidata for structured properties (employers, education,
 memberships, family, residences, external IDs) for each reconciled entity.
 
-Uses the Wikidata Query Service SPARQL endpoint. Rate limited to ~1 req/sec.
+Uses the Wikidata Query Service SPARQL endpoint with adaptive batching:
+batches grow while queries return quickly, are split in half on a timeout
+or 5xx, and run a few at a time (see batch_enrich). A 429 pauses all
+queries for the server's Retry-After.
 
 Usage:
-  .venv/bin/python3 scripts/wikidata_enrich.py
+  .venv/bin/python3 scripts/wikidata_enrich.py [--offline]
+      [--batch-size N] [--concurrency N] [--dump PATH]
+
+Each entity's SPARQL bindings are cached in .cache/http_cache.sqlite, so
+reruns only query entities that are new or expired; --offline serves
+only from the cache.
+
+--dump PATH reads claims from a local Wikidata JSON dump (or extract, or
+an index built by scripts/wikidata_dump.py) instead of the query
+service. The dump is turned into the same bindings the SPARQL query
+returns, so the output is identical, and no network access is needed.
 
 Output:
   scripts/wikidata_enriched.json  — structured properties per entity
 """
+import hashlib
 import json
 import sys
 import time
-import urllib.request
-import urllib.parse
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
 
+from http_client import HTTPError, HttpClient, TransportError, parse_retry_after
+from response_cache import CacheMiss, ResponseCache
+from wikidata_dump import DumpIndex
+
 SPARQL_ENDPOINT = "https://query.wikidata.org/sparql"
 UA = "unify-graph/1.0 (https://github.com/unify-graph/unify-graph; entity enrichment)"
 
+CACHE_SOURCE = "query.wikidata.org"
+
+HTTP = HttpClient(user_agent=UA, timeout=30, rate_limits={SPARQL_ENDPOINT: 5},
+                  cache=ResponseCache())
+
 # Properties to extract for persons
 PERSON_PROPS = {
     "P69":  "educated_at",
@@ -73,38 +96,30 @@ EXT_ID_PROPS = {
 }
 
 
-def sparql_query(query: str) -> list[dict]:
-    """Execute a SPARQL query against Wikidata Query Service."""
-    params = urllib.parse.urlencode({"query": query})
-    url = f"{SPARQL_ENDPOINT}?{params}"
-    req = urllib.request.Request(url, headers={
-        "User-Agent": UA,
-        "Accept": "application/json",
-    })
-    try:
-        with urllib.request.urlopen(req, timeout=30) as resp:
-            data = json.loads(resp.read())
-            return data.get("results", {}).get("bindings", [])
-    except Exception as e:
-        print(f"  SPARQL error: {e}", file=sys.stderr)
-        return []
-
-
-def batch_enrich(qid_map: dict[str, str], batch_size: int = 20) -> dict:
-    """Query Wikidata for structured properties in batches of QIDs."""
-    all_results = {}
-    qid_list = list(qid_map.items())
-
-    for i in range(0, len(qid_list), batch_size):
-        batch = qid_list[i:i + batch_size]
-        values = " ".join(f"wd:{qid}" for _, qid in batch)
-        qid_to_key = {qid: key for key, qid in batch}
-
-        # Combine person and org props
-        all_props = {**PERSON_PROPS, **ORG_PROPS, **EXT_ID_PROPS}
-        prop_values = " ".join(f"wdt:{p}" for p in all_props.keys())
-
-        query = f"""
+ALL_PROPS = {**PERSON_PROPS, **ORG_PROPS, **EXT_ID_PROPS}
+PROP_URIS = {f"http://www.wikidata.org/prop/direct/{pid}": name
+             for pid, name in ALL_PROPS.items()}
+# Per-entity cache entries are keyed on the property set, so adding a
+# property re-fetches everything.
+PROPS_DIGEST = hashlib.sha256(" ".join(sorted(ALL_PROPS)).encode()).hexdigest()[:12]
+
+# Adaptive batching. WDQS allows 5 concurrent queries per client and
+# times out queries at 60s; these keep well inside both.
+DEFAULT_BATCH_SIZE = 20
+MIN_BATCH_SIZE = 1
+MAX_BATCH_SIZE = 200
+DEFAULT_CONCURRENCY = 3
+MAX_CONCURRENCY = 5
+FAST_SECONDS = 5.0    # grow the batch while responses come back faster
+SLOW_SECONDS = 20.0   # shrink it when they come back slower
+SINGLE_RETRIES = 2    # attempts left for a single QID that keeps failing
+SPLIT_STATUSES = {413, 414, 500, 502, 503, 504}
+
+
+def build_query(batch):
+    values = " ".join(f"wd:{qid}" for _, qid in batch)
+    prop_values = " ".join(f"wdt:{p}" for p in ALL_PROPS)
+    return f"""
         SELECT ?entity ?prop ?val ?valLabel WHERE {{
           VALUES ?entity {{ {values} }}
           VALUES ?prop {{ {prop_values} }}
@@ -113,57 +128,231 @@ def batch_enrich(qid_map: dict[str, str], batch_size: int = 20) -> dict:
         }}
         """
 
-        sys.stdout.write(f"  Batch {i // batch_size + 1}: {len(batch)} entities ... ")
-        sys.stdout.flush()
 
-        bindings = sparql_query(query)
-        print(f"{len(bindings)} triples")
+def sparql_batch(batch):
+    """Run one batch query without client-side retries.
 
-        # Parse results
-        prop_reverse = {}
-        for pid, name in all_props.items():
-            prop_reverse[f"http://www.wikidata.org/prop/direct/{pid}"] = name
+    Returns (bindings, seconds). Errors propagate so the scheduler can
+    split the batch or back off.
+    """
+    start = time.perf_counter()
+    resp = HTTP.request("GET", SPARQL_ENDPOINT, params={"query": build_query(batch)},
+                        headers={"Accept": "application/json"},
+                        retries=0, cacheable=False)
+    bindings = resp.json().get("results", {}).get("bindings", [])
+    return bindings, time.perf_counter() - start
 
-        for b in bindings:
-            entity_uri = b["entity"]["value"]
-            qid = entity_uri.split("/")[-1]
-            key = qid_to_key.get(qid)
-            if not key:
-                continue
 
-            if key not in all_results:
-                all_results[key] = {"qid": qid, "properties": {}}
+# ── per-entity cache ───────────────────────────────────────────
+# Batch composition changes from run to run, so whole batch responses
+# would rarely be reused. Each entity's bindings are cached on their own
+# instead, under a synthetic URL in the shared response cache.
+
+def _cache_url(qid):
+    return f"{SPARQL_ENDPOINT}?entity={qid}&props={PROPS_DIGEST}"
+
 
-            prop_uri = b["prop"]["value"]
-            prop_name = prop_reverse.get(prop_uri, prop_uri.split("/")[-1])
+def cached_bindings(qid):
+    """Cached bindings for one QID, or None. Raises CacheMiss when offline."""
+    hit = HTTP.cache.get(CACHE_SOURCE, "GET", _cache_url(qid))
+    return json.loads(hit[2]) if hit else None
 
-            val = b.get("valLabel", b["val"])
-            val_str = val.get("value", "")
 
-            # For dates, clean up the format
-            if val.get("datatype", "").endswith("dateTime"):
-                val_str = val_str[:10]  # Just YYYY-MM-DD
+def cache_bindings(batch, bindings):
+    by_qid = {qid: [] for _, qid in batch}
+    for b in bindings:
+        by_qid.setdefault(b["entity"]["value"].split("/")[-1], []).append(b)
+    for qid, rows in by_qid.items():
+        HTTP.cache.put(CACHE_SOURCE, "GET", _cache_url(qid), None, 200, {},
+                       json.dumps(rows).encode())
 
-            # For URIs, extract QID or keep URL
-            if val["type"] == "uri" and "/entity/" in val["value"]:
-                val_qid = val["value"].split("/")[-1]
-                label = b.get("valLabel", {}).get("value", val_qid)
-                val_str = f"{label} ({val_qid})" if label != val_qid else val_qid
-            elif val["type"] == "uri":
-                val_str = val["value"]
 
-            props = all_results[key]["properties"]
-            if prop_name not in props:
-                props[prop_name] = []
-            if val_str not in props[prop_name]:
-                props[prop_name].append(val_str)
+def merge_bindings(all_results, bindings, qid_to_key):
+    """Fold SPARQL bindings into {key: {"qid", "properties"}}."""
+    for b in bindings:
+        entity_uri = b["entity"]["value"]
+        qid = entity_uri.split("/")[-1]
+        key = qid_to_key.get(qid)
+        if not key:
+            continue
 
-        time.sleep(1.5)  # Rate limit
+        if key not in all_results:
+            all_results[key] = {"qid": qid, "properties": {}}
 
-    return all_results
+        prop_uri = b["prop"]["value"]
+        prop_name = PROP_URIS.get(prop_uri, prop_uri.split("/")[-1])
+
+        val = b.get("valLabel", b["val"])
+        val_str = val.get("value", "")
+
+        # For dates, clean up the format
+        if val.get("datatype", "").endswith("dateTime"):
+            val_str = val_str[:10]  # Just YYYY-MM-DD
+
+        # For URIs, extract QID or keep URL
+        if val["type"] == "uri" and "/entity/" in val["value"]:
+            val_qid = val["value"].split("/")[-1]
+            label = b.get("valLabel", {}).get("value", val_qid)
+            val_str = f"{label} ({val_qid})" if label != val_qid else val_qid
+        elif val["type"] == "uri":
+            val_str = val["value"]
+
+        props = all_results[key]["properties"]
+        if prop_name not in props:
+            props[prop_name] = []
+        if val_str not in props[prop_name]:
+            props[prop_name].append(val_str)
+
+
+def dump_enrich(qid_map: dict[str, str], dump: DumpIndex) -> tuple[dict, dict]:
+    """Build the same results as batch_enrich() from a local dump index."""
+    qid_to_key = {qid: key for key, qid in qid_map.items()}
+    all_results = {}
+    qids = sorted(qid_to_key)
+    for i in range(0, len(qids), MAX_BATCH_SIZE):
+        merge_bindings(all_results, dump.bindings(qids[i:i + MAX_BATCH_SIZE], ALL_PROPS),
+                       qid_to_key)
+    stats = {"cached": 0, "batches": 0, "splits": 0, "throttled": 0,
+             "failed": [qid_to_key[q] for q in dump.missing(qids)],
+             "final_batch_size": MAX_BATCH_SIZE}
+    return all_results, stats
+
+
+def batch_enrich(qid_map: dict[str, str], batch_size: int = DEFAULT_BATCH_SIZE,
+                 concurrency: int = DEFAULT_CONCURRENCY) -> tuple[dict, dict]:
+    """Query Wikidata for structured properties with adaptive batching.
+
+    Cached entities are answered first. The rest are sent in batches of
+    an adaptive size, with up to `concurrency` queries in flight:
+
+      - a batch answered in under FAST_SECONDS grows the next batch 1.5x
+        (up to MAX_BATCH_SIZE); one slower than SLOW_SECONDS halves it
+      - a timeout or 5xx splits the batch in half and requeues both
+        halves, and later batches stay smaller than the one that failed;
+        a single QID is retried SINGLE_RETRIES times, then dropped
+      - a 429 pauses all dispatch for the server's Retry-After
+
+    Returns (results, stats).
+    """
+    qid_to_key = {qid: key for key, qid in qid_map.items()}
+    all_results = {}
+    stats = {"cached": 0, "batches": 0, "splits": 0, "throttled": 0,
+             "failed": [], "final_batch_size": batch_size}
+
+    pending = deque()
+    for key, qid in sorted(qid_map.items()):
+        try:
+            bindings = cached_bindings(qid)
+        except CacheMiss:
+            stats["failed"].append(key)
+            continue
+        if bindings is None:
+            pending.append((key, qid))
+        else:
+            stats["cached"] += 1
+            merge_bindings(all_results, bindings, qid_to_key)
+    if stats["cached"]:
+        print(f"  {stats['cached']} entities from cache")
+
+    size = batch_size
+    ceiling = MAX_BATCH_SIZE  # lowered to just under any new batch that failed
+    retry = deque()        # split halves and throttled batches go first
+    attempts = {}          # qid -> failures as a single-QID batch
+    paused_until = 0.0
+    in_flight = {}
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        while pending or retry or in_flight:
+            now = time.monotonic()
+            while len(in_flight) < concurrency and (retry or pending) and now >= paused_until:
+                if retry:
+                    batch, fresh = retry.popleft(), False
+                else:
+                    batch = [pending.popleft() for _ in range(min(size, len(pending)))]
+                    fresh = True
+                in_flight[pool.submit(sparql_batch, batch)] = (batch, fresh)
+
+            if not in_flight:
+                time.sleep(max(0.0, paused_until - now))
+                continue
+            done, _ = wait(in_flight, timeout=max(0.05, paused_until - now),
+                           return_when=FIRST_COMPLETED)
+
+            for future in done:
+                batch, fresh = in_flight.pop(future)
+                stats["batches"] += 1
+                try:
+                    bindings, seconds = future.result()
+                except HTTPError as e:
+                    if e.code == 429:
+                        wait_s = parse_retry_after(e.headers.get("retry-after")) or 5.0
+                        print(f"  Throttled (429); pausing {wait_s:.0f}s")
+                        paused_until = time.monotonic() + wait_s
+                        stats["throttled"] += 1
+                        retry.appendleft(batch)
+                        continue
+                    if e.code not in SPLIT_STATUSES:
+                        print(f"  SPARQL error: {e}", file=sys.stderr)
+                        stats["failed"].extend(key for key, _ in batch)
+                        continue
+                    reason = f"HTTP {e.code}"
+                except (TransportError, ValueError) as e:
+                    reason = str(e)
+                else:
+                    reason = None
+                if reason:
+                    # Only full-size batches move the ceiling; failing halves
+                    # usually mean one slow entity, not an oversized batch.
+                    if fresh and len(batch) > 1:
+                        ceiling = max(MIN_BATCH_SIZE, min(ceiling, len(batch) - 1))
+                    size = split(batch, retry, attempts, stats, size, reason)
+                    continue
+
+                print(f"  Batch {stats['batches']}: {len(batch)} entities, "
+                      f"{len(bindings)} triples in {seconds:.1f}s")
+                cache_bindings(batch, bindings)
+                merge_bindings(all_results, bindings, qid_to_key)
+                if seconds < FAST_SECONDS:
+                    size = min(ceiling, max(size + 1, int(size * 1.5)))
+                elif seconds > SLOW_SECONDS:
+                    size = max(MIN_BATCH_SIZE, size // 2)
+
+    stats["final_batch_size"] = size
+    return all_results, stats
+
+
+def split(batch, retry, attempts, stats, size, reason):
+    """Requeue a failed batch as two halves. Returns the new batch size."""
+    if len(batch) > 1:
+        mid = len(batch) // 2
+        retry.appendleft(batch[mid:])
+        retry.appendleft(batch[:mid])
+        stats["splits"] += 1
+        print(f"  Batch of {len(batch)} failed ({reason}); splitting")
+        return max(MIN_BATCH_SIZE, min(size, len(batch)) // 2)
+
+    key, qid = batch[0]
+    attempts[qid] = attempts.get(qid, 0) + 1
+    if attempts[qid] > SINGLE_RETRIES:
+        print(f"  {key} ({qid}) failed: {reason}", file=sys.stderr)
+        stats["failed"].append(key)
+    else:
+        retry.append(batch)
+    return size
+
+
+def _arg(flag, default, cast):
+    if flag in sys.argv:
+        idx = sys.argv.index(flag)
+        if idx + 1 < len(sys.argv):
+            return cast(sys.argv[idx + 1])
+    return default
 
 
 def main():
+    if "--offline" in sys.argv:
+        HTTP.cache.offline = True
+
     # Load QID mapping
     qid_path = Path("scripts/wikidata_qids.json")
     if not qid_path.exists():
@@ -173,22 +362,43 @@ def main():
     with open(qid_path) as f:
         qid_map = {k: v for k, v in json.load(f).items() if v}
 
-    print(f"Enriching {len(qid_map)} entities from Wikidata SPARQL...\n")
-
-    results = batch_enrich(qid_map)
+    batch_size = max(MIN_BATCH_SIZE, _arg("--batch-size", DEFAULT_BATCH_SIZE, int))
+    concurrency = min(MAX_CONCURRENCY, max(1, _arg("--concurrency", DEFAULT_CONCURRENCY, int)))
+    dump = _arg("--dump", None, str)
+
+    start = time.perf_counter()
+    if dump:
+        index = DumpIndex.open(dump, set(ALL_PROPS))
+        print(f"Enriching {len(qid_map)} entities from local dump {index.path}...\n")
+        results, stats = dump_enrich(qid_map, index)
+        index.close()
+    else:
+        print(f"Enriching {len(qid_map)} entities from Wikidata SPARQL "
+              f"(batches from {batch_size}, {concurrency} concurrent)...\n")
+        results, stats = batch_enrich(qid_map, batch_size, concurrency)
+    elapsed = time.perf_counter() - start
 
     # Summary stats
     total_props = sum(len(r["properties"]) for r in results.values())
     total_values = sum(sum(len(v) for v in r["properties"].values()) for r in results.values())
 
-    # Write output
+    # Write output, sorted by key: batches complete in any order, and the
+    # file is committed, so a stable order keeps its diffs readable
     out_path = Path("scripts/wikidata_enriched.json")
     with open(out_path, "w") as f:
-        json.dump(results, f, indent=2, ensure_ascii=False)
+        json.dump(dict(sorted(results.items())), f, indent=2, ensure_ascii=False)
 
     print(f"\nDone: {len(results)} entities enriched")
     print(f"  {total_props} property types, {total_values} total values")
     print(f"  Output: {out_path}")
+    if not dump:
+        print(f"  {stats['batches']} queries ({stats['splits']} splits, "
+              f"{stats['throttled']} throttled), final batch size "
+              f"{stats['final_batch_size']}, {elapsed:.1f}s")
+    if stats["failed"]:
+        print(f"  Not enriched ({len(stats['failed'])}): {', '.join(sorted(stats['failed']))}")
+    if not dump:
+        print(f"  {HTTP.cache.summary()}")
 
     # Print interesting findings
     print("\nNotable findings:")
@@ -5,41 +5,62 @@ Queries the Wikidata search API for each entity name and outputs
 a CUE overlay file (external_ids.cue) with wikidata QIDs.
 
 Usage:
-  Local:  .venv/bin/python3 scripts/wikidata_reconcile.py
+  Local:  .venv/bin/python3 scripts/wikidata_reconcile.py [--dump PATH] [--full]
   CI:     triggered manually via 'wikidata-reconcile' job in .gitlab-ci.yml
 
+Only entities that are new or whose name, types or aliases changed since
+the last run are queried (scripts/reconcile_state/wikidata_reconcile.json,
+see incremental.py); their results are merged into the existing outputs.
+--full queries every entity and rewrites both files; --adopt records the
+current entities against the existing external_ids.cue without querying.
+
+--dump PATH searches a local Wikidata JSON dump (or extract, or an index
+built by scripts/wikidata_dump.py) instead of the live API; no network
+access is needed. See wikidata_dump.py for how results are ranked.
+
 IMPORTANT: Always review output diffs before committing.
 Wikidata's top-1 search result can be wrong for ambiguous names
 (e.g., "George Mitchell" returns a coach, not the senator).
 The corrections in scripts/wikidata_qids.json are the reviewed truth.
 """
 import json
+import os
 import sys
-import time
-import urllib.request
-import urllib.parse
+
+from http_client import HttpClient, RequestError
+from incremental import (ERROR, ReconcileState, alias_map, fingerprint, merge_overlay,
+                         overlay_ids)
+import resolve
+from wikidata_dump import DumpIndex
 
 API = "https://www.wikidata.org/w/api.php"
 
 UA = "unify-graph/1.0 (https://github.com/unify-graph/unify-graph; entity reconciliation)"
 
-def search_wikidata(name: str, limit: int = 3) -> list[dict]:
-    params = urllib.parse.urlencode({
+HTTP = HttpClient(user_agent=UA, timeout=10, rate_limits={API: 1 / 0.2})  # Be nice to the API
+
+QIDS_FILE = "scripts/wikidata_qids.json"
+CUE_OVERLAY = "external_ids.cue"
+
+DUMP = None  # DumpIndex when running from a local dump (--dump)
+
+def search_wikidata(name: str, limit: int = 3) -> list[dict] | None:
+    """Search results for a name; None if the request failed."""
+    if DUMP is not None:
+        return DUMP.search(name, limit)
+    params = {
         "action": "wbsearchentities",
         "search": name,
         "language": "en",
         "format": "json",
         "limit": limit,
-    })
-    url = f"{API}?{params}"
+    }
     try:
-        req = urllib.request.Request(url, headers={"User-Agent": UA})
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            data = json.loads(resp.read())
-            return data.get("search", [])
-    except Exception as e:
+        data = HTTP.get_json(API, params)
+        return data.get("search", [])
+    except (RequestError, ValueError) as e:
         print(f"  ERROR: {e}", file=sys.stderr)
-        return []
+        return None
 
 def pick_best(results: list[dict], name: str) -> dict | None:
     if not results:
@@ -48,59 +69,123 @@ def pick_best(results: list[dict], name: str) -> dict | None:
     for r in results:
         if r.get("label", "").lower() == name.lower():
             return r
-    # Otherwise first result
-    return results[0]
+    # Otherwise a label close enough to the name, else Wikidata's top hit
+    idx, _ = resolve.pick(name, [r.get("label", "") for r in results], "wikidata")
+    return results[0] if idx is None else results[idx]
+
+def _arg(flag, default, cast):
+    if flag in sys.argv:
+        idx = sys.argv.index(flag)
+        if idx + 1 < len(sys.argv):
+            return cast(sys.argv[idx + 1])
+    return default
+
+def write_outputs(results, skipped, removed, incremental):
+    """Write wikidata_qids.json and external_ids.cue.
+
+    An incremental run merges the entities it reconciled into the
+    existing files and leaves every other entry as it was.
+    """
+    mapping = {k: v["qid"] for k, v in results.items()}
+    if incremental:
+        with open(QIDS_FILE) as f:
+            merged = json.load(f)
+        for key in skipped + removed:
+            merged.pop(key, None)
+        merged.update(mapping)
+        with open(QIDS_FILE, "w") as f:
+            json.dump(dict(sorted(merged.items())), f, indent=2)
+        merge_overlay(CUE_OVERLAY, "wikidata",
+                      {**dict.fromkeys(skipped), **mapping}, drop=removed)
+        return
+
+    # Write JSON mapping
+    with open(QIDS_FILE, "w") as f:
+        json.dump(mapping, f, indent=2)
+
+    # Write CUE overlay
+    with open(CUE_OVERLAY, "w") as f:
+        f.write("// External identifiers — Wikidata QIDs for entity reconciliation.\n")
+        f.write("// Auto-generated by scripts/wikidata_reconcile.py\n")
+        f.write("@if(!compact_ids)\n\n")
+        f.write("package creeps\n\n")
+        f.write("entities: {\n")
+        for key in sorted(results.keys()):
+            qid = results[key]["qid"]
+            f.write(f'\t{key}: external_ids: wikidata: "{qid}"\n')
+        f.write("}\n")
 
 def main():
+    global DUMP
+    dump = _arg("--dump", None, str)
+    if dump:
+        DUMP = DumpIndex.open(dump)
+
     # Load entities from CUE export
     with open("site/data/entities.json") as f:
         entities = json.load(f)
 
-    print(f"Reconciling {len(entities)} entities against Wikidata...\n")
+    aliases = alias_map()
+    fingerprints = {key: fingerprint(e["name"], e.get("@type", {}), aliases.get(key, []))
+                    for key, e in entities.items()}
+    outputs_exist = os.path.exists(QIDS_FILE) and os.path.exists(CUE_OVERLAY)
+    state = ReconcileState("wikidata_reconcile",
+                           full="--full" in sys.argv or not outputs_exist)
+    if "--adopt" in sys.argv:
+        state.adopt(fingerprints, overlay_ids(CUE_OVERLAY, "wikidata"))
+        state.save()
+        print(f"Recorded {len(fingerprints)} entities against {CUE_OVERLAY} ({state.path})")
+        return
+    todo, unchanged, removed = state.plan(fingerprints)
+
+    source = f"local dump {DUMP.path}" if DUMP else "Wikidata"
+    print(f"Reconciling {len(todo)} entities against {source}...")
+    if not state.full:
+        print(f"  {len(unchanged)} unchanged since the last run, {len(removed)} removed "
+              f"(--full to query all {len(entities)})")
+    print()
 
     results = {}
     skipped = []
-    ambiguous = []
+    errors = []
 
-    for key, entity in sorted(entities.items()):
-        name = entity["name"]
+    for key in todo:
+        name = entities[key]["name"]
         sys.stdout.write(f"  {key}: {name} ... ")
         sys.stdout.flush()
 
         hits = search_wikidata(name)
-        time.sleep(0.2)  # Be nice to the API
+        if hits is None:
+            # Not recorded as a result: retried next run, old entry kept
+            errors.append(key)
+            state.record(key, fingerprints[key], ERROR)
+            print("ERROR")
+            continue
 
         best = pick_best(hits, name)
         if best:
             qid = best["id"]
             desc = best.get("description", "")
             results[key] = {"qid": qid, "description": desc}
+            state.record(key, fingerprints[key], "ok", qid)
             print(f"{qid} ({desc})")
         else:
             skipped.append(key)
+            state.record(key, fingerprints[key], "no_match")
             print("NOT FOUND")
 
-    # Write JSON mapping
-    mapping = {k: v["qid"] for k, v in results.items()}
-    with open("scripts/wikidata_qids.json", "w") as f:
-        json.dump(mapping, f, indent=2)
-
-    # Write CUE overlay
-    with open("external_ids.cue", "w") as f:
-        f.write("// External identifiers — Wikidata QIDs for entity reconciliation.\n")
-        f.write("// Auto-generated by scripts/wikidata_reconcile.py\n")
-        f.write("package creeps\n\n")
-        f.write("entities: {\n")
-        for key in sorted(results.keys()):
-            qid = results[key]["qid"]
-            f.write(f'\t{key}: external_ids: wikidata: "{qid}"\n')
-        f.write("}\n")
+    state.forget(removed)
+    write_outputs(results, skipped, removed, incremental=not state.full)
+    state.save()
 
-    print(f"\nDone: {len(results)} matched, {len(skipped)} skipped")
+    print(f"\nDone: {len(results)} matched, {len(skipped)} skipped, {len(errors)} errors")
+    print(resolve.summary())
     print(f"Skipped: {', '.join(skipped)}")
+    if errors:
+        print(f"Errors (retried next run): {', '.join(errors)}")
     print(f"\nOutput:")
-    print(f"  scripts/wikidata_qids.json  (raw mapping)")
-    print(f"  external_ids.cue            (CUE overlay)")
+    print(f"  {QIDS_FILE}  (raw mapping)")
+    print(f"  {CUE_OVERLAY}            (CUE overlay)")
 
 if __name__ == "__main__":
     main()